@@ -1,15 +1,50 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify, url_for
+import json
 import os
-from test import process_video
+import re
+import threading
+import time
+from test import process_video, stream_video_notes, SEARCH_INDEX_FILE
+from utils.job_queue import JobQueue, QueueFullError
+from utils.workspace import apply_retention, cleanup_workspaces
+from utils.uploads import UploadManager, UploadError
+from utils.model_registry import preload, load_times
+from utils.result_cache import get_cache
+from utils.nlp_summarization import get_summary_batcher
+from utils.metrics import REGISTRY, service_metric_families
+from utils.search_index import get_search_index
 
 app = Flask(__name__)
 
 
 UPLOAD_FOLDER = 'static/uploaded_videos'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+uploads = UploadManager(UPLOAD_FOLDER)
 
 
-current_video_path = None
+OUTPUT_DIR = 'static'
+
+# Retention policy for uploads and per-video workspaces
+RETENTION_MAX_AGE = float(os.environ.get('RETENTION_MAX_AGE_HOURS', 24)) * 3600
+RETENTION_MAX_ENTRIES = int(os.environ.get('RETENTION_MAX_ENTRIES', 100))
+
+# Background workers for /generate; size is configurable per deployment
+job_queue = JobQueue(
+    worker_count=int(os.environ.get('WORKER_COUNT', 2)),
+    max_pending=int(os.environ.get('MAX_PENDING_JOBS', 32))
+)
+
+# Bounded-memory pipeline for long recordings (see process_video)
+LOW_MEMORY = os.environ.get('LOW_MEMORY') == '1'
+# Slide-change detection for every job, unless /generate asks for it per request
+DETECT_SLIDES = os.environ.get('DETECT_SLIDES') == '1'
+
+def collect_service_metrics():
+    """Metrics collector for state that lives in the queue, the result cache and the summary batcher"""
+    return service_metric_families(job_queue.pending_count(), get_cache(os.path.join(OUTPUT_DIR, 'cache')).stats(),
+                                   get_summary_batcher().stats())
+
+REGISTRY.register_collector(collect_service_metrics)
 
 @app.route('/')
 def index():
@@ -28,113 +63,262 @@ def upload_file():
             return jsonify({'error': 'No selected file'}), 400
         
         if file:
-     
-            filename = os.path.join(UPLOAD_FOLDER, file.filename)
-            file.save(filename)
-            
-        
-            global current_video_path
-            current_video_path = filename
-            
+            # Stream to disk, hashing as we go; the file is stored under its content hash
+            upload = uploads.save_stream(file.stream, file.filename)
+            apply_retention(UPLOAD_FOLDER, RETENTION_MAX_AGE, RETENTION_MAX_ENTRIES,
+                            keep={os.path.basename(upload['path'])})
+
             return jsonify({
                 'message': 'File uploaded successfully',
-                'filename': file.filename
+                'filename': file.filename,
+                'video_id': upload['video_id']
             }), 200
             
     except Exception as e:
         print(f"Error in upload_file: {e}")
         return jsonify({'error': str(e)}), 500
 
+def upload_error_response(error: UploadError):
+    """Convert an UploadError into a JSON response, including the resume offset if known"""
+    body = {'error': str(error)}
+    if error.offset is not None:
+        body['offset'] = error.offset
+    return jsonify(body), error.status
+
+@app.route('/uploads', methods=['POST'])
+def init_upload():
+    """Start a chunked upload; body: {"filename": ..., "size": ...}"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('filename'):
+        return jsonify({'error': 'No filename'}), 400
+    try:
+        return jsonify(uploads.init(data['filename'], data.get('size'))), 201
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/uploads/<upload_id>', methods=['GET'])
+def get_upload(upload_id):
+    """Report how many bytes of a chunked upload were received, for resuming"""
+    try:
+        return jsonify(uploads.status(upload_id))
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/uploads/<upload_id>', methods=['PUT'])
+def append_upload(upload_id):
+    """Append the request body at ?offset=N (or the Upload-Offset header)"""
+    try:
+        offset = request.args.get('offset', request.headers.get('Upload-Offset', 0))
+        return jsonify(uploads.append(upload_id, offset, request.stream))
+    except UploadError as e:
+        return upload_error_response(e)
+
+@app.route('/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Finish a chunked upload; optional body: {"sha256": ...} to verify the content"""
+    try:
+        data = request.get_json(silent=True) or {}
+        upload = uploads.complete(upload_id, data.get('sha256'))
+        apply_retention(UPLOAD_FOLDER, RETENTION_MAX_AGE, RETENTION_MAX_ENTRIES,
+                        keep={os.path.basename(upload['path'])})
+        return jsonify({
+            'message': 'File uploaded successfully',
+            'filename': upload['filename'],
+            'video_id': upload['video_id'],
+            'size': upload['size'],
+            'duplicate': upload['duplicate']
+        }), 200
+    except UploadError as e:
+        return upload_error_response(e)
+
+def find_uploaded_video(video_id: str) -> str:
+    """Return the path of the uploaded video with the given content hash, or None"""
+    if not video_id or not re.fullmatch(r'[0-9a-f]{64}', video_id):
+        return None
+    for name in os.listdir(UPLOAD_FOLDER):
+        if os.path.splitext(name)[0] == video_id:
+            return os.path.join(UPLOAD_FOLDER, name)
+    return None
+
+def run_generate_job(video_path: str, base_dir: str, video_id: str, progress=None, languages=None,
+                     detect_slides: bool = False) -> dict:
+    """Background job: run the pipeline on one video and return its notes"""
+    results = process_video(video_path, base_dir, video_id=video_id, progress=progress, languages=languages,
+                            low_memory=LOW_MEMORY, detect_slides=detect_slides)
+    cleanup_workspaces(base_dir, RETENTION_MAX_AGE, RETENTION_MAX_ENTRIES, keep={video_id})
+    if not results['success']:
+        raise Exception(f"Video processing failed: {results.get('error', 'Unknown error')}")
+    return notes_response(results['notes'], base_dir)
+
+def run_streaming_job(video_path: str, base_dir: str, video_id: str, progress=None, languages=None,
+                      detect_slides: bool = False) -> dict:
+    """Background job in streaming mode: publish transcript segments and rolling key
+    points as 'partial' progress events, then return the final notes"""
+    notes = None
+    for event in stream_video_notes(video_path, base_dir, video_id=video_id, progress=progress,
+                                    languages=languages, low_memory=LOW_MEMORY, detect_slides=detect_slides):
+        if event['type'] == 'notes':
+            notes = event['notes']
+        elif progress:
+            progress('partial', None, **event)
+    cleanup_workspaces(base_dir, RETENTION_MAX_AGE, RETENTION_MAX_ENTRIES, keep={video_id})
+    return notes_response(notes, base_dir)
+
+def notes_response(notes, base_dir: str) -> dict:
+    """Job result for the page: the notes without the transcript, with a URL for each slide thumbnail"""
+    response = notes.to_dict(include_transcript=False)
+    for slide in response['slides']:
+        # Workspaces live under OUTPUT_DIR, which Flask serves as /static
+        slide['thumbnail_url'] = ('/static/' + os.path.relpath(slide['thumbnail'], base_dir).replace(os.sep, '/')
+                                  if slide['thumbnail'] else None)
+    response['success'] = True
+    return response
+
 @app.route('/generate', methods=['POST'])
 def generate_summary():
-    """Generate summary from the uploaded video"""
+    """Queue summary generation for the uploaded video and return the job ID
+
+    With "stream": true the job publishes transcript segments and key points
+    on /jobs/<id>/events while it runs. "languages" (a list of language codes,
+    e.g. ["kn", "hi"]) adds translated notes to the result. "slides": true
+    detects slide changes and splits the transcript by slide (on by default
+    with DETECT_SLIDES=1).
+    """
     try:
-        if not current_video_path:
+        data = request.get_json(silent=True) or request.form
+        video_id = data.get('video_id')
+        video_path = find_uploaded_video(video_id)
+        if not video_path:
             return jsonify({'error': 'No video file uploaded'}), 400
 
-       
-        base_dir = 'static'
-        results = process_video(current_video_path, base_dir)
-        
-        if results['success']:
-            try:
-               
-                with open(results['summary_path'], 'r', encoding='utf-8') as f:
-                    summary_content = f.read()
-                
-                print("Debug - Raw summary content:", summary_content) 
-                
-     
-                sections = {}
-                current_section = None
-                current_lines = []
-                
-                for line in summary_content.split('\n'):
-                    line = line.strip()
-                    if line.startswith('Summary:'):
-                        current_section = 'summary'
-                        continue
-                    elif line.startswith('Key Points:'):
-                        if current_section:
-                            sections[current_section] = '\n'.join(current_lines)
-                        current_section = 'key_points'
-                        current_lines = []
-                        continue
-                    elif line.startswith('Keywords:'):
-                        if current_section:
-                            sections[current_section] = '\n'.join(current_lines)
-                        current_section = 'keywords'
-                        current_lines = []
-                        continue
-                    elif line: 
-                        current_lines.append(line)
-                
-               
-                if current_section and current_lines:
-                    sections[current_section] = '\n'.join(current_lines)
-                
-                print("Debug - Parsed sections:", sections)  
-                
-               
-                key_points = sections.get('key_points', '')
-                if key_points:
-                    
-                    if not key_points.strip().startswith('•'):
-                        key_points = '\n'.join(f"• {point.strip()}" 
-                                             for point in key_points.split('\n') 
-                                             if point.strip())
-                
-                return jsonify({
-                    'success': True,
-                    'summary': sections.get('summary', 'No summary available').strip(),
-                    'key_points': key_points.strip(),
-                    'keywords': sections.get('keywords', 'No keywords available').strip()
-                })
-            
-            except Exception as e:
-                print(f"Error parsing summary file: {e}")
-                return jsonify({
-                    'error': 'Error parsing summary file',
-                    'details': str(e)
-                }), 500
-        else:
-            return jsonify({
-                'error': 'Video processing failed',
-                'details': results.get('error', 'Unknown error')
-            }), 500
-            
+        languages = data.get('languages') or None
+        if languages is not None and (not isinstance(languages, list)
+                                      or not all(isinstance(language, str) for language in languages)):
+            return jsonify({'error': 'languages must be a list of language codes'}), 400
+
+        slides = data.get('slides')
+        detect_slides = DETECT_SLIDES if slides is None else slides in (True, 'true', '1')
+        job_function = run_streaming_job if data.get('stream') else run_generate_job
+        try:
+            job_id = job_queue.submit(job_function, video_path, OUTPUT_DIR, video_id, languages=languages,
+                                      report_progress=True, detect_slides=detect_slides)
+        except QueueFullError as e:
+            return jsonify({'error': str(e)}), 503
+
+        return jsonify({
+            'job_id': job_id,
+            'video_id': video_id,
+            'status': 'queued',
+            'status_url': url_for('get_job', job_id=job_id),
+            'events_url': url_for('job_events', job_id=job_id)
+        }), 202
+
     except Exception as e:
         print(f"Error in generate_summary: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    """Report the status of a generation job, with its result once finished"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    return jsonify({
+        'job_id': job['id'],
+        'status': job['status'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'progress': job['progress'],
+        'result': job['result'],
+        'error': job['error']
+    })
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream per-stage progress of a job as server-sent events
+
+    Each event is a JSON object with 'stage', 'percent', 'elapsed' and
+    stage-specific details; the stream ends with a 'done' event. Clients that
+    reconnect can pass ?since=<index> (or Last-Event-ID) to skip seen events.
+    """
+    tracker = job_queue.progress(job_id)
+    if tracker is None:
+        return jsonify({'error': 'Unknown job'}), 404
+
+    try:
+        start = int(request.args.get('since', request.headers.get('Last-Event-ID', -1))) + 1
+    except ValueError:
+        return jsonify({'error': 'since must be an event index'}), 400
+
+    def stream():
+        index = start
+        while True:
+            events = tracker.events_since(index, timeout=15)
+            if not events:
+                if tracker.finished:
+                    return
+                # Comment line keeps proxies from closing an idle connection
+                yield ': keepalive\n\n'
+                continue
+            for event in events:
+                yield f"id: {event['index']}\ndata: {json.dumps(event)}\n\n"
+                if event['stage'] == 'done':
+                    return
+            index = events[-1]['index'] + 1
+
+    return Response(stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
 @app.route('/status')
 def get_status():
-    """Get the current processing status"""
+    """Get the processing status, optionally for one uploaded video (?video_id=...)"""
+    video_id = request.args.get('video_id')
+    video_path = find_uploaded_video(video_id) if video_id else None
+    return jsonify({
+        'video_uploaded': video_path is not None,
+        'current_video': os.path.basename(video_path) if video_path else None,
+        'pending_jobs': job_queue.pending_count(),
+        'model_load_times': load_times(),
+        'cache': get_cache(os.path.join(OUTPUT_DIR, 'cache')).stats(),
+        'summary_batching': get_summary_batcher().stats()
+    })
+
+@app.route('/search')
+def search():
+    """Search the transcripts of all processed videos
+
+    ?q=<words> finds segments containing all words (stemmed, so "gradients"
+    matches "gradient"); ?video_id= restricts the search to one video and
+    ?limit= caps the number of hits (default 20, at most 100). Returns the
+    best-matching segments with their timestamps and the videos ranked by
+    their best match.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No query'}), 400
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), 100)
+    except ValueError:
+        return jsonify({'error': 'limit must be a number'}), 400
+
+    start = time.perf_counter()
+    index = get_search_index(os.path.join(OUTPUT_DIR, SEARCH_INDEX_FILE))
+    video_id = request.args.get('video_id')
+    hits = index.search(query, limit, video_id=video_id)
+    videos = index.search_videos(query, limit, video_id=video_id)
     return jsonify({
-        'video_uploaded': current_video_path is not None,
-        'current_video': os.path.basename(current_video_path) if current_video_path else None
+        'query': query,
+        'hits': hits,
+        'videos': videos,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 2)
     })
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus metrics: stage latencies, throughput, queue depth, cache hit rates, model load times"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
 @app.errorhandler(Exception)
 def handle_error(error):
     """Global error handler"""
@@ -143,7 +327,10 @@ def handle_error(error):
 
 if __name__ == '__main__':
 
-    for dir_path in ['static/output_audio', 'static/transcriptions', 'static/summaries']:
-        os.makedirs(dir_path, exist_ok=True)
+    os.makedirs(os.path.join(OUTPUT_DIR, 'workspaces'), exist_ok=True)
+
+    # Models load lazily on first use; PRELOAD_MODELS=1 warms them in the background instead
+    if os.environ.get('PRELOAD_MODELS') == '1':
+        threading.Thread(target=preload, name='model-preload', daemon=True).start()
     
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""
+Batch mode: generate notes for a directory (or manifest) of videos.
+
+Videos are fanned out over a process pool whose workers load the models once
+at start-up. Inputs already recorded as completed in the results manifest are
+skipped, so an interrupted backfill can simply be re-run. Copies of the same
+file are processed once: they share a content-addressed workspace.
+
+Usage:
+    python batch.py lectures/ --workers 4 --manifest batch_results.json
+    python batch.py videos.txt --stt-backend whisper
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.mov', '.avi', '.webm', '.m4v', '.flv')
+
+
+def collect_inputs(source: str, extensions=VIDEO_EXTENSIONS) -> list:
+    """
+    Lists the videos to process.
+
+    Parameters:
+        source (str): A directory (searched recursively), a .json manifest
+            holding a list of paths, or a text file with one path per line.
+        extensions (tuple): File extensions treated as videos in a directory.
+
+    Returns:
+        list: Absolute video paths, sorted.
+    """
+    if os.path.isdir(source):
+        paths = []
+        for dirpath, _, filenames in os.walk(source):
+            paths.extend(os.path.join(dirpath, name) for name in filenames
+                         if name.lower().endswith(extensions))
+    else:
+        base = os.path.dirname(os.path.abspath(source))
+        with open(source, 'r', encoding='utf-8') as f:
+            if source.endswith('.json'):
+                paths = json.load(f)
+            else:
+                paths = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        paths = [path if os.path.isabs(path) else os.path.join(base, path) for path in paths]
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def load_manifest(path: str) -> dict:
+    """Loads the results manifest (video path -> result entry), or an empty one."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return {entry['path']: entry for entry in json.load(f).get('videos', [])}
+
+
+def save_manifest(path: str, entries: dict, summary: dict):
+    """Writes the results manifest atomically so an interrupted run never leaves it half written."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'summary': summary, 'videos': sorted(entries.values(), key=lambda e: e['path'])}, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def is_done(entry: dict, path: str) -> bool:
+    """True if the manifest says this exact file (same size and mtime) was already processed."""
+    if not entry or entry.get('status') != 'completed':
+        return False
+    stat = os.stat(path)
+    return entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime
+
+
+def group_by_content(paths: list) -> dict:
+    """
+    Groups paths by the content hash their workspace is named after.
+
+    Returns:
+        dict: video_id -> paths with that content, in input order. Files that
+            cannot be read get a group of their own (keyed by path), so the
+            worker reports the error for them.
+    """
+    from utils.workspace import hash_file
+
+    groups = {}
+    for path in paths:
+        try:
+            key = hash_file(path)
+        except OSError:
+            key = path
+        groups.setdefault(key, []).append(path)
+    return groups
+
+
+def duplicate_entry(entry: dict, path: str) -> dict:
+    """Manifest entry for a copy of an input that was processed under another path."""
+    stat = os.stat(path)
+    return dict(entry, path=path, size=stat.st_size, mtime=stat.st_mtime, duplicate_of=entry['path'],
+                wall_seconds=0.0)
+
+
+def _init_worker(stt_backend: str):
+    """Process pool initializer: load every model once per worker before taking jobs."""
+    import utils.stt_backends
+    if stt_backend:
+        # The registry warms up the default backend, so make it the one this batch uses
+        utils.stt_backends.DEFAULT_BACKEND = stt_backend
+
+    # Importing the pipeline registers the NLP models with the registry
+    import test  # noqa: F401
+    from utils.model_registry import preload
+    times = preload()
+    print(f"[worker {os.getpid()}] models ready: "
+          + ', '.join(f"{name} {seconds:.1f}s" for name, seconds in times.items()))
+
+
+def _process_one(path: str, output_dir: str, stt_backend: str = None, low_memory: bool = False,
+                 memory_budget_mb: float = None, resume: bool = True, detect_slides: bool = False) -> dict:
+    """Runs the pipeline on one video inside a worker process."""
+    from test import process_video
+    from utils.metrics import REGISTRY
+
+    stat = os.stat(path)
+    start = time.perf_counter()
+    results = process_video(path, output_dir, stt_backend=stt_backend, export_summary=True,
+                            low_memory=low_memory, memory_budget_mb=memory_budget_mb, resume=resume,
+                            detect_slides=detect_slides)
+    entry = {
+        'path': path,
+        'size': stat.st_size,
+        'mtime': stat.st_mtime,
+        'video_id': results['video_id'],
+        'status': 'completed' if results['success'] else 'failed',
+        'error': results['error'],
+        'wall_seconds': round(time.perf_counter() - start, 2),
+        'audio_seconds': round(results['audio_seconds'], 2),
+        'summary_path': results['summary_path'],
+        'notes_path': None
+    }
+
+    if results['success']:
+        notes_path = os.path.join(os.path.dirname(results['transcription_path']), 'notes.json')
+        with open(notes_path, 'w', encoding='utf-8') as f:
+            json.dump(results['notes'].to_dict(), f, ensure_ascii=False)
+        entry['notes_path'] = notes_path
+
+    # Metrics recorded in this worker since its last video, merged by the parent process
+    entry['metrics'] = REGISTRY.snapshot(reset=True)
+    return entry
+
+
+def throughput(entries: list, elapsed: float) -> dict:
+    """Summarizes a run: counts, videos per hour and audio minutes per second."""
+    completed = [entry for entry in entries if entry['status'] == 'completed']
+    audio_seconds = sum(entry['audio_seconds'] for entry in completed)
+    return {
+        'processed': len(entries),
+        'completed': len(completed),
+        'failed': len(entries) - len(completed),
+        'elapsed_seconds': round(elapsed, 2),
+        'audio_minutes': round(audio_seconds / 60, 2),
+        'videos_per_hour': round(len(completed) * 3600 / elapsed, 2) if elapsed else 0.0,
+        'audio_minutes_per_second': round(audio_seconds / 60 / elapsed, 3) if elapsed else 0.0
+    }
+
+
+def run_batch(inputs: list, output_dir: str, manifest_path: str, workers: int,
+              stt_backend: str = None, force: bool = False, low_memory: bool = False,
+              memory_budget_mb: float = None, metrics_path: str = None, detect_slides: bool = False) -> dict:
+    """
+    Processes videos on a process pool and records results in the manifest.
+
+    Inputs with identical content are processed once, by the first of their
+    paths: they map to the same workspace, and two workers writing it at
+    the same time would corrupt it. The other paths get a copy of its
+    manifest entry with 'duplicate_of' set and do not count towards the
+    throughput.
+
+    With metrics_path, the metrics of all workers (stage latencies, bytes and
+    audio processed, model load times; see utils.metrics) are merged and
+    written there in the Prometheus text format.
+
+    Returns:
+        dict: The throughput summary of this run.
+    """
+    from utils.metrics import REGISTRY
+
+    manifest = load_manifest(manifest_path)
+    todo = [path for path in inputs if force or not is_done(manifest.get(path), path)]
+    groups = list(group_by_content(todo).values())
+    print(f"{len(inputs)} videos found, {len(inputs) - len(todo)} already processed, {len(todo)} to do"
+          + (f" ({len(todo) - len(groups)} duplicates)" if len(groups) < len(todo) else ''))
+
+    start = time.perf_counter()
+    finished = []
+    if groups:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(stt_backend,)) as executor:
+            futures = {executor.submit(_process_one, paths[0], output_dir, stt_backend, low_memory,
+                                       memory_budget_mb, not force, detect_slides): paths for paths in groups}
+            for future in as_completed(futures):
+                path, *duplicates = futures[future]
+                try:
+                    entry = future.result()
+                    REGISTRY.merge(entry.pop('metrics'))
+                except Exception as e:
+                    entry = {'path': path, 'status': 'failed', 'error': str(e),
+                             'wall_seconds': 0.0, 'audio_seconds': 0.0}
+                finished.append(entry)
+                manifest[path] = entry
+                print(f"[{len(finished)}/{len(groups)}] {entry['status']}: {path}"
+                      + (f" ({entry['error']})" if entry['error'] else ''))
+                for duplicate in duplicates:
+                    manifest[duplicate] = duplicate_entry(entry, duplicate)
+                    print(f"  same content: {duplicate}")
+                # Save after every video so progress survives an interruption
+                save_manifest(manifest_path, manifest, throughput(finished, time.perf_counter() - start))
+
+    summary = throughput(finished, time.perf_counter() - start)
+    save_manifest(manifest_path, manifest, summary)
+    if metrics_path:
+        with open(metrics_path, 'w', encoding='utf-8') as f:
+            f.write(REGISTRY.render())
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate notes for many videos at once.")
+    parser.add_argument('source', help="Directory of videos, or a manifest (.json list or .txt, one path per line)")
+    parser.add_argument('--output-dir', default='static', help="Pipeline output directory (default: static)")
+    parser.add_argument('--manifest', default='batch_results.json', help="Results manifest to read and update")
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of worker processes")
+    parser.add_argument('--stt-backend', help="Speech-to-text backend (google, whisper, fake)")
+    parser.add_argument('--force', action='store_true',
+                        help="Reprocess videos already in the manifest, ignoring stage checkpoints")
+    parser.add_argument('--low-memory', action='store_true',
+                        help="Bounded-memory mode: stream audio and summarize the transcript in windows")
+    parser.add_argument('--memory-budget-mb', type=float, help="Per-window memory budget in low-memory mode")
+    parser.add_argument('--slides', action='store_true',
+                        help="Detect slide changes and split each transcript by slide")
+    parser.add_argument('--metrics-file', help="Write Prometheus-format metrics of the run to this file")
+    args = parser.parse_args(argv)
+
+    inputs = collect_inputs(args.source)
+    summary = run_batch(inputs, args.output_dir, args.manifest, args.workers, args.stt_backend, args.force,
+                        args.low_memory, args.memory_budget_mb, args.metrics_file, args.slides)
+
+    print(f"\nCompleted {summary['completed']}, failed {summary['failed']} in {summary['elapsed_seconds']}s")
+    print(f"Throughput: {summary['videos_per_hour']} videos/hour, "
+          f"{summary['audio_minutes_per_second']} audio minutes/second")
+    print(f"Manifest written to {args.manifest}")
+    if args.metrics_file:
+        print(f"Metrics written to {args.metrics_file}")
+    return 1 if summary['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
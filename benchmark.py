@@ -0,0 +1,351 @@
+"""
+Benchmark harness for the video-to-notes pipeline.
+
+Generates synthetic audio/video/text fixtures of configurable length, runs
+each pipeline stage in isolation and end to end, and records wall time, CPU
+time (including ffmpeg and other child processes) and peak RSS per run to a
+JSON report. NLP models are loaded once, as their own 'load_models' run,
+before the stages that use them, so those stages are timed warm. Speech
+recognition uses the deterministic 'fake' backend so results do not depend
+on the network.
+
+Usage:
+    python benchmark.py --minutes 1 10 --output bench_report.json
+    python benchmark.py --minutes 1 --compare bench_baseline.json --tolerance 0.25
+    python benchmark.py --stages summarize keywords   # no ffmpeg needed
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import wave
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+WORDS = ("lecture model data network function gradient neuron layer training error "
+         "matrix vector algorithm probability signal memory process system theory result").split()
+
+
+def make_audio_fixture(path: str, seconds: float, sample_rate: int = SAMPLE_RATE, seed: int = 0) -> str:
+    """
+    Writes a speech-like mono 16-bit WAV: voiced tone bursts separated by short pauses.
+
+    The pauses give the silence-based segmenter realistic cut points.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * sample_rate)
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        written = 0
+        while written < total:
+            burst = int(rng.uniform(0.8, 4.0) * sample_rate)
+            pause = int(rng.uniform(0.2, 0.8) * sample_rate)
+            t = np.arange(burst) / sample_rate
+            pitch = rng.uniform(110, 260)
+            envelope = 0.5 * (1 + np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+            voiced = envelope * (np.sin(2 * np.pi * pitch * t) + 0.3 * np.sin(4 * np.pi * pitch * t))
+            noise = rng.normal(0, 0.01, burst + pause)
+            block = np.concatenate([voiced, np.zeros(pause)]) + noise
+            block = (np.clip(block, -1, 1) * 12000).astype('<i2')[:total - written]
+            wav.writeframes(block.tobytes())
+            written += len(block)
+    return path
+
+
+def make_video_fixture(path: str, audio_path: str) -> str:
+    """Muxes the audio fixture with a low-resolution, low-frame-rate test pattern."""
+    import subprocess
+    from utils.audio_extraction import get_ffmpeg_binary
+
+    command = [
+        get_ffmpeg_binary(), '-nostdin', '-v', 'error', '-y',
+        '-f', 'lavfi', '-i', 'testsrc=size=320x240:rate=5',
+        '-i', audio_path,
+        '-shortest', '-c:v', 'mpeg4', '-q:v', '10', '-c:a', 'aac', path
+    ]
+    subprocess.run(command, check=True)
+    return path
+
+
+def make_text_fixture(words: int, seed: int = 0) -> str:
+    """Builds a deterministic lecture-like transcript of roughly the given word count."""
+    rng = random.Random(seed)
+    sentences = []
+    count = 0
+    while count < words:
+        length = rng.randint(6, 24)
+        sentence = ' '.join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + '.')
+        count += length
+    return ' '.join(sentences)
+
+
+def _current_rss_mb() -> float:
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        return _max_rss_mb()
+
+
+def _max_rss_mb() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == 'darwin' else usage / 1024
+
+
+class _RssSampler(threading.Thread):
+    """Samples the resident set size in the background to find the peak during one stage."""
+
+    def __init__(self, interval: float = 0.01):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = _current_rss_mb()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            self.peak = max(self.peak, _current_rss_mb())
+
+    def stop(self) -> float:
+        self._stop_event.set()
+        self.join()
+        return max(self.peak, _current_rss_mb())
+
+
+def _children_cpu_seconds() -> float:
+    """User + system CPU time of all terminated, waited-for child processes (e.g. ffmpeg)."""
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure(name: str, func, *args, **kwargs) -> dict:
+    """
+    Runs func once and returns its wall time, CPU time and peak RSS.
+
+    cpu_seconds covers all threads of this process plus the child processes
+    the stage started (child_cpu_seconds on its own). peak_rss_mb is the
+    peak of the whole process, which includes whatever earlier runs left
+    loaded; peak_rss_delta_mb is the growth over the RSS at the start of the
+    run, i.e. what the stage itself needed. Child process memory is not
+    included in either.
+    """
+    sampler = _RssSampler()
+    rss_start = sampler.peak
+    sampler.start()
+    cpu_start = time.process_time()
+    children_start = _children_cpu_seconds()
+    wall_start = time.perf_counter()
+    error = None
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    wall = time.perf_counter() - wall_start
+    child_cpu = _children_cpu_seconds() - children_start
+    cpu = time.process_time() - cpu_start + child_cpu
+    peak = sampler.stop()
+
+    result = {
+        'stage': name,
+        'ok': error is None,
+        'error': error,
+        'wall_seconds': round(wall, 4),
+        'cpu_seconds': round(cpu, 4),
+        'child_cpu_seconds': round(child_cpu, 4),
+        'peak_rss_mb': round(peak, 1),
+        'peak_rss_delta_mb': round(peak - rss_start, 1)
+    }
+    status = 'ok' if error is None else f"FAILED ({error})"
+    print(f"  {name:<32} wall {wall:8.3f}s  cpu {cpu:8.3f}s  peak {peak:8.1f} MB "
+          f"(+{peak - rss_start:.1f})  {status}")
+    return result
+
+
+def _drain(iterator):
+    for _ in iterator:
+        pass
+
+
+def _check_extraction(success):
+    if not success:
+        raise RuntimeError("extract_audio_from_video reported an error")
+
+
+def _check_transcript(transcript):
+    if not transcript:
+        raise RuntimeError("empty transcript")
+
+
+def _check_summary(summary_result):
+    from utils.nlp_summarization import ERROR_SUMMARY
+
+    if summary_result['summary'] == ERROR_SUMMARY:
+        raise RuntimeError("summarize_text reported an error")
+
+
+def _check_keywords(keywords):
+    if keywords == ["Error extracting keywords."]:
+        raise RuntimeError("extract_keywords reported an error")
+
+
+def _check_pipeline(results):
+    if not results['success']:
+        raise RuntimeError(results['error'])
+
+
+def _load_models():
+    """Loads the NLP models (not the STT engine: the benchmarks use the 'fake' backend)."""
+    # Importing the module registers its models
+    import utils.nlp_summarization  # noqa: F401
+    from utils.model_registry import preload
+
+    return preload(NLP_MODELS)
+
+
+def run_benchmarks(minutes: float, stages: list, work_dir: str) -> list:
+    """Generates the fixtures the selected stages need for one duration and runs the stages on them."""
+    seconds = minutes * 60
+    audio_fixture = video_fixture = text_fixture = None
+    if any(stage in AUDIO_STAGES for stage in stages):
+        audio_fixture = make_audio_fixture(os.path.join(work_dir, 'fixture.wav'), seconds)
+    if any(stage in VIDEO_STAGES for stage in stages):
+        video_fixture = make_video_fixture(os.path.join(work_dir, 'fixture.mp4'), audio_fixture)
+    if any(stage in TEXT_STAGES for stage in stages):
+        # Roughly 150 spoken words per minute
+        text_fixture = make_text_fixture(int(150 * minutes))
+
+    sizes = [f"{os.path.getsize(video_fixture) / 1e6:.1f} MB video"] if video_fixture else []
+    if text_fixture:
+        sizes.append(f"{len(text_fixture.split())} words of text")
+    print(f"\nFixture: {minutes:g} min" + (f" ({', '.join(sizes)})" if sizes else ''))
+    runs = []
+
+    if any(stage in MODEL_STAGES for stage in stages):
+        from utils.model_registry import is_loaded
+        if not all(is_loaded(name) for name in NLP_MODELS):
+            # Timed on its own so the stages below are measured with warm models
+            runs.append(measure('load_models', _load_models))
+
+    if 'extract' in stages:
+        from utils.audio_extraction import extract_audio_from_video
+        extracted = os.path.join(work_dir, 'extracted.wav')
+        runs.append(measure('extract_audio_from_video',
+                            lambda: _check_extraction(extract_audio_from_video(video_fixture, extracted))))
+    if 'stream' in stages:
+        from utils.audio_extraction import stream_audio_chunks
+        runs.append(measure('stream_audio_chunks', lambda: _drain(stream_audio_chunks(video_fixture))))
+    if 'transcribe' in stages:
+        from utils.stt_transcription import transcribe_audio
+        runs.append(measure('transcribe_audio[fake]',
+                            lambda: _check_transcript(transcribe_audio(audio_fixture, backend='fake'))))
+    if 'summarize' in stages:
+        from utils.nlp_summarization import summarize_text
+        runs.append(measure('summarize_text', lambda: _check_summary(summarize_text(text_fixture))))
+    if 'keywords' in stages:
+        from utils.nlp_summarization import extract_keywords
+        runs.append(measure('extract_keywords', lambda: _check_keywords(extract_keywords(text_fixture))))
+    if 'pipeline' in stages:
+        from test import process_video
+        output_dir = os.path.join(work_dir, 'output')
+        runs.append(measure('process_video[fake]', lambda: _check_pipeline(
+            process_video(video_fixture, output_dir, stt_backend='fake', use_cache=False))))
+    if 'pipeline-low-memory' in stages:
+        from test import process_video
+        output_dir = os.path.join(work_dir, 'output-low-memory')
+        runs.append(measure('process_video[fake,low_memory]', lambda: _check_pipeline(
+            process_video(video_fixture, output_dir, stt_backend='fake', use_cache=False, low_memory=True))))
+
+    for run in runs:
+        run['audio_minutes'] = minutes
+        if run['ok'] and run['wall_seconds'] > 0 and run['stage'] != 'load_models':
+            run['audio_seconds_per_second'] = round(seconds / run['wall_seconds'], 2)
+    return runs
+
+
+def compare_reports(current: dict, baseline: dict, tolerance: float) -> list:
+    """Returns descriptions of runs whose wall time or peak RSS grew by more than tolerance."""
+    previous = {(run['stage'], run['audio_minutes']): run for run in baseline.get('runs', [])}
+    regressions = []
+    for run in current['runs']:
+        old = previous.get((run['stage'], run['audio_minutes']))
+        if not old or not old['ok'] or not run['ok']:
+            continue
+        # Older reports have no per-stage memory, so they are compared on the process peak
+        memory = 'peak_rss_delta_mb' if 'peak_rss_delta_mb' in old else 'peak_rss_mb'
+        for metric in ('wall_seconds', memory):
+            if old[metric] > 0 and run[metric] > old[metric] * (1 + tolerance):
+                regressions.append(f"{run['stage']} @ {run['audio_minutes']:g} min: "
+                                   f"{metric} {old[metric]} -> {run[metric]}")
+    return regressions
+
+
+ALL_STAGES = ['extract', 'stream', 'transcribe', 'summarize', 'keywords', 'pipeline', 'pipeline-low-memory']
+# Fixtures (and models) each stage needs; the video fixture is built from the audio one with ffmpeg
+VIDEO_STAGES = {'extract', 'stream', 'pipeline', 'pipeline-low-memory'}
+AUDIO_STAGES = VIDEO_STAGES | {'transcribe'}
+TEXT_STAGES = {'summarize', 'keywords'}
+MODEL_STAGES = {'summarize', 'keywords', 'pipeline', 'pipeline-low-memory'}
+NLP_MODELS = ['summarizer', 'spacy', 'nltk_data', 'stop_words']
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the video-to-notes pipeline stages.")
+    parser.add_argument('--minutes', type=float, nargs='+', default=[1.0],
+                        help="Fixture durations in minutes (default: 1)")
+    parser.add_argument('--stages', nargs='+', choices=ALL_STAGES, default=ALL_STAGES,
+                        help="Stages to run (default: all)")
+    parser.add_argument('--output', default='bench_report.json', help="Where to write the JSON report")
+    parser.add_argument('--compare', help="Baseline report to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed relative slowdown/growth before a regression is reported")
+    parser.add_argument('--keep-fixtures', action='store_true', help="Do not delete the generated fixtures")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix='video-to-notes-bench-')
+    try:
+        runs = []
+        for minutes in args.minutes:
+            fixture_dir = os.path.join(work_dir, f"{minutes:g}min")
+            os.makedirs(fixture_dir)
+            runs.extend(run_benchmarks(minutes, args.stages, fixture_dir))
+    finally:
+        if args.keep_fixtures:
+            print(f"\nFixtures kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'max_rss_mb': round(_max_rss_mb(), 1),
+        'runs': runs
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare_reports(report, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
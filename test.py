@@ -1,87 +1,526 @@
-import moviepy
 import os
-from moviepy.editor import VideoFileClip
-from utils.audio_extraction import extract_audio_from_video
-from utils.stt_transcription import transcribe_audio
-from utils.nlp_summarization import summarize_text
+import queue
+import shutil
+import threading
+import time
+from collections import deque
+from utils.audio_extraction import extract_audio_from_video, stream_audio_chunks, SAMPLE_RATE
+from utils.stt_transcription import transcribe_audio_segments, iter_transcribed_segments
+from utils.stt_backends import get_backend
+from utils.nlp_summarization import (summarize_text, analyze_text, candidate_points, rank_points,
+                                     summarize_windows, window_chars_for_budget, DEDUP_RECENT_POINTS,
+                                     SUMMARY_PARAMS, WINDOWED_SUMMARY_PARAMS, ERROR_SUMMARY)
+from utils.dedup import NearDuplicateIndex
+from utils.workspace import create_workspace, get_workspace, workspace_lock
+from utils.result_cache import get_cache, make_key, hash_text
+from utils.results import NotesResult
+from utils.keywords import get_idf_model
+from utils.translation import translate_notes
+from utils.progress import stage_progress
+from utils.spill import SegmentSpill, read_segments, iter_text_windows
+from utils.stages import StageCheckpoints, run_stage
+from utils.metrics import timed, timed_iter, record_video
+from utils.search_index import get_search_index
+from utils.slides import detect_slides as detect_slide_changes, assign_segments, SLIDE_PARAMS
 
-print("MoviePy version:", moviepy.__version__)
+# Parameters that change the extracted audio; part of the audio and transcript cache keys
+AUDIO_PARAMS = {'sample_rate': SAMPLE_RATE, 'channels': 1, 'codec': 'pcm_s16le'}
+# Corpus-wide keyword statistics, updated as videos are processed (see utils.keywords)
+KEYWORD_IDF_FILE = 'keyword_idf.json'
+# Full-text index of all transcripts, updated as videos are processed (see utils.search_index)
+SEARCH_INDEX_FILE = 'transcripts.db'
 
-def process_video(input_video_path: str, base_output_dir: str) -> dict:
-    """Process video through multiple stages and return results"""
+def process_video(input_video_path: str, base_output_dir: str, video_id: str = None, stt_backend=None,
+                  use_cache: bool = True, export_summary: bool = False, progress=None, languages=None,
+                  translation_backend=None, low_memory: bool = False, memory_budget_mb: float = None,
+                  resume: bool = True, detect_slides: bool = False, on_segment=None) -> dict:
+    """Process video through multiple stages and return results
+
+    All artifacts are written to the video's own workspace under
+    base_output_dir/workspaces/<video_id>, where video_id is the content hash
+    of the video (computed here when not given). stt_backend selects the
+    speech-to-text engine (see utils.stt_backends.get_backend).
+
+    Stage results are cached in base_output_dir/cache, keyed by the hash of
+    the stage input and the stage parameters, so a repeated video skips
+    extraction and transcription, and a summarizer change only reruns the
+    summary stage.
+
+    The notes are returned as a NotesResult under 'notes'; the plain-text
+    summary file is only written when export_summary is True.
+
+    languages, if given, is a list of language codes (e.g. ['kn', 'hi']) the
+    summary, key points and keywords are translated into; they end up in
+    notes.translations (see utils.translation).
+
+    With low_memory, peak memory no longer grows with the length of the
+    video: audio is streamed from the container instead of written to a WAV
+    file, transcript segments are spilled to segments.jsonl in the workspace,
+    and the notes are built from transcript windows sized to fit
+    memory_budget_mb (default MEMORY_BUDGET_MB). The transcript and segments
+    are then left on disk rather than returned in the notes.
+
+    Extraction, transcription and summarization run as checkpointed stages
+    with per-stage retry policies (see utils.stages). If a run fails, the next
+    one for the same video resumes after the last completed stage; the stages
+    it restored are listed in 'resumed'. resume=False discards the
+    checkpoints and starts over.
+
+    With detect_slides, the video track is sampled at keyframes to find
+    slide changes (see utils.slides); notes.slides then lists each slide's
+    start and end, thumbnail and transcript (segment range only in
+    low_memory mode). A failure there is reported but does not fail the run.
+
+    on_segment, if given, is called as on_segment(index, segment) for every
+    transcript segment as soon as it is available (see stream_video_notes).
+    Audio is then decoded straight from the container into the transcriber
+    instead of going through a WAV file; segments restored from the cache or
+    a checkpoint are replayed through it.
+
+    Once the notes are ready, the transcript segments are added to the
+    search index in base_output_dir (SEARCH_INDEX_FILE).
+
+    progress, if given, is called as progress(stage, percent, **detail) for the
+    'extract', 'slides', 'transcribe', 'summarize' and 'translate' stages (see utils.progress).
+    """
     results = {
         'success': False,
+        'video_id': None,
         'audio_path': None,
         'transcription_path': None,
         'summary_path': None,
+        'segments': None,
+        'segments_path': None,
+        'audio_seconds': 0.0,
+        'notes': None,
+        'cache': {},
+        'resumed': [],
         'error': None
     }
+    start = time.perf_counter()
     
     try:
-        # Define output paths
-        output_audio = os.path.join(base_output_dir, 'output_audio', 'audio.wav')
-        output_transcription = os.path.join(base_output_dir, 'transcriptions', 'transcription.txt')
-        output_summary = os.path.join(base_output_dir, 'summaries', 'summary.txt')
-        
-        # Create directories if they don't exist
-        for path in [output_audio, output_transcription, output_summary]:
-            os.makedirs(os.path.dirname(path), exist_ok=True)
-        
-        # Step 1: Extract audio
-        print("Extracting audio...")
-        if not extract_audio_from_video(input_video_path, output_audio):
-            raise Exception("Audio extraction failed")
-        results['audio_path'] = output_audio
-        
-        # Step 2: Transcribe audio
-        print("Transcribing audio...")
-        transcription = transcribe_audio(output_audio)
-        if not transcription:
-            raise Exception("Transcription failed")
-            
-        # Debug print
-        print(f"Debug - Transcription length: {len(transcription)}")
-        print("Debug - First 100 characters of transcription:", transcription[:100])
-        
-        # Save transcription to file
-        with open(output_transcription, 'w', encoding='utf-8') as f:
-            f.write(transcription)
-        results['transcription_path'] = output_transcription
-        
-        # Step 3: Generate summary
-        print("Generating summary using nlp_summarization module...")
-        summary_result = summarize_text(transcription)  # Pass the transcription directly
-        
-        if summary_result:
-            # Format the summary output
-            formatted_summary = f"""Summary:
-{summary_result['summary']}
-
-Key Points:
-{chr(10).join(f"• {point}" for point in summary_result['important_points'])}
-
-Keywords:
-{', '.join(summary_result['keywords'])}"""
-            
-            # Debug print
-            print("Debug - Formatted Summary:")
-            print(formatted_summary)
-            
-            # Save the formatted summary
-            with open(output_summary, 'w', encoding='utf-8') as f:
-                f.write(formatted_summary)
-            results['summary_path'] = output_summary
-            
-            results['success'] = True
+        # Define output paths inside the video's workspace
+        if video_id:
+            workspace = get_workspace(base_output_dir, video_id)
         else:
-            raise Exception("Summary generation failed")
-        
+            workspace = create_workspace(input_video_path, base_output_dir)
+        results['video_id'] = workspace['video_id']
+        cache = get_cache(os.path.join(base_output_dir, 'cache')) if use_cache else None
+        idf_model = get_idf_model(os.path.join(base_output_dir, KEYWORD_IDF_FILE))
+
+        if on_segment is not None:
+            on_segment = _publish_once(on_segment)
+
+        with workspace_lock(workspace['video_id']):
+            checkpoints = StageCheckpoints(workspace['root'])
+            if not resume:
+                checkpoints.clear()
+            if low_memory:
+                _run_stages_bounded(input_video_path, workspace, results, get_backend(stt_backend), cache,
+                                    idf_model, export_summary, progress, languages, translation_backend,
+                                    memory_budget_mb, checkpoints, detect_slides, on_segment)
+            else:
+                _run_stages(input_video_path, workspace, results, get_backend(stt_backend), cache,
+                            idf_model, export_summary, progress, languages, translation_backend, checkpoints,
+                            detect_slides, on_segment)
+            if results['success']:
+                # In low-memory mode the segments are only on disk; read_segments streams them back
+                segments = results['segments'] if results['segments'] is not None \
+                    else read_segments(results['segments_path'])
+                index_transcript(base_output_dir, workspace['video_id'], segments,
+                                 os.path.basename(input_video_path))
+
     except Exception as e:
         results['error'] = str(e)
         print(f"Error: {str(e)}")
-    
+
+    record_video(results['success'], os.path.getsize(input_video_path) if os.path.exists(input_video_path) else 0,
+                 results['audio_seconds'], time.perf_counter() - start)
     return results
 
+def _run_stages(input_video_path, workspace, results, stt_backend, cache, idf_model, export_summary, progress,
+                languages=None, translation_backend=None, checkpoints=None, detect_slides=False,
+                on_segment=None):
+    """Run extraction, transcription, summarization and translation, filling in results"""
+    output_audio = workspace['audio_path']
+    output_transcription = workspace['transcription_path']
+    report_extract = stage_progress(progress, 'extract')
+    report_transcribe = stage_progress(progress, 'transcribe')
+    report_summarize = stage_progress(progress, 'summarize')
+
+    audio_key = make_key('audio', workspace['video_id'], AUDIO_PARAMS)
+    transcript_key = make_key('transcript', audio_key, stt_backend.cache_params())
+
+    # The visual stage runs next to audio extraction and does not depend on it
+    slides = _slides_stage(input_video_path, workspace, results, checkpoints, progress) if detect_slides else []
+
+    def extract():
+        cached_audio = cache.get_file('audio', audio_key, '.wav') if cache else None
+        if cached_audio:
+            print("Using cached audio...")
+            _link_or_copy(cached_audio, output_audio)
+            results['cache']['audio'] = 'hit'
+            report_extract(100.0, cached=True)
+        else:
+            print("Extracting audio...")
+            report_extract(0.0)
+            with timed('extract'):
+                if not extract_audio_from_video(input_video_path, output_audio, progress=report_extract):
+                    raise Exception("Audio extraction failed")
+            if cache:
+                cache.put_file('audio', audio_key, output_audio, '.wav')
+                results['cache']['audio'] = 'miss'
+        return {'audio_path': output_audio}
+
+    def transcribe():
+        cached_transcript = cache.get_json('transcript', transcript_key) if cache else None
+        if cached_transcript:
+            # The transcript is all later stages need, so extraction is skipped too
+            print("Using cached transcription...")
+            results['cache']['transcript'] = 'hit'
+            report_transcribe(100.0, segments=len(cached_transcript['segments']), cached=True)
+            return cached_transcript
+
+        if on_segment is not None:
+            # Steps 1-2 streamed: decode straight from the container, publishing segments as they arrive
+            print("Streaming audio into the transcriber...")
+            report_transcribe(0.0, segments=0)
+            segments = []
+            with timed('transcribe'):
+                # 'extract' records the time spent waiting for ffmpeg to decode audio
+                audio_chunks = timed_iter(stream_audio_chunks(input_video_path), 'extract')
+                for segment in iter_transcribed_segments(audio_chunks, SAMPLE_RATE, backend=stt_backend):
+                    segments.append(segment)
+                    on_segment(len(segments) - 1, segment)
+                    report_transcribe(None, segments=len(segments), audio_seconds=round(segment['end'], 1))
+                if not any(segment['text'] for segment in segments):
+                    raise Exception("Transcription failed")
+            if cache:
+                cache.put_json('transcript', transcript_key, {'segments': segments})
+                results['cache']['transcript'] = 'miss'
+            return {'segments': segments}
+
+        # Step 1: Extract audio
+        audio = run_stage('extract', audio_key, extract, checkpoints, files=lambda data: [data['audio_path']],
+                          resumed=results['resumed'])
+        results['audio_path'] = audio['audio_path']
+
+        # Step 2: Transcribe audio in silence-delimited segments
+        print("Transcribing audio...")
+        report_transcribe(0.0, segments=0)
+        with timed('transcribe'):
+            segments = transcribe_audio_segments(audio['audio_path'], backend=stt_backend,
+                                                 progress=report_transcribe)
+            if not segments or not any(segment['text'] for segment in segments):
+                raise Exception("Transcription failed")
+        if cache:
+            cache.put_json('transcript', transcript_key, {'segments': segments})
+            results['cache']['transcript'] = 'miss'
+        return {'segments': segments}
+
+    segments = run_stage('transcribe', transcript_key, transcribe, checkpoints,
+                         resumed=results['resumed'])['segments']
+    if 'transcribe' in results['resumed']:
+        report_transcribe(100.0, segments=len(segments), resumed=True)
+    if on_segment is not None:
+        # Only segments restored from the cache or a checkpoint get through, see _publish_once()
+        for index, segment in enumerate(segments):
+            on_segment(index, segment)
+
+    transcription = ' '.join(segment['text'] for segment in segments if segment['text'])
+    results['segments'] = segments
+    results['audio_seconds'] = segments[-1]['end']
+        
+    # Debug print
+    print(f"Debug - Transcription length: {len(transcription)}")
+    print("Debug - First 100 characters of transcription:", transcription[:100])
+    
+    # Save transcription to file
+    with open(output_transcription, 'w', encoding='utf-8') as f:
+        f.write(transcription)
+    results['transcription_path'] = output_transcription
+    
+    # Step 3: Generate summary
+    summary_key = make_key('summary', hash_text(transcription), SUMMARY_PARAMS)
+    summary_result = run_stage('summarize', summary_key,
+                               lambda: _summarize_stage(transcription, cache, idf_model, results['cache'],
+                                                        report_summarize),
+                               checkpoints, resumed=results['resumed'])
+    if 'summarize' in results['resumed']:
+        report_summarize(100.0, resumed=True)
+
+    notes = NotesResult.from_summary(workspace['video_id'], summary_result, transcription, segments)
+    notes.slides = assign_segments(slides, segments)
+    _finish_notes(notes, workspace, results, cache, export_summary, progress, languages, translation_backend)
+
+def _run_stages_bounded(input_video_path, workspace, results, stt_backend, cache, idf_model, export_summary,
+                        progress, languages=None, translation_backend=None, memory_budget_mb=None,
+                        checkpoints=None, detect_slides=False, on_segment=None):
+    """Bounded-memory variant of _run_stages: stream audio, spill the transcript to disk
+    and summarize it window by window"""
+    report_transcribe = stage_progress(progress, 'transcribe')
+    report_summarize = stage_progress(progress, 'summarize')
+
+    audio_key = make_key('audio', workspace['video_id'], AUDIO_PARAMS)
+    transcript_key = make_key('transcript', audio_key, stt_backend.cache_params())
+
+    slides = _slides_stage(input_video_path, workspace, results, checkpoints, progress) if detect_slides else []
+
+    def transcribe():
+        # Step 1-2: Transcribe straight from the container, spilling segments as they arrive
+        cached_segments = cache.get_file('transcript', transcript_key, '.jsonl') if cache else None
+        if cached_segments:
+            print("Using cached transcription...")
+            segment_source = read_segments(cached_segments)
+            results['cache']['transcript'] = 'hit'
+        else:
+            print("Streaming audio into the transcriber...")
+            segment_source = iter_transcribed_segments(timed_iter(stream_audio_chunks(input_video_path), 'extract'),
+                                                       SAMPLE_RATE, backend=stt_backend)
+
+        report_transcribe(0.0, segments=0)
+        # Extraction is streamed into transcription: 'transcribe' covers both, while
+        # 'extract' only records the time spent waiting for decoded audio
+        with timed('transcribe'), SegmentSpill(workspace['segments_path'],
+                                               workspace['transcription_path']) as spill:
+            for segment in segment_source:
+                spill.write(segment)
+                if on_segment is not None:
+                    on_segment(spill.count - 1, segment)
+                report_transcribe(None, segments=spill.count, audio_seconds=round(spill.audio_seconds, 1))
+            if not spill.text_chars:
+                raise Exception("Transcription failed")
+        if cache and not cached_segments:
+            cache.put_file('transcript', transcript_key, workspace['segments_path'], '.jsonl')
+            results['cache']['transcript'] = 'miss'
+        return {'text_hash': spill.text_hash(), 'text_chars': spill.text_chars,
+                'audio_seconds': spill.audio_seconds}
+
+    # The spilled transcript has its own checkpoint key, apart from the in-memory pipeline's
+    spill_files = [workspace['segments_path'], workspace['transcription_path']]
+    transcript = run_stage('transcribe', make_key('transcript', transcript_key, {'spill': True}), transcribe,
+                           checkpoints, files=lambda _: spill_files, resumed=results['resumed'])
+    resumed = 'transcribe' in results['resumed']
+    report_transcribe(100.0, text_chars=transcript['text_chars'], resumed=resumed)
+    if resumed and on_segment is not None:
+        for index, segment in enumerate(read_segments(workspace['segments_path'])):
+            on_segment(index, segment)
+    results['transcription_path'] = workspace['transcription_path']
+    results['segments_path'] = workspace['segments_path']
+    results['audio_seconds'] = transcript['audio_seconds']
+
+    # Step 3: Summarize one window at a time
+    summary_key = make_key('summary', transcript['text_hash'], WINDOWED_SUMMARY_PARAMS)
+
+    def summarize():
+        summary_result = cache.get_json('summary', summary_key) if cache else None
+        if summary_result:
+            print("Using cached summary...")
+            results['cache']['summary'] = 'hit'
+            report_summarize(100.0, cached=True)
+            return summary_result
+
+        window_chars = window_chars_for_budget(memory_budget_mb)
+        print(f"Generating summary in windows of {window_chars} characters...")
+        report_summarize(0.0, step='windows')
+        with timed('summarize'):
+            summary_result = summarize_windows(iter_text_windows(workspace['segments_path'], window_chars),
+                                               workspace['root'], window_chars, progress=report_summarize,
+                                               idf_model=idf_model)
+            if summary_result['summary'] == ERROR_SUMMARY:
+                raise Exception("Summary generation failed")
+        if cache:
+            cache.put_json('summary', summary_key, summary_result)
+            results['cache']['summary'] = 'miss'
+        return summary_result
+
+    summary_result = run_stage('summarize', summary_key, summarize, checkpoints, resumed=results['resumed'])
+    if 'summarize' in results['resumed']:
+        report_summarize(100.0, resumed=True)
+
+    # The transcript stays on disk (transcription_path, segments_path)
+    notes = NotesResult.from_summary(workspace['video_id'], summary_result)
+    notes.slides = assign_segments(slides, read_segments(workspace['segments_path']), include_text=False)
+    _finish_notes(notes, workspace, results, cache, export_summary, progress, languages, translation_backend)
+
+def _finish_notes(notes, workspace, results, cache, export_summary, progress, languages, translation_backend):
+    """Translate and export the notes, then record them in results"""
+    if languages:
+        # Step 4: Translate the notes
+        _translate_stage(notes, languages, translation_backend, cache, stage_progress(progress, 'translate'))
+    results['notes'] = notes
+
+    # Rendering to a text file is an optional export
+    if export_summary:
+        results['summary_path'] = notes.export(workspace['summary_path'])
+
+    results['success'] = True
+
+def _publish_once(on_segment):
+    """Wrap an on_segment callback so each segment index is published once, in order
+
+    A retried transcription stage starts over from the first segment, and
+    replays after a cache hit or resume cover segments that may already have
+    been streamed; the client only sees the segments it has not seen yet.
+    """
+    published = [0]
+
+    def publish(index, segment):
+        if index == published[0]:
+            published[0] += 1
+            on_segment(index, segment)
+
+    return publish
+
+def _slides_stage(input_video_path, workspace, results, checkpoints, progress):
+    """Detect slide changes and save their thumbnails; returns [] if the video track cannot be read"""
+    report_slides = stage_progress(progress, 'slides')
+    slides_key = make_key('slides', workspace['video_id'], SLIDE_PARAMS)
+
+    def run():
+        print("Detecting slide changes...")
+        start = time.perf_counter()
+        with timed('slides'):
+            slides = detect_slide_changes(input_video_path, workspace['slides_dir'], progress=report_slides)
+        if slides:
+            print(f"Found {len(slides)} slides in {time.perf_counter() - start:.1f}s "
+                  f"for {slides[-1]['end']:.0f}s of video")
+        return {'slides': slides}
+
+    try:
+        slides = run_stage('slides', slides_key, run, checkpoints,
+                           files=lambda data: [slide['thumbnail'] for slide in data['slides'] if slide['thumbnail']],
+                           resumed=results['resumed'])['slides']
+    except Exception as e:
+        print(f"Error detecting slides: {e}")
+        return []
+    if 'slides' in results['resumed']:
+        report_slides(100.0, resumed=True)
+    return slides
+
+def _summarize_stage(transcription, cache, idf_model, cache_status, report_summarize):
+    """Summarize the transcript, reusing a cached summary of identical text"""
+    summary_key = make_key('summary', hash_text(transcription), SUMMARY_PARAMS)
+    summary_result = cache.get_json('summary', summary_key) if cache else None
+    if summary_result:
+        print("Using cached summary...")
+        cache_status['summary'] = 'hit'
+        report_summarize(100.0, cached=True)
+    else:
+        print("Generating summary using nlp_summarization module...")
+        report_summarize(0.0, step='summary')
+        with timed('summarize'):
+            summary_result = summarize_text(transcription, progress=report_summarize, idf_model=idf_model)
+            if summary_result['summary'] == ERROR_SUMMARY:
+                raise Exception("Summary generation failed")
+        if cache:
+            cache.put_json('summary', summary_key, summary_result)
+            cache_status['summary'] = 'miss'
+    return summary_result
+
+def _translate_stage(notes, languages, translation_backend, cache, report_translate):
+    """Translate the notes into each requested language, reusing cached sentence translations"""
+    print(f"Translating notes into {', '.join(languages)}...")
+    report_translate(0.0)
+    with timed('translate'):
+        notes.translations = translate_notes(notes, languages, backend=translation_backend, cache=cache,
+                                             progress=report_translate)
+
+# Rolling key points in streaming mode are ranked among this many recent points
+ROLLING_POINTS = 200
+
+def stream_video_notes(input_video_path: str, base_output_dir: str, video_id: str = None, stt_backend=None,
+                       use_cache: bool = True, progress=None, languages=None, translation_backend=None,
+                       low_memory: bool = False, memory_budget_mb: float = None, detect_slides: bool = False):
+    """Streaming pipeline mode: yield transcript and notes while the video is processed
+
+    Runs process_video() with on_segment on a worker thread, so streaming
+    jobs get the same stages, cache, checkpoints, retries and metrics.
+    Audio is decoded straight from the container into the transcriber (no
+    WAV file), so the first events arrive seconds after starting, whatever
+    the length of the video. Yields dicts with a 'type' of:
+
+        'segment'     a transcribed segment ('segment_index', 'start', 'end', 'text')
+        'key_points'  points found in that segment ('new_points') and the
+                      current top points among the last ROLLING_POINTS
+                      ('key_points'); the final notes rank all of them
+        'notes'       the final NotesResult ('notes'), after summarization and
+                      translation into languages, if given
+
+    With low_memory, the pipeline runs in bounded-memory mode, and with
+    detect_slides the notes include slides (see process_video()). The
+    rolling key points are bounded either way.
+
+    Errors are raised to the caller. If the caller stops iterating early,
+    the pipeline still runs to completion in the background.
+    """
+    events = queue.Queue()
+    point_index = NearDuplicateIndex(max_texts=DEDUP_RECENT_POINTS)
+    points = deque(maxlen=ROLLING_POINTS)
+
+    def on_segment(index, segment):
+        events.put({'type': 'segment', 'segment_index': index, **segment})
+        if not segment['text']:
+            return
+        try:
+            # Rolling key points: candidates from this segment that are not near duplicates
+            new_points = [point for point in candidate_points(analyze_text(segment['text']))
+                          if point_index.add(point)]
+        except Exception as e:
+            # Rolling key points are a preview; they must not fail the transcription stage
+            print(f"Error extracting rolling key points: {e}")
+            return
+        if new_points:
+            points.extend(new_points)
+            events.put({
+                'type': 'key_points',
+                'segment_index': index,
+                'new_points': new_points,
+                'key_points': rank_points(list(points))
+            })
+
+    def run():
+        results = process_video(input_video_path, base_output_dir, video_id=video_id, stt_backend=stt_backend,
+                                use_cache=use_cache, progress=progress, languages=languages,
+                                translation_backend=translation_backend, low_memory=low_memory,
+                                memory_budget_mb=memory_budget_mb, detect_slides=detect_slides,
+                                on_segment=on_segment)
+        events.put({'type': 'results', 'results': results})
+
+    worker = threading.Thread(target=run, name='stream-video-notes', daemon=True)
+    worker.start()
+    while True:
+        event = events.get()
+        if event['type'] == 'results':
+            break
+        yield event
+    worker.join()
+
+    results = event['results']
+    if not results['success']:
+        raise Exception(f"Video processing failed: {results.get('error', 'Unknown error')}")
+    yield {'type': 'notes', 'notes': results['notes'], 'cache': results['cache']}
+
+def index_transcript(base_output_dir, video_id, segments, title=None):
+    """Add a video's transcript segments to the search index; a failure is reported but not raised"""
+    try:
+        with timed('index'):
+            count = get_search_index(os.path.join(base_output_dir, SEARCH_INDEX_FILE)).index_video(
+                video_id, segments, title)
+        print(f"Indexed {count} transcript segments for search")
+    except Exception as e:
+        print(f"Error indexing transcript: {e}")
+
+def _link_or_copy(source, destination):
+    """Hard-link a cached artifact into a workspace, copying when linking is not possible"""
+    if os.path.exists(destination):
+        os.remove(destination)
+    try:
+        os.link(source, destination)
+    except OSError:
+        shutil.copyfile(source, destination)
+
 def display_summary(summary_path):
     """Helper function to display the summary content"""
     try:
@@ -95,12 +534,15 @@ def display_summary(summary_path):
         print(f"Error displaying summary: {e}")
 
 if __name__ == "__main__":
+    import moviepy
+    print("MoviePy version:", moviepy.__version__)
+
     # Test the video processing
     input_video = "static/uploaded_videos/videoplayback.mp4"  # Update this path to your video file
     base_dir = "static"
     
     print(f"Processing video: {input_video}")
-    results = process_video(input_video, base_dir)
+    results = process_video(input_video, base_dir, export_summary=True)
     
     if results['success']:
         print("\nProcessing completed successfully!")
@@ -0,0 +1,28 @@
+import os
+from batch import group_by_content, duplicate_entry, is_done
+
+
+def test_copies_are_grouped_by_content(tmp_path):
+    paths = []
+    for name, content in (('a.mp4', b'lecture one'), ('b.mp4', b'lecture two'), ('copy-of-a.mp4', b'lecture one')):
+        path = tmp_path / name
+        path.write_bytes(content)
+        paths.append(str(path))
+    missing = str(tmp_path / 'missing.mp4')
+
+    groups = list(group_by_content(paths + [missing]).values())
+    assert groups == [[paths[0], paths[2]], [paths[1]], [missing]]
+
+
+def test_duplicate_entry_counts_as_done(tmp_path):
+    original, copy = tmp_path / 'a.mp4', tmp_path / 'copy.mp4'
+    original.write_bytes(b'lecture')
+    copy.write_bytes(b'lecture')
+    os.utime(copy, (1000, 1000))
+    entry = {'path': str(original), 'size': 7, 'mtime': os.stat(original).st_mtime, 'video_id': 'abc',
+             'status': 'completed', 'error': None, 'wall_seconds': 12.0, 'audio_seconds': 60.0}
+
+    duplicate = duplicate_entry(entry, str(copy))
+    assert (duplicate['path'], duplicate['duplicate_of'], duplicate['video_id']) == (str(copy), str(original), 'abc')
+    assert duplicate['mtime'] == 1000 and duplicate['wall_seconds'] == 0.0
+    assert is_done(duplicate, str(copy)) and is_done(entry, str(original))
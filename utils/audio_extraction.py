@@ -1,31 +1,117 @@
-import moviepy.editor as mp
+import subprocess
+import threading
+from collections import deque
 
-def extract_audio_from_video(video_path: str, audio_path: str) -> bool:
+# Speech models expect 16 kHz mono audio
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2  # bytes per sample (signed 16-bit little endian)
+
+def _progress_logger(progress):
+    """Builds a MoviePy (proglog) logger that reports the write progress as a percentage."""
+    from proglog import ProgressBarLogger
+
+    class _PercentLogger(ProgressBarLogger):
+        def bars_callback(self, bar, attr, value, old_value=None):
+            total = self.bars[bar].get('total')
+            if attr == 'index' and total:
+                progress(min(100.0, 100.0 * value / total))
+
+    return _PercentLogger()
+
+def extract_audio_from_video(video_path: str, audio_path: str, progress=None) -> bool:
     """
     Extracts audio from the video file and saves it as a .wav file.
-    
+
     Parameters:
         video_path (str): Path to the input video file.
         audio_path (str): Path where the extracted audio will be saved (including the .wav extension).
-        
+        progress (callable): Optional progress(percent) callback for the decoded share of the audio.
+
     Returns:
         bool: True if extraction is successful, False if there was an error.
     """
     try:
-       
-        video = mp.VideoFileClip(video_path)
+        # Imported here so that importing this module stays cheap
+        import moviepy.editor as mp
 
-       
-        audio = video.audio
+        # Open only the audio stream; VideoFileClip would also probe and
+        # set up a reader for the video frames we never use
+        audio = mp.AudioFileClip(video_path)
 
-       
-        audio.write_audiofile(audio_path, codec='pcm_s16le')
+        # 16 kHz mono is all speech recognition needs
+        logger = _progress_logger(progress) if progress else 'bar'
+        audio.write_audiofile(audio_path, fps=SAMPLE_RATE, codec='pcm_s16le', ffmpeg_params=['-ac', '1'],
+                              logger=logger)
 
-      
-        video.close()
         audio.close()
 
         return True
     except Exception as e:
         print(f"Error extracting audio: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def get_ffmpeg_binary() -> str:
+    """Returns the ffmpeg executable used by MoviePy, falling back to the one on PATH."""
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe
+        return get_ffmpeg_exe()
+    except Exception:
+        return 'ffmpeg'
+
+def stream_audio_chunks(video_path: str, chunk_seconds: float = 30.0, sample_rate: int = SAMPLE_RATE):
+    """
+    Streams the audio track of a video as raw mono PCM chunks, without writing a WAV file.
+
+    ffmpeg demuxes and decodes only the audio stream and pipes it to us, so
+    callers can start working on the first chunk while the rest is still decoding.
+
+    Parameters:
+        video_path (str): Path to the input video file.
+        chunk_seconds (float): Duration of audio in each chunk (the last one may be shorter).
+        sample_rate (int): Output sample rate in Hz.
+
+    Yields:
+        bytes: Signed 16-bit little-endian mono PCM samples.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error.
+    """
+    chunk_bytes = max(1, int(chunk_seconds * sample_rate)) * SAMPLE_WIDTH
+    command = [
+        get_ffmpeg_binary(), '-nostdin', '-v', 'error',
+        '-i', video_path,
+        '-vn', '-sn', '-dn',
+        '-ac', '1', '-ar', str(sample_rate),
+        '-acodec', 'pcm_s16le', '-f', 's16le', 'pipe:1'
+    ]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    # Damaged files can log an error per packet; stderr is drained on its own
+    # thread (keeping only the last lines) so a full pipe can never stall ffmpeg
+    errors = deque(maxlen=20)
+
+    def read_errors():
+        for line in process.stderr:
+            errors.append(line.decode('utf-8', errors='replace').strip())
+
+    reader = threading.Thread(target=read_errors, daemon=True)
+    reader.start()
+    try:
+        while True:
+            chunk = process.stdout.read(chunk_bytes)
+            if not chunk:
+                break
+            yield chunk
+
+        returncode = process.wait()
+        reader.join()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to decode audio: {' '.join(errors)}")
+    finally:
+        # Also runs when the consumer stops iterating early
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        reader.join()
+        process.stdout.close()
+        process.stderr.close()
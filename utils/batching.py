@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+
+DEFAULT_MAX_BATCH_SIZE = int(os.environ.get('SUMMARY_BATCH_SIZE', 8))
+DEFAULT_MAX_WAIT = float(os.environ.get('SUMMARY_BATCH_WAIT_MS', 20)) / 1000
+
+
+class _Request:
+    __slots__ = ('text', 'params', 'future', 'enqueued')
+
+    def __init__(self, text, params):
+        self.text = text
+        self.params = params
+        self.future = Future()
+        self.enqueued = time.monotonic()
+
+
+class MicroBatcher:
+    """
+    Shares one model between concurrent jobs by running their inputs in micro-batches.
+
+    Callers submit texts with submit() from any thread and block until their
+    results are ready. A single worker thread takes the oldest request,
+    waits up to max_wait seconds for more requests with the same generation
+    parameters, and runs up to max_batch_size of them in one call, so
+    concurrent jobs share forward passes instead of running many small ones
+    back to back. A full batch starts at once; max_wait only delays batches
+    that never fill up.
+    """
+
+    def __init__(self, run_batch, max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_wait: float = DEFAULT_MAX_WAIT, name: str = 'micro-batcher'):
+        """
+        Parameters:
+            run_batch (callable): run_batch(texts, **params) returning one result per text.
+            max_batch_size (int): Maximum number of texts per call.
+            max_wait (float): Seconds the oldest request may wait for the batch to fill.
+            name (str): Name of the worker thread.
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending = []
+        self._condition = threading.Condition()
+        self._stats = {'batches': 0, 'items': 0, 'busy_seconds': 0.0}
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, texts: list, **params) -> list:
+        """
+        Runs run_batch over texts, batched with other callers, and waits for the results.
+
+        Parameters:
+            texts (list): Inputs to process.
+            **params: Generation parameters; only requests with equal parameters share a batch.
+
+        Returns:
+            list: One result per text, in order.
+
+        Raises:
+            Exception: Whatever run_batch raised for the batch holding a text.
+        """
+        requests = [_Request(text, params) for text in texts]
+        with self._condition:
+            self._pending.extend(requests)
+            self._condition.notify_all()
+        return [request.future.result() for request in requests]
+
+    def stats(self) -> dict:
+        """Returns the number of batches run, texts processed and the mean batch size."""
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        stats['mean_batch_size'] = stats['items'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def _next_batch(self) -> list:
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending)
+            oldest = self._pending[0]
+            deadline = oldest.enqueued + self.max_wait
+            while True:
+                batch = [request for request in self._pending if request.params == oldest.params]
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch = batch[:self.max_batch_size]
+            taken = set(map(id, batch))
+            self._pending = [request for request in self._pending if id(request) not in taken]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            start = time.perf_counter()
+            try:
+                results = self.run_batch([request.text for request in batch], **batch[0].params)
+                for request, result in zip(batch, results):
+                    request.future.set_result(result)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+
+            with self._condition:
+                self._stats['batches'] += 1
+                self._stats['items'] += len(batch)
+                self._stats['busy_seconds'] += time.perf_counter() - start
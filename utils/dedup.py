@@ -0,0 +1,124 @@
+from collections import Counter, defaultdict
+
+
+def _min_overlap(size: int, threshold: float) -> int:
+    """Smallest number of shared words k with k / size > threshold."""
+    k = int(threshold * size) + 1
+    while k > 1 and (k - 1) / size > threshold:
+        k -= 1
+    while k / size <= threshold:
+        k += 1
+    return k
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate filter over word sets.
+
+    Two texts are similar when the words they share make up more than
+    threshold of the shorter text's distinct lowercase words, the same rule
+    as nlp_summarization.similar_text(). add() keeps a text unless it is
+    similar to one kept before.
+
+    Instead of comparing every pair, kept texts are held in two inverted
+    indexes and only texts that can possibly reach the threshold are
+    compared (prefix filtering): if A and B must share at least k words,
+    then the first len(A) - k + 1 words of A, in any fixed order, include
+    at least one word of B. Words are ordered rarest first, so those
+    prefixes hit short posting lists. The argument holds for any order, so
+    the word frequencies may keep changing as texts are added.
+
+    With max_texts, only the most recently kept max_texts texts are compared
+    against and older ones are dropped from the indexes, so memory stays
+    bounded on unbounded streams; a text repeating one kept longer ago than
+    that is kept again. Only the word frequencies (one count per distinct
+    word) keep growing.
+    """
+
+    def __init__(self, threshold: float = 0.7, frequency: Counter = None, max_texts: int = None):
+        self.threshold = threshold
+        self.max_texts = max_texts
+        # Word frequencies used to order prefixes; updated by add() unless supplied
+        self._frequency = frequency
+        self._track_frequency = frequency is None
+        if self._track_frequency:
+            self._frequency = Counter()
+        # id -> (word set, prefix) of kept texts, oldest first
+        self._sets = {}
+        self._next_id = 0
+        # token -> ids of kept texts containing it (dicts as ordered sets, so ids can be dropped)
+        self._full_index = defaultdict(dict)
+        # token -> ids of kept texts whose own prefix contains it
+        self._prefix_index = defaultdict(dict)
+
+    def add(self, text: str) -> bool:
+        """
+        Adds text unless it is a near duplicate of a text already kept.
+
+        Returns:
+            bool: True if the text was kept.
+        """
+        tokens = frozenset(text.lower().split())
+        if self._track_frequency:
+            self._frequency.update(tokens)
+
+        size = len(tokens)
+        if size == 0:
+            # Empty texts are never similar to anything
+            return True
+
+        ordered = sorted(tokens, key=lambda token: (self._frequency[token], token))
+        prefix = ordered[:size - _min_overlap(size, self.threshold) + 1]
+
+        candidates = set()
+        # Kept texts at least as long: our prefix must hit them
+        for token in prefix:
+            candidates.update(i for i in self._full_index.get(token, ()) if len(self._sets[i][0]) >= size)
+        # Shorter kept texts: their prefix must hit us
+        for token in ordered:
+            candidates.update(i for i in self._prefix_index.get(token, ()) if len(self._sets[i][0]) <= size)
+
+        if any(len(tokens & self._sets[i][0]) / min(size, len(self._sets[i][0])) > self.threshold
+               for i in candidates):
+            return False
+
+        index = self._next_id
+        self._next_id += 1
+        self._sets[index] = (tokens, prefix)
+        for token in tokens:
+            self._full_index[token][index] = None
+        for token in prefix:
+            self._prefix_index[token][index] = None
+        if self.max_texts is not None and len(self._sets) > self.max_texts:
+            self._forget(next(iter(self._sets)))
+        return True
+
+    def _forget(self, index: int):
+        """Drops a kept text from the indexes."""
+        tokens, prefix = self._sets.pop(index)
+        for postings, words in ((self._full_index, tokens), (self._prefix_index, prefix)):
+            for token in words:
+                del postings[token][index]
+                if not postings[token]:
+                    del postings[token]
+
+    def __len__(self) -> int:
+        """Number of kept texts still compared against."""
+        return len(self._sets)
+
+
+def remove_near_duplicates(texts: list, threshold: float = 0.7) -> list:
+    """
+    Keeps each text unless it is too similar to a text that was already kept.
+
+    Parameters:
+        texts (list): Candidate texts, in priority order.
+        threshold (float): Overlap ratio above which a text counts as a duplicate.
+
+    Returns:
+        list: The texts that were kept, in their original order.
+    """
+    # All texts are known up front, so order prefixes by their global word frequency
+    frequency = Counter(token for text in texts for token in frozenset(text.lower().split()))
+    index = NearDuplicateIndex(threshold, frequency)
+    return [text for text in texts if index.add(text)]
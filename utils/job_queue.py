@@ -0,0 +1,117 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from utils.progress import ProgressTracker
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue already holds the maximum number of pending jobs."""
+
+
+class JobQueue:
+    """
+    Runs pipeline jobs on a bounded pool of background worker threads.
+
+    Each submitted job gets an ID straight away; its status and result can be
+    looked up later with get(). Finished jobs are kept in memory up to
+    max_finished, after which the oldest ones are dropped.
+    """
+
+    def __init__(self, worker_count: int = 2, max_pending: int = 32, max_finished: int = 200):
+        self.worker_count = worker_count
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self._executor = ThreadPoolExecutor(max_workers=worker_count, thread_name_prefix='job-worker')
+        self._jobs = {}
+        self._finished_order = []
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, report_progress: bool = False, **kwargs) -> str:
+        """
+        Queue func(*args, **kwargs) for background execution.
+
+        Every job gets a ProgressTracker (see progress()); with report_progress
+        it is also passed to func as the 'progress' keyword argument.
+
+        Parameters:
+            func (callable): The job function. Its return value becomes the job result.
+            report_progress (bool): Whether func accepts a progress callback.
+
+        Returns:
+            str: The ID of the new job.
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued or running.
+        """
+        with self._lock:
+            if self._pending_count() >= self.max_pending:
+                raise QueueFullError(f"Job queue is full ({self.max_pending} pending jobs)")
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+                'tracker': ProgressTracker()
+            }
+            if report_progress:
+                kwargs['progress'] = self._jobs[job_id]['tracker']
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id: str) -> dict:
+        """Return a snapshot of the job record, or None if the job is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            snapshot = {key: value for key, value in job.items() if key != 'tracker'}
+            snapshot['progress'] = job['tracker'].latest()
+            return snapshot
+
+    def progress(self, job_id: str) -> ProgressTracker:
+        """Return the progress tracker of a job, or None if the job is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job['tracker'] if job else None
+
+    def pending_count(self) -> int:
+        """Number of jobs that are queued or running."""
+        with self._lock:
+            return self._pending_count()
+
+    def _pending_count(self) -> int:
+        return sum(1 for job in self._jobs.values() if job['status'] in ('queued', 'running'))
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running jobs to finish."""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, status='running', started_at=time.time())
+        try:
+            result = func(*args, **kwargs)
+            self._update(job_id, status='completed', result=result, finished_at=time.time())
+        except Exception as e:
+            print(f"Error in job {job_id}: {e}")
+            self._update(job_id, status='failed', error=str(e), finished_at=time.time())
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+
+            if job['status'] in ('completed', 'failed'):
+                job['tracker'].finish(job['status'], job['error'])
+                self._finished_order.append(job_id)
+                # Drop the oldest finished jobs once we are over the retention limit
+                while len(self._finished_order) > self.max_finished:
+                    self._jobs.pop(self._finished_order.pop(0), None)
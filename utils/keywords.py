@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows): save() is then only safe within one process
+    fcntl = None
+
+MAX_PHRASE_WORDS = 3
+
+
+class IdfModel:
+    """
+    Corpus-level document frequencies for keyword scoring.
+
+    Every processed lecture adds its set of terms once (documents are
+    identified by a hash of that set, so reprocessing a video does not count
+    it twice). With a path the model is persisted as JSON after each update;
+    save() holds an exclusive lock on a sidecar .lock file while it reads,
+    merges and replaces the file, so processes sharing it (e.g. batch.py
+    workers) never overwrite each other's documents.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._documents = set()
+        self._df = Counter()
+        # doc_id -> terms of documents not yet merged into the file
+        self._pending = {}
+        if path and os.path.exists(path):
+            self._documents, self._df = self._read()
+
+    @property
+    def document_count(self) -> int:
+        return len(self._documents)
+
+    def idf(self, terms: list) -> np.ndarray:
+        """
+        Returns the smoothed IDF of each term: ln((1 + N) / (1 + df)) + 1.
+
+        Terms never seen get the highest weight; with an empty corpus every
+        term weighs 1, so scores fall back to term frequency.
+        """
+        with self._lock:
+            n = len(self._documents)
+            df = np.fromiter((self._df.get(term, 0) for term in terms), dtype=np.float64, count=len(terms))
+        return np.log((1.0 + n) / (1.0 + df)) + 1.0
+
+    def add_document(self, terms) -> bool:
+        """
+        Counts one document's terms into the document frequencies.
+
+        Parameters:
+            terms (iterable): The distinct terms of the document.
+
+        Returns:
+            bool: False if the same document was added before.
+        """
+        terms = sorted(set(terms))
+        doc_id = hashlib.sha256('\n'.join(terms).encode('utf-8')).hexdigest()[:32]
+        with self._lock:
+            if doc_id in self._documents:
+                return False
+            self._documents.add(doc_id)
+            self._df.update(terms)
+            self._pending[doc_id] = terms
+        if self.path:
+            self.save()
+        return True
+
+    def save(self):
+        """Merges pending updates into the file on disk with an atomic rename."""
+        with self._lock, self._file_lock():
+            documents, df = self._read() if os.path.exists(self.path) else (set(), Counter())
+            for doc_id, terms in self._pending.items():
+                if doc_id not in documents:
+                    documents.add(doc_id)
+                    df.update(terms)
+            self._pending = {}
+
+            temp_path = f"{self.path}.tmp-{os.getpid()}"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'documents': sorted(documents), 'df': df}, f)
+            os.replace(temp_path, self.path)
+            self._documents, self._df = documents, df
+
+    @contextmanager
+    def _file_lock(self):
+        """Holds the cross-process lock on the model file."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.path}.lock", 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return set(data['documents']), Counter(data['df'])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading IDF model {self.path}: {e}")
+            return set(), Counter()
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def get_idf_model(path: str) -> IdfModel:
+    """Returns the process-wide IdfModel for a file."""
+    path = os.path.abspath(path)
+    with _models_lock:
+        if path not in _models:
+            _models[path] = IdfModel(path)
+        return _models[path]
+
+
+def _content_words(tokens, stop_words: set) -> list:
+    """Lowercase words of a span that can carry meaning (same filter as the old keyword extractor)."""
+    words = []
+    for token in tokens:
+        word = token.text.lower()
+        if word.isalnum() and len(word) > 2 and not word.isnumeric() and word not in stop_words:
+            words.append(word)
+    return words
+
+
+def collect_candidates(doc, stop_words: set):
+    """
+    Counts keyword candidates in a parsed text.
+
+    Terms are content words; phrases are entities and noun chunks reduced to
+    their content words (so "the neural network" and "a neural network"
+    merge), with 2 to MAX_PHRASE_WORDS words.
+
+    Parameters:
+        doc (Doc): The text parsed by nlp_summarization.analyze_text().
+        stop_words (set): Words that are never keywords.
+
+    Returns:
+        tuple: (term_counts, phrase_counts), two Counters.
+    """
+    term_counts = Counter(_content_words(doc, stop_words))
+
+    phrase_counts = Counter()
+    for spans in (doc.ents, doc.noun_chunks):
+        counts = Counter()
+        for span in spans:
+            words = _content_words(span, stop_words)
+            if 1 < len(words) <= MAX_PHRASE_WORDS:
+                counts[' '.join(words)] += 1
+        # An entity is often also a noun chunk; count its occurrences once
+        for phrase, count in counts.items():
+            phrase_counts[phrase] = max(phrase_counts[phrase], count)
+    return term_counts, phrase_counts
+
+
+def score_keywords(term_counts: Counter, phrase_counts: Counter, idf_model: IdfModel = None,
+                   top_k: int = 10) -> list:
+    """
+    Ranks terms and phrases together by TF-IDF.
+
+    Each term gets a sublinear TF-IDF weight (1 + ln tf) * idf, normalized
+    over the document. Candidates (every term plus every phrase) form a
+    sparse candidate-by-term matrix, so all scores come from one sparse
+    product: the summed weight of a candidate's terms, times 1 + ln of how
+    often the candidate occurs. A phrase thus outranks its own words unless
+    they are also frequent elsewhere, and candidates whose words are all
+    covered by a better-ranked keyword are dropped.
+
+    Parameters:
+        term_counts (Counter): Term frequencies, see collect_candidates().
+        phrase_counts (Counter): Phrase frequencies, see collect_candidates().
+        idf_model (IdfModel): Corpus statistics; without one every IDF is 1.
+        top_k (int): Number of keywords to return.
+
+    Returns:
+        list: [keyword, score] pairs, best first.
+    """
+    from scipy.sparse import csr_matrix
+
+    if not term_counts:
+        return []
+
+    terms = sorted(term_counts)
+    term_index = {term: i for i, term in enumerate(terms)}
+    tf = np.fromiter((term_counts[term] for term in terms), dtype=np.float64, count=len(terms))
+    idf = idf_model.idf(terms) if idf_model is not None else np.ones(len(terms))
+    weights = (1.0 + np.log(tf)) * idf
+    weights /= np.linalg.norm(weights)
+
+    candidates = terms + [phrase for phrase in phrase_counts if phrase not in term_index]
+    counts = np.concatenate([tf, np.fromiter((phrase_counts[phrase] for phrase in candidates[len(terms):]),
+                                             dtype=np.float64, count=len(candidates) - len(terms))])
+    rows, cols = [], []
+    for row, candidate in enumerate(candidates):
+        for word in candidate.split():
+            rows.append(row)
+            cols.append(term_index[word])
+    membership = csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(candidates), len(terms)))
+
+    scores = (membership @ weights) * (1.0 + np.log(counts))
+
+    keywords = []
+    covered = []
+    for row in np.argsort(-scores, kind='stable'):
+        words = set(candidates[row].split())
+        if any(words <= kept for kept in covered):
+            continue
+        keywords.append([candidates[row], round(float(scores[row]), 4)])
+        covered.append(words)
+        if len(keywords) == top_k:
+            break
+    return keywords
+
+
+class KeywordAccumulator:
+    """
+    Collects keyword candidates from text fed in windows (bounded-memory mode).
+
+    Only the term and phrase Counters are kept, so memory grows with the
+    vocabulary, not with the length of the text; keywords() scores them
+    exactly as score_keywords() would for the whole text at once.
+    """
+
+    def __init__(self, stop_words: set, idf_model: IdfModel = None):
+        self.stop_words = stop_words
+        self.idf_model = idf_model
+        self._term_counts = Counter()
+        self._phrase_counts = Counter()
+
+    def add(self, doc):
+        """Adds one window, parsed by analyze_text()."""
+        term_counts, phrase_counts = collect_candidates(doc, self.stop_words)
+        self._term_counts.update(term_counts)
+        self._phrase_counts.update(phrase_counts)
+
+    def keyword_scores(self, top_k: int = 10) -> list:
+        """Counts the text into the IDF model and returns [keyword, score] pairs, best first."""
+        if self.idf_model is not None:
+            self.idf_model.add_document(self._term_counts)
+        return score_keywords(self._term_counts, self._phrase_counts, self.idf_model, top_k)
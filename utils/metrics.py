@@ -0,0 +1,323 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+class Registry:
+    """
+    Holds metrics and renders them in the Prometheus text exposition format.
+
+    Besides metrics updated as things happen, collectors (functions called at
+    render time) can report values that already live elsewhere, such as the
+    job queue depth or result cache statistics.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric '{metric.name}' is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector):
+        """
+        Adds a function called on every render.
+
+        The function returns an iterable of (name, type, help, samples) tuples,
+        where samples is a list of (labels dict, value) pairs.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"Error in metrics collector: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in samples)
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """
+        Returns the raw values of all metrics, for merging into another registry.
+
+        Parameters:
+            reset (bool): Also clear counters and histograms, so the next
+                snapshot only holds what happened since this one.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot(reset) for metric in metrics}
+
+    def merge(self, snapshot: dict):
+        """Adds a snapshot taken in another process (e.g. a batch worker) to this registry."""
+        with self._lock:
+            metrics = dict(self._metrics)
+        for name, values in snapshot.items():
+            if name in metrics:
+                metrics[name].merge(values)
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    type = None
+
+    def __init__(self, name: str, documentation: str, labelnames=(), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric '{self.name}' takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> list:
+        with self._lock:
+            values = dict(self._values)
+        return self._header() + [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"
+                                 for key, value in sorted(values.items())]
+
+    def snapshot(self, reset: bool = False) -> dict:
+        with self._lock:
+            values = dict(self._values)
+            if reset and self.type != 'gauge':
+                self._values = {}
+        return values
+
+    def merge(self, values: dict):
+        with self._lock:
+            for key, value in values.items():
+                self._values[key] = self._values.get(key, 0.0) + value
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as bytes processed."""
+    type = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, such as a model's last load time."""
+    type = 'gauge'
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def merge(self, values: dict):
+        # The most recent value wins
+        with self._lock:
+            self._values.update(values)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (e.g. stage durations) over fixed buckets."""
+    type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS,
+                 registry: Registry = REGISTRY):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (not cumulative), then sum and count
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def render(self) -> list:
+        with self._lock:
+            values = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+
+        lines = self._header()
+        for key, (counts, total, count) in sorted(values.items()):
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': _format_value(bound)})} "
+                             f"{cumulative}")
+            lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+    def snapshot(self, reset: bool = False) -> dict:
+        with self._lock:
+            values = {key: [list(counts), total, count] for key, (counts, total, count) in self._values.items()}
+            if reset:
+                self._values = {}
+        return values
+
+    def merge(self, values: dict):
+        with self._lock:
+            for key, (counts, total, count) in values.items():
+                state = self._values.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+                state[0] = [a + b for a, b in zip(state[0], counts)]
+                state[1] += total
+                state[2] += count
+
+
+STAGE_SECONDS = Histogram('video_notes_stage_duration_seconds',
+                          'Wall time of pipeline stages', ['stage'])
+STAGE_FAILURES = Counter('video_notes_stage_failures_total',
+                         'Pipeline stage attempts that raised an error', ['stage'])
+VIDEOS_PROCESSED = Counter('video_notes_videos_processed_total',
+                           'Videos run through process_video, by outcome', ['status'])
+BYTES_PROCESSED = Counter('video_notes_bytes_processed_total',
+                          'Bytes of input handled, by kind (upload, video)', ['kind'])
+AUDIO_SECONDS = Counter('video_notes_audio_seconds_total',
+                        'Seconds of audio in successfully processed videos')
+PIPELINE_SECONDS = Counter('video_notes_pipeline_seconds_total',
+                           'Wall time spent in successful process_video calls')
+REALTIME_FACTOR = Histogram('video_notes_audio_seconds_per_wall_second',
+                            'Seconds of audio processed per second of wall time, per video',
+                            buckets=(0.25, 0.5, 1, 2, 5, 10, 20, 50, 100, 250))
+MODEL_LOAD_SECONDS = Gauge('video_notes_model_load_seconds',
+                           'Time taken to load each model', ['model'])
+
+
+@contextmanager
+def timed(stage: str):
+    """
+    Records the duration of the enclosed block as one observation of a stage,
+    counting a failure if it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_FAILURES.inc(stage=stage)
+        raise
+    finally:
+        STAGE_SECONDS.observe(time.perf_counter() - start, stage=stage)
+
+
+def service_metric_families(pending_jobs: int, cache_stats: dict, batch_stats: dict) -> list:
+    """
+    Metric families for state that lives outside the registry, for a collector.
+
+    Parameters:
+        pending_jobs (int): Jobs queued or running.
+        cache_stats (dict): ResultCache.stats().
+        batch_stats (dict): MicroBatcher.stats() of the summary batcher.
+
+    Returns:
+        list: (name, type, help, samples) tuples, see Registry.register_collector().
+    """
+    return [
+        ('video_notes_jobs_pending', 'gauge', 'Jobs queued or running', [({}, pending_jobs)]),
+        ('video_notes_cache_requests_total', 'counter', 'Result cache lookups by stage and result',
+         [({'stage': stage, 'result': result}, counts[field])
+          for stage, counts in sorted(cache_stats['stages'].items())
+          for result, field in (('hit', 'hits'), ('miss', 'misses'))]),
+        ('video_notes_cache_hit_ratio', 'gauge', 'Share of result cache lookups that hit',
+         [({}, cache_stats['hit_rate'])]),
+        ('video_notes_cache_bytes', 'gauge', 'Size of the result cache', [({}, cache_stats['bytes'])]),
+        ('video_notes_summary_batches_total', 'counter', 'Summarizer calls made by the micro-batcher',
+         [({}, batch_stats['batches'])]),
+        ('video_notes_summary_batch_items_total', 'counter', 'Texts summarized by the micro-batcher',
+         [({}, batch_stats['items'])])
+    ]
+
+
+def timed_iter(iterable, stage: str):
+    """
+    Yields from iterable, recording the time spent waiting for its items as one
+    observation of a stage once it is exhausted (or abandoned), counting a
+    failure if it raises.
+
+    Used where a stage is streamed into the next one, e.g. audio decoding
+    feeding transcription, so the two can still be timed apart.
+    """
+    waited = 0.0
+    iterator = iter(iterable)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                waited += time.perf_counter() - start
+                break
+            except Exception:
+                STAGE_FAILURES.inc(stage=stage)
+                raise
+            waited += time.perf_counter() - start
+            yield item
+    finally:
+        STAGE_SECONDS.observe(waited, stage=stage)
+
+
+def record_video(success: bool, video_bytes: int = 0, audio_seconds: float = 0.0, wall_seconds: float = 0.0):
+    """Records the outcome of one process_video call, with throughput for successful ones."""
+    VIDEOS_PROCESSED.inc(status='success' if success else 'failed')
+    if video_bytes:
+        BYTES_PROCESSED.inc(video_bytes, kind='video')
+    if success and wall_seconds > 0:
+        AUDIO_SECONDS.inc(audio_seconds)
+        PIPELINE_SECONDS.inc(wall_seconds)
+        REALTIME_FACTOR.observe(audio_seconds / wall_seconds)
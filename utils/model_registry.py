@@ -0,0 +1,86 @@
+import threading
+import time
+from utils.metrics import MODEL_LOAD_SECONDS
+
+# name -> zero-argument function that builds the model
+_loaders = {}
+# name -> loaded model, cached for the lifetime of the process
+_models = {}
+# name -> seconds spent in the loader
+_load_times = {}
+_name_locks = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name: str, loader):
+    """
+    Registers a loader for a model without loading it.
+
+    Parameters:
+        name (str): Name used to look the model up with get_model().
+        loader (callable): Zero-argument function returning the loaded model.
+    """
+    with _registry_lock:
+        _loaders[name] = loader
+        _name_locks.setdefault(name, threading.Lock())
+
+
+def get_model(name: str):
+    """
+    Returns the named model, loading it on first use.
+
+    Concurrent callers asking for a model that is still loading wait for that
+    load instead of starting another one.
+
+    Parameters:
+        name (str): Name the model was registered under.
+
+    Returns:
+        The loaded model.
+    """
+    model = _models.get(name)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        if name not in _loaders:
+            raise KeyError(f"No model registered under '{name}'")
+        lock = _name_locks[name]
+
+    with lock:
+        if name not in _models:
+            start = time.perf_counter()
+            _models[name] = _loaders[name]()
+            _load_times[name] = time.perf_counter() - start
+            MODEL_LOAD_SECONDS.set(_load_times[name], model=name)
+            print(f"Loaded model '{name}' in {_load_times[name]:.2f}s")
+        return _models[name]
+
+
+def is_loaded(name: str) -> bool:
+    """Returns True if the named model is already in memory."""
+    return name in _models
+
+
+def preload(names=None) -> dict:
+    """
+    Warm-up hook: loads models ahead of the first request.
+
+    Parameters:
+        names (iterable): Models to load; all registered models if None.
+
+    Returns:
+        dict: Load time in seconds of each requested model.
+    """
+    if names is None:
+        with _registry_lock:
+            names = list(_loaders)
+
+    for name in names:
+        get_model(name)
+    return {name: _load_times.get(name, 0.0) for name in names}
+
+
+def load_times() -> dict:
+    """Returns the load time in seconds of every model loaded so far."""
+    return dict(_load_times)
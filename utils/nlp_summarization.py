@@ -1,30 +1,139 @@
-import spacy
-from transformers import pipeline
-from sklearn.feature_extraction.text import TfidfVectorizer
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
+import os
+import threading
+from typing import TYPE_CHECKING
+from utils.model_registry import register_model, get_model
+from utils.dedup import remove_near_duplicates, NearDuplicateIndex
+from utils.spill import iter_line_windows
+from utils.keywords import KeywordAccumulator, collect_candidates, score_keywords
+from utils.textrank import sentence_vectors, top_sentences
+from utils.batching import MicroBatcher
+from utils.metrics import timed
 
-# Initialize the summarization pipeline
-summarizer = pipeline("summarization")
+if TYPE_CHECKING:
+    from spacy.tokens import Doc
 
-# Load the SpaCy model
-nlp = spacy.load("en_core_web_sm")
+# Key points and keywords need POS tags, the dependency parse and entities, not lemmas
+ANALYSIS_DISABLED_PIPES = ("lemmatizer",)
+PARSE_CHUNK_CHARS = 100000  # stays well below nlp.max_length
 
-# Download necessary NLTK resources
-nltk.download('punkt')
-nltk.download('stopwords')
-stop_words = set(stopwords.words("english"))
+# Everything that changes summarize_text() output; bump 'version' when the
+# extraction logic changes so cached summaries are recomputed
+SUMMARY_PARAMS = {'version': 3, 'summarizer': 'default', 'max_length': 150, 'min_length': 30}
+ERROR_SUMMARY = "Error generating summary."
 
-def summarize_text(text: str) -> dict:
+# Bounded-memory mode (summarize_windows): rough peak cost of parsing and
+# summarizing one character of transcript, used to size windows from a budget
+BYTES_PER_WINDOW_CHAR = 500
+MIN_WINDOW_CHARS = 10000
+DEFAULT_MEMORY_BUDGET_MB = float(os.environ.get('MEMORY_BUDGET_MB', 64))
+# Key points are only checked for near duplicates among this many recent ones
+DEDUP_RECENT_POINTS = 5000
+# Windowed results differ slightly from whole-text ones, so they are cached apart
+WINDOWED_SUMMARY_PARAMS = {**SUMMARY_PARAMS, 'mode': 'windowed', 'dedup_recent_points': DEDUP_RECENT_POINTS}
+
+def ensure_nltk_resource(resource: str, package: str):
+    """Downloads an NLTK package only if it is not installed yet."""
+    import nltk
+
+    try:
+        nltk.data.find(resource)
+    except LookupError:
+        nltk.download(package, quiet=True)
+
+def _load_summarizer():
+    from transformers import pipeline
+    return pipeline("summarization")
+
+def _load_spacy():
+    import spacy
+    return spacy.load("en_core_web_sm")
+
+def _load_nltk_data():
+    # punkt_tab is the tokenizer format used by newer NLTK releases
+    ensure_nltk_resource('tokenizers/punkt', 'punkt')
+    ensure_nltk_resource('tokenizers/punkt_tab', 'punkt_tab')
+    ensure_nltk_resource('corpora/stopwords', 'stopwords')
+    return True
+
+def _load_stop_words():
+    get_model('nltk_data')
+    from nltk.corpus import stopwords
+    return set(stopwords.words("english"))
+
+# Models are loaded lazily on first use, see utils.model_registry
+register_model('summarizer', _load_summarizer)
+register_model('spacy', _load_spacy)
+register_model('nltk_data', _load_nltk_data)
+register_model('stop_words', _load_stop_words)
+
+def get_summarizer():
+    """Returns the shared transformers summarization pipeline."""
+    return get_model('summarizer')
+
+def _run_summarizer(texts: list, max_length: int, min_length: int) -> list:
+    results = get_summarizer()(texts, max_length=max_length, min_length=min_length,
+                               do_sample=False, truncation=True, batch_size=len(texts))
+    return [result['summary_text'] for result in results]
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_summary_batcher() -> MicroBatcher:
+    """Returns the process-wide micro-batcher in front of the summarization model."""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher(_run_summarizer, name='summary-batcher')
+        return _batcher
+
+def summarize_batch(texts: list, max_length: int = 150, min_length: int = 30) -> list:
+    """
+    Summarizes each text, sharing model calls with concurrent jobs (see utils.batching).
+
+    Parameters:
+        texts (list): Texts that each fit in the model context (longer ones are truncated).
+        max_length (int): Maximum length of each summary in tokens.
+        min_length (int): Minimum length of each summary in tokens.
+
+    Returns:
+        list: One summary per text, in order.
+    """
+    return get_summary_batcher().submit(texts, max_length=max_length, min_length=min_length)
+
+def get_nlp():
+    """Returns the shared SpaCy model."""
+    return get_model('spacy')
+
+def get_stop_words() -> set:
+    """Returns the English stop word set."""
+    return get_model('stop_words')
+
+def sent_tokenize(text: str) -> list:
+    """NLTK sentence tokenizer, making sure its data is installed first."""
+    from nltk.tokenize import sent_tokenize as nltk_sent_tokenize
+
+    get_model('nltk_data')
+    return nltk_sent_tokenize(text)
+
+def word_tokenize(text: str) -> list:
+    """NLTK word tokenizer, making sure its data is installed first."""
+    from nltk.tokenize import word_tokenize as nltk_word_tokenize
+
+    get_model('nltk_data')
+    return nltk_word_tokenize(text)
+
+def summarize_text(text: str, progress=None, idf_model=None) -> dict:
     """
     Summarizes the text and extracts important points and keywords.
     
     Parameters:
         text (str): The input text to be summarized.
+        progress (callable): Optional progress(percent, step=..., ...) callback.
+        idf_model (IdfModel): Optional corpus statistics for key point and keyword ranking (utils.keywords).
         
     Returns:
-        dict: A dictionary containing 'summary', 'important_points', and 'keywords'.
+        dict: A dictionary containing 'summary', 'important_points', 'keywords' and
+            'keyword_scores' ([keyword, score] pairs, best first).
     """
     try:
         # Check if text is too short
@@ -32,173 +141,472 @@ def summarize_text(text: str) -> dict:
             return {
                 'summary': "Text too short to summarize.",
                 'important_points': ["Text too short to extract key points."],
-                'keywords': ["No keywords available"]
+                'keywords': ["No keywords available"],
+                'keyword_scores': []
             }
 
-        # Generate summary using the summarization pipeline
-        summary_result = summarizer(text, max_length=150, min_length=30, do_sample=False)
-        summary = summary_result[0]['summary_text']
+        # Generate summary, map-reducing over chunks when the text exceeds the model context
+        def report_chunks(done, total, level):
+            # The first map round dominates, so it covers 0-80%
+            if progress and level == 0:
+                progress(80.0 * done / total, step='summary', chunks_done=done, chunks_total=total)
+
+        with timed('summary'):
+            summary = summarize_long_text(text, progress=report_chunks)
+        if progress:
+            progress(80.0, step='key_points')
+
+        # Parse once and share the Doc between key point and keyword extraction
+        with timed('analyze'):
+            doc = analyze_text(text)
 
         # Extract key points
-        important_points = extract_important_points(text)
+        with timed('key_points'):
+            important_points = extract_important_points(text, doc, idf_model)
         if not important_points:
             important_points = ["No key points identified."]
+        if progress:
+            progress(90.0, step='keywords')
 
-        # Extract keywords
-        keywords = extract_keywords(text)
-        if not keywords:
-            keywords = ["No keywords identified."]
+        # Extract keywords, ranked by TF-IDF
+        with timed('keywords'):
+            keyword_scores = extract_keyword_scores(text, doc, idf_model)
+        if keyword_scores is None:
+            keywords = ["Error extracting keywords."]
+        else:
+            keywords = [keyword for keyword, _ in keyword_scores] or ["No keywords identified."]
 
         return {
             'summary': summary,
             'important_points': important_points,
-            'keywords': keywords
+            'keywords': keywords,
+            'keyword_scores': keyword_scores or []
         }
 
     except Exception as e:
         print(f"Error in summarize_text: {e}")
         return {
-            'summary': "Error generating summary.",
+            'summary': ERROR_SUMMARY,
             'important_points': ["Error extracting key points."],
-            'keywords': ["Error extracting keywords."]
+            'keywords': ["Error extracting keywords."],
+            'keyword_scores': []
         }
 
-def extract_important_points(text: str) -> list:
+def chunk_text_by_tokens(text: str, tokenizer, max_tokens: int) -> list:
+    """
+    Splits text into chunks of at most max_tokens tokens, on sentence boundaries.
+
+    All sentences are tokenized in one batch call. Sentences longer than
+    max_tokens on their own are cut into token windows.
+
+    Parameters:
+        text (str): The input text.
+        tokenizer: The summarization model's tokenizer.
+        max_tokens (int): Maximum number of tokens per chunk.
+
+    Returns:
+        list: Text chunks in their original order.
+    """
+    sentences = sent_tokenize(text)
+    if not sentences:
+        return []
+
+    token_ids = tokenizer(sentences, add_special_tokens=False)['input_ids']
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence, ids in zip(sentences, token_ids):
+        if len(ids) > max_tokens:
+            if current:
+                chunks.append(' '.join(current))
+                current, current_tokens = [], 0
+            for start in range(0, len(ids), max_tokens):
+                chunks.append(tokenizer.decode(ids[start:start + max_tokens], skip_special_tokens=True))
+            continue
+
+        if current_tokens + len(ids) > max_tokens:
+            chunks.append(' '.join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += len(ids)
+
+    if current:
+        chunks.append(' '.join(current))
+    return chunks
+
+def summarize_long_text(text: str, max_length: int = 150, min_length: int = 30,
+                        batch_size: int = 4, max_chunk_tokens: int = None, max_depth: int = 3,
+                        progress=None, _level: int = 0) -> str:
+    """
+    Summarizes text of any length with a map-reduce over model-sized chunks.
+
+    Text that fits in the model context is summarized directly. Longer text is
+    split into context-sized chunks, the chunks are summarized in batches, and
+    the concatenated chunk summaries are summarized again (recursively, up to
+    max_depth levels).
+
+    Parameters:
+        text (str): The input text.
+        max_length (int): Maximum length of the final summary in tokens.
+        min_length (int): Minimum length of the final summary in tokens.
+        batch_size (int): Number of chunks per summarizer call.
+        max_chunk_tokens (int): Chunk size in tokens; defaults to the model limit.
+        max_depth (int): Maximum number of reduce rounds.
+        progress (callable): Optional progress(chunks_done, chunks_total, level) callback,
+            called after each batch; level is 0 for the first map round.
+
+    Returns:
+        str: The summary.
+    """
+    summarizer = get_summarizer()
+    tokenizer = summarizer.tokenizer
+    if max_chunk_tokens is None:
+        # Leave room for special tokens; some tokenizers report a huge sentinel limit
+        max_chunk_tokens = min(tokenizer.model_max_length, 1024) - 16
+
+    chunks = chunk_text_by_tokens(text, tokenizer, max_chunk_tokens)
+    if len(chunks) <= 1 or max_depth <= 1:
+        return summarize_batch([text], max_length, min_length)[0]
+
+    # Map: summarize every chunk, batch_size chunks per forward pass
+    report = (lambda done, total: progress(done, total, _level)) if progress else None
+    combined = ' '.join(summarize_chunks(chunks, max_length, min(min_length, 20), batch_size, report))
+
+    # Reduce: summarize the chunk summaries
+    return summarize_long_text(combined, max_length, min_length, batch_size, max_chunk_tokens,
+                               max_depth - 1, progress, _level + 1)
+
+def summarize_chunks(chunks: list, max_length: int = 150, min_length: int = 20, batch_size: int = 4,
+                     progress=None) -> list:
+    """
+    Summarizes each chunk separately (the map step of summarize_long_text()).
+
+    Parameters:
+        chunks (list): Texts that each fit in the model context.
+        max_length (int): Maximum length of each summary in tokens.
+        min_length (int): Minimum length of each summary in tokens.
+        batch_size (int): Number of chunks submitted at a time; the batcher may
+            combine them with other jobs' chunks into larger model calls.
+        progress (callable): Optional progress(chunks_done, chunks_total) callback.
+
+    Returns:
+        list: One summary per chunk, in order.
+    """
+    partials = []
+    for start in range(0, len(chunks), batch_size):
+        # Submitting a few chunks at a time keeps concurrent jobs interleaved
+        partials.extend(summarize_batch(chunks[start:start + batch_size], max_length, min_length))
+        if progress:
+            progress(len(partials), len(chunks))
+    return partials
+
+def _split_for_parsing(text: str, max_chars: int) -> list:
+    """Splits text into pieces of at most max_chars, preferring sentence ends, then whitespace."""
+    pieces = []
+    start = 0
+    while len(text) - start > max_chars:
+        end = start + max_chars
+        cut = text.rfind('. ', start, end)
+        if cut == -1:
+            cut = text.rfind(' ', start, end)
+        cut = end if cut == -1 else cut + 1
+        pieces.append(text[start:cut])
+        start = cut
+    pieces.append(text[start:])
+    return [piece for piece in pieces if piece.strip()]
+
+def analyze_text(text: str) -> 'Doc':
+    """
+    Parses the text once with SpaCy, for reuse by the key point and keyword extractors.
+
+    Long text is parsed in pieces with nlp.pipe (so it never hits nlp.max_length)
+    and the pieces are merged back into a single Doc. Pipeline components the
+    extractors do not use are disabled.
+
+    Parameters:
+        text (str): The input text.
+
+    Returns:
+        Doc: The parsed document.
+    """
+    from spacy.tokens import Doc
+
+    nlp = get_nlp()
+    disabled = [name for name in ANALYSIS_DISABLED_PIPES if name in nlp.pipe_names]
+    pieces = _split_for_parsing(text, PARSE_CHUNK_CHARS)
+    docs = list(nlp.pipe(pieces, disable=disabled))
+    if len(docs) == 1:
+        return docs[0]
+    return Doc.from_docs(docs) if docs else nlp.make_doc(text)
+
+def candidate_points(doc: 'Doc') -> list:
+    """
+    Splits a parsed text into candidate key points.
+
+    Sentences of 5-20 words are kept whole; longer sentences are broken at
+    conjunctions and punctuation. Exact repeats are dropped.
+
+    Parameters:
+        doc (Doc): The parsed text.
+
+    Returns:
+        list: Candidate points in text order.
+    """
+    important_points = []
+    seen = set()
+    
+    # Split long sentences into smaller chunks
+    for sent_span in doc.sents:
+        sent = sent_span.text.strip()
+        # Skip very short sentences
+        if len(sent.split()) < 5:
+            continue
+            
+        # If sentence is too long, break it at conjunctions or punctuation
+        if len(sent.split()) > 20:
+            chunks = []
+            current_chunk = []
+            
+            for token in sent_span:
+                current_chunk.append(token.text)
+                # Break at conjunctions or punctuation
+                if (token.pos_ == 'CCONJ' or 
+                    token.dep_ == 'cc' or 
+                    token.text in ['.', ';', '!']):
+                    if len(current_chunk) > 5:  # Only keep meaningful chunks
+                        chunks.append(' '.join(current_chunk))
+                    current_chunk = []
+            
+            # Add any remaining chunk
+            if len(current_chunk) > 5:
+                chunks.append(' '.join(current_chunk))
+            
+            # Add chunks as separate points
+            for chunk in chunks:
+                if chunk not in seen:
+                    seen.add(chunk)
+                    important_points.append(chunk.strip())
+        else:
+            # Add shorter sentences directly
+            if sent not in seen:
+                seen.add(sent)
+                important_points.append(sent.strip())
+
+    return [point for point in important_points if point]
+
+def rank_points(points: list, top_k: int = 5, idf_model=None) -> list:
+    """
+    Returns the top_k most central points, in their original order.
+
+    Points are ranked by TextRank over their TF-IDF vectors (see
+    utils.textrank), so the points most similar to the rest of the lecture
+    come first.
+
+    Parameters:
+        points (list): Deduplicated candidate points.
+        top_k (int): Number of points to return.
+        idf_model (IdfModel): Optional corpus statistics for the term weights.
+    """
+    if len(points) <= top_k:
+        return list(points)
+    vectors = sentence_vectors(points, get_stop_words(), idf_model)
+    return [points[index] for index in top_sentences(vectors, top_k)]
+
+def rank_points_file(path: str, top_k: int = 5, idf_model=None) -> list:
+    """Like rank_points() for points spilled to a file (one per line), without holding them all in memory."""
+    with open(path, 'r', encoding='utf-8') as f:
+        vectors = sentence_vectors(f, get_stop_words(), idf_model)
+    wanted = set(top_sentences(vectors, top_k))
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for index, line in enumerate(f) if index in wanted]
+
+def extract_important_points(text: str, doc: 'Doc' = None, idf_model=None) -> list:
     """
     Extract important points from the text using NLP techniques.
     
     Parameters:
         text (str): The input text.
+        doc (Doc): The text already parsed by analyze_text(); parsed here if omitted.
+        idf_model (IdfModel): Optional corpus statistics, see rank_points().
         
     Returns:
         list: A list of important points.
     """
     try:
-        # Tokenize the text into sentences
-        sentences = sent_tokenize(text)
-        
-        # Process with SpaCy
-        doc = nlp(text)
-        
-        important_points = []
-        
-        # Split long sentences into smaller chunks
-        for sent in sentences:
-            # Skip very short sentences
-            if len(sent.split()) < 5:
-                continue
-                
-            # If sentence is too long, break it at conjunctions or punctuation
-            if len(sent.split()) > 20:
-                sent_doc = nlp(sent)
-                chunks = []
-                current_chunk = []
-                
-                for token in sent_doc:
-                    current_chunk.append(token.text)
-                    # Break at conjunctions or punctuation
-                    if (token.pos_ == 'CCONJ' or 
-                        token.dep_ == 'cc' or 
-                        token.text in ['.', ';', '!']):
-                        if len(current_chunk) > 5:  # Only keep meaningful chunks
-                            chunks.append(' '.join(current_chunk))
-                        current_chunk = []
-                
-                # Add any remaining chunk
-                if len(current_chunk) > 5:
-                    chunks.append(' '.join(current_chunk))
-                
-                # Add chunks as separate points
-                for chunk in chunks:
-                    if chunk not in important_points:
-                        important_points.append(chunk.strip())
-            else:
-                # Add shorter sentences directly
-                if sent not in important_points:
-                    important_points.append(sent.strip())
+        # Reuse the shared parse for sentence boundaries and POS/dependency tags
+        if doc is None:
+            doc = analyze_text(text)
         
-        # Filter and clean the points
-        cleaned_points = []
-        for point in important_points:
-            # Clean up the point
-            cleaned = point.strip()
-            # Remove points that are too similar to existing ones
-            if cleaned and not any(
-                similar_text(cleaned, existing) for existing in cleaned_points
-            ):
-                cleaned_points.append(cleaned)
+        # Remove points that are too similar to existing ones (same rule as similar_text)
+        cleaned_points = remove_near_duplicates(candidate_points(doc))
         
-        # Sort by length and relevance (shorter, more focused points first)
-        sorted_points = sorted(
-            cleaned_points,
-            key=lambda x: (len(x.split()) > 30, len(x.split()))
-        )
-        
-        # Return top 5 most relevant points
-        return sorted_points[:5]
+        # Return the 5 most central points
+        return rank_points(cleaned_points, idf_model=idf_model)
 
     except Exception as e:
         print(f"Error in extract_important_points: {e}")
         return ["Error extracting key points."]
 
-def extract_keywords(text: str) -> list:
+def extract_keyword_scores(text: str, doc: 'Doc' = None, idf_model=None, top_k: int = 10) -> list:
+    """
+    Ranks entities, noun phrases and terms of the text by TF-IDF (see utils.keywords).
+
+    Parameters:
+        text (str): The input text.
+        doc (Doc): The text already parsed by analyze_text(); parsed here if omitted.
+        idf_model (IdfModel): Corpus statistics; the text is counted into them first.
+        top_k (int): Number of keywords to return.
+
+    Returns:
+        list: [keyword, score] pairs, best first, or None on error.
+    """
+    try:
+        # Reuse the shared parse for tokens, entities and noun chunks
+        if doc is None:
+            doc = analyze_text(text)
+
+        term_counts, phrase_counts = collect_candidates(doc, get_stop_words())
+        if idf_model is not None:
+            idf_model.add_document(term_counts)
+        return score_keywords(term_counts, phrase_counts, idf_model, top_k)
+
+    except Exception as e:
+        print(f"Error in extract_keyword_scores: {e}")
+        return None
+
+def extract_keywords(text: str, doc: 'Doc' = None, idf_model=None) -> list:
     """
     Extract keywords from the text using NLP techniques.
     
     Parameters:
         text (str): The input text.
+        doc (Doc): The text already parsed by analyze_text(); parsed here if omitted.
+        idf_model (IdfModel): Optional corpus statistics, see extract_keyword_scores().
         
     Returns:
-        list: A list of keywords.
+        list: A list of keywords, best first.
+    """
+    keyword_scores = extract_keyword_scores(text, doc, idf_model)
+    if keyword_scores is None:
+        return ["Error extracting keywords."]
+    return [keyword for keyword, _ in keyword_scores] or ["No keywords identified."]
+
+def window_chars_for_budget(memory_budget_mb: float = None) -> int:
+    """Returns the window size in characters that keeps one window within the memory budget."""
+    budget = DEFAULT_MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+    return max(MIN_WINDOW_CHARS, min(PARSE_CHUNK_CHARS, int(budget * 1024 * 1024 / BYTES_PER_WINDOW_CHAR)))
+
+def _summarize_window(text: str, max_chunk_tokens: int = None) -> list:
+    """Map step for one window: splits it into model-sized chunks and summarizes each."""
+    tokenizer = get_summarizer().tokenizer
+    if max_chunk_tokens is None:
+        max_chunk_tokens = min(tokenizer.model_max_length, 1024) - 16
+    return summarize_chunks(chunk_text_by_tokens(text, tokenizer, max_chunk_tokens),
+                            max_length=SUMMARY_PARAMS['max_length'], min_length=20)
+
+def _reduce_spilled_summaries(path: str, window_chars: int, max_depth: int = 5) -> str:
+    """
+    Reduces the partial summaries in a spill file (one per line) to one summary.
+
+    Lines are read a window at a time and summarized into the next level's
+    file, until everything fits in one window for the final summary.
+    """
+    for _ in range(max_depth):
+        if os.path.getsize(path) <= window_chars:
+            break
+        next_path = path + '.next'
+        with open(path, 'r', encoding='utf-8') as source, open(next_path, 'w', encoding='utf-8') as target:
+            for window in iter_line_windows(source, window_chars):
+                for partial in _summarize_window(window):
+                    target.write(' '.join(partial.split()) + '\n')
+        os.replace(next_path, path)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        combined = ' '.join(line.strip() for line in f)
+    return summarize_long_text(combined, SUMMARY_PARAMS['max_length'], SUMMARY_PARAMS['min_length'])
+
+def summarize_windows(windows, spill_dir: str, window_chars: int, progress=None, idf_model=None) -> dict:
+    """
+    Bounded-memory variant of summarize_text() for transcripts of any length.
+
+    Each window is summarized, parsed and mined for key points and keywords
+    on its own, then dropped. Partial summaries are spilled to spill_dir and
+    reduced from disk; key points are checked against the last
+    DEDUP_RECENT_POINTS kept points, spilled as well and ranked from disk at
+    the end; keywords are accumulated by KeywordAccumulator. Peak memory
+    therefore depends on window_chars, except for the sparse vectors of the
+    kept points during ranking and the keyword and word counts, which grow
+    with the number of distinct points and words rather than with the text.
+
+    Parameters:
+        windows (iterable): Transcript text, one window (at most about window_chars) at a time.
+        spill_dir (str): Directory for the partial summary and key point spill files.
+        window_chars (int): Window size, see window_chars_for_budget().
+        progress (callable): Optional progress(percent, step=..., windows_done=...) callback.
+        idf_model (IdfModel): Optional corpus statistics for key point and keyword ranking.
+
+    Returns:
+        dict: 'summary', 'important_points', 'keywords' and 'keyword_scores', like summarize_text().
     """
+    spill_path = os.path.join(spill_dir, 'partial_summaries.txt')
+    points_path = os.path.join(spill_dir, 'candidate_points.txt')
     try:
-        # Process with SpaCy
-        doc = nlp(text)
-        
-        # Extract named entities and important noun phrases
-        entities = [ent.text.lower() for ent in doc.ents]
-        noun_phrases = [chunk.text.lower() for chunk in doc.noun_chunks 
-                       if len(chunk.text.split()) <= 3]  # Limit to phrases of 3 words or less
-        
-        # Extract additional keywords using TF-IDF
-        words = word_tokenize(text.lower())
-        filtered_words = [word for word in words 
-                        if word not in stop_words 
-                        and word.isalnum() 
-                        and len(word) > 2]
-        
-        if not filtered_words:
-            return entities[:10] if entities else ["No keywords identified."]
+        point_index = NearDuplicateIndex(max_texts=DEDUP_RECENT_POINTS)
+        points_count = 0
+        keywords = KeywordAccumulator(get_stop_words(), idf_model)
+        windows_done = 0
 
-        # Create document for TF-IDF
-        document = ' '.join(filtered_words)
-        
-        # Apply TF-IDF
-        vectorizer = TfidfVectorizer(max_features=15)
-        tfidf_matrix = vectorizer.fit_transform([document])
-        
-        # Get feature names and their scores
-        feature_names = vectorizer.get_feature_names_out()
-        scores = tfidf_matrix.toarray()[0]
-        
-        # Combine all potential keywords
-        all_keywords = set(entities + noun_phrases + list(feature_names))
-        
-        # Filter and sort keywords
-        keywords = [kw for kw in all_keywords 
-                   if len(kw.split()) <= 3  # Limit to 3 words
-                   and len(kw) > 2  # Minimum length
-                   and not kw.isnumeric()]  # Remove pure numbers
-        
-        # Sort keywords by length and complexity
-        sorted_keywords = sorted(keywords, 
-                               key=lambda x: (len(x.split()), len(x)))[:10]
-        
-        return sorted_keywords if sorted_keywords else ["No keywords identified."]
+        with open(spill_path, 'w', encoding='utf-8') as spill, open(points_path, 'w', encoding='utf-8') as points:
+            for window in windows:
+                for partial in _summarize_window(window):
+                    spill.write(' '.join(partial.split()) + '\n')
+
+                doc = analyze_text(window)
+                for point in candidate_points(doc):
+                    if point_index.add(point):
+                        points.write(' '.join(point.split()) + '\n')
+                        points_count += 1
+                keywords.add(doc)
+                del doc
+
+                windows_done += 1
+                if progress:
+                    progress(None, step='windows', windows_done=windows_done)
+
+        if windows_done == 0:
+            return {
+                'summary': "Text too short to summarize.",
+                'important_points': ["Text too short to extract key points."],
+                'keywords': ["No keywords available"],
+                'keyword_scores': []
+            }
+
+        if progress:
+            progress(90.0, step='reduce')
+        summary = _reduce_spilled_summaries(spill_path, window_chars)
+        top_points = rank_points_file(points_path, idf_model=idf_model) if points_count else []
+
+        keyword_scores = keywords.keyword_scores()
+        return {
+            'summary': summary,
+            'important_points': top_points or ["No key points identified."],
+            'keywords': [keyword for keyword, _ in keyword_scores] or ["No keywords identified."],
+            'keyword_scores': keyword_scores
+        }
 
     except Exception as e:
-        print(f"Error in extract_keywords: {e}")
-        return ["Error extracting keywords."]
+        print(f"Error in summarize_windows: {e}")
+        return {
+            'summary': ERROR_SUMMARY,
+            'important_points': ["Error extracting key points."],
+            'keywords': ["Error extracting keywords."],
+            'keyword_scores': []
+        }
+    finally:
+        for path in (spill_path, points_path):
+            if os.path.exists(path):
+                os.remove(path)
 
 def similar_text(text1: str, text2: str) -> bool:
     """Helper function to check if two pieces of text are very similar"""
@@ -0,0 +1,125 @@
+import threading
+import time
+from bisect import bisect_left
+
+
+class ProgressTracker:
+    """
+    Collects per-stage progress events for one job.
+
+    Pipeline functions receive the tracker (or any callable with the same
+    signature) as progress(stage, percent, **detail). Readers such as the SSE
+    endpoint block in events_since() until something new happens. Updates are
+    coalesced so a chatty stage cannot flood the event list, and once the job
+    finishes only the last keep_finished progress events are kept. Events of
+    content stages ('partial': transcript segments and key points) are never
+    coalesced, since each carries data, but they are dropped on finish
+    because the job result holds the same content.
+    """
+
+    CONTENT_STAGES = ('partial',)
+
+    def __init__(self, min_interval: float = 0.5, min_step: float = 1.0, keep_finished: int = 50):
+        self.min_interval = min_interval
+        self.min_step = min_step
+        self.keep_finished = keep_finished
+        self.finished = False
+        self._events = []
+        self._next_index = 0
+        # Latest event of each stage, so interleaved stages are coalesced separately
+        self._last_events = {}
+        self._condition = threading.Condition()
+        self._start = time.monotonic()
+        self._stage_starts = {}
+
+    def __call__(self, stage: str, percent: float = None, **detail):
+        self.update(stage, percent, **detail)
+
+    def update(self, stage: str, percent: float = None, **detail):
+        """
+        Records progress of a pipeline stage.
+
+        Parameters:
+            stage (str): Stage name, e.g. 'extract', 'transcribe' or 'summarize'.
+            percent (float): Completion of the stage from 0 to 100, if known.
+            **detail: Extra JSON-serializable fields (segments done, chunks done, ...).
+        """
+        now = time.monotonic()
+        with self._condition:
+            stage_start = self._stage_starts.setdefault(stage, now)
+            last = self._last_events.get(stage)
+            if (last is not None and stage not in self.CONTENT_STAGES
+                    and last.get('step') == detail.get('step')
+                    and now - self._start - last['elapsed'] < self.min_interval
+                    and self._is_small_step(last['percent'], percent)):
+                return
+
+            self._append({
+                'stage': stage,
+                'percent': None if percent is None else round(float(percent), 1),
+                'elapsed': round(now - self._start, 3),
+                'stage_elapsed': round(now - stage_start, 3),
+                **detail
+            })
+
+    def _is_small_step(self, last_percent, percent) -> bool:
+        # Updates without a percentage (segment counts, ...) are only throttled by time
+        if percent is None:
+            return last_percent is None
+        return last_percent is not None and percent < 100 and percent - last_percent < self.min_step
+
+    def _append(self, event: dict):
+        # Called with the condition held
+        event = {'index': self._next_index, **event}
+        self._next_index += 1
+        self._events.append(event)
+        self._last_events[event['stage']] = event
+        self._condition.notify_all()
+
+    def finish(self, status: str, error: str = None):
+        """Records the final event and wakes up all readers."""
+        with self._condition:
+            self.finished = True
+            # Indexes are kept, so clients resuming with ?since= skip what they saw
+            progress_events = [event for event in self._events if event['stage'] not in self.CONTENT_STAGES]
+            self._events = progress_events[-self.keep_finished:] if self.keep_finished else []
+            self._append({
+                'stage': 'done',
+                'status': status,
+                'error': error,
+                'percent': 100.0,
+                'elapsed': round(time.monotonic() - self._start, 3)
+            })
+
+    def latest(self) -> dict:
+        """Returns the most recent event, or None."""
+        with self._condition:
+            return dict(self._events[-1]) if self._events else None
+
+    def events_since(self, index: int, timeout: float = None) -> list:
+        """
+        Returns events with an index of at least index, waiting up to timeout seconds for one.
+
+        Parameters:
+            index (int): Index of the first event wanted.
+            timeout (float): Maximum wait in seconds; None waits indefinitely.
+
+        Returns:
+            list: The new events (empty on timeout).
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._next_index > index or self.finished, timeout)
+            start = bisect_left(self._events, index, key=lambda event: event['index'])
+            return [dict(event) for event in self._events[start:]]
+
+
+def stage_progress(progress, stage: str):
+    """
+    Binds a progress callback to one stage.
+
+    Returns a callable taking (percent, **detail), or a no-op if progress is None,
+    so stage functions never have to check for a missing callback.
+    """
+    if progress is None:
+        return lambda percent=None, **detail: None
+    return lambda percent=None, **detail: progress(stage, percent, **detail)
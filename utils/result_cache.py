@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get('CACHE_MAX_MB', 2048)) * 1024 * 1024)
+# Eviction frees space down to this share of max_bytes, so a full cache is not rescanned on every write
+LOW_WATER_FRACTION = 0.9
+
+
+def hash_text(text: str) -> str:
+    """Returns the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def make_key(stage: str, input_hash: str, params: dict = None) -> str:
+    """
+    Builds a cache key from a stage name, the hash of its input and its parameters.
+
+    Parameters:
+        stage (str): Pipeline stage, e.g. 'audio', 'transcript' or 'summary'.
+        input_hash (str): Content hash of the stage input.
+        params (dict): JSON-serializable parameters that affect the output.
+
+    Returns:
+        str: Hex digest identifying the stage result.
+    """
+    payload = json.dumps({'stage': stage, 'input': input_hash, 'params': params or {}}, sort_keys=True)
+    return hash_text(payload)
+
+
+class ResultCache:
+    """
+    Persistent, content-addressed cache for pipeline results.
+
+    Entries are files under root, named after their key. Reading an entry
+    refreshes its modification time; once the cache grows past max_bytes the
+    least recently used entries are evicted until it is back under
+    LOW_WATER_FRACTION of max_bytes, which leaves room for further writes
+    before the next scan of the cache directory. Writes go through a temporary
+    file and an atomic rename, so concurrent jobs never see partial entries.
+    """
+
+    def __init__(self, root: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {}
+        os.makedirs(root, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def get_json(self, stage: str, key: str):
+        """Returns the cached JSON value for key, or None on a miss."""
+        path = self._lookup(stage, key, '.json')
+        if path is None:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put_json(self, stage: str, key: str, value):
+        """Stores a JSON-serializable value under key."""
+        data = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        temp_path = self._temp_path()
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        self._commit(temp_path, self._path(key, '.json'))
+
+    def get_file(self, stage: str, key: str, suffix: str = '') -> str:
+        """Returns the path of the cached file for key, or None on a miss."""
+        return self._lookup(stage, key, suffix)
+
+    def put_file(self, stage: str, key: str, source_path: str, suffix: str = '') -> str:
+        """Copies a file into the cache under key and returns its cached path."""
+        temp_path = self._temp_path()
+        shutil.copyfile(source_path, temp_path)
+        return self._commit(temp_path, self._path(key, suffix))
+
+    def stats(self) -> dict:
+        """Returns hit/miss counts per stage, overall hit rate and the cache size."""
+        with self._lock:
+            stages = {stage: dict(counts) for stage, counts in self._stats.items()}
+            total_bytes = self._total_bytes
+        hits = sum(counts['hits'] for counts in stages.values())
+        lookups = hits + sum(counts['misses'] for counts in stages.values())
+        return {
+            'stages': stages,
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'bytes': total_bytes,
+            'max_bytes': self.max_bytes
+        }
+
+    def _path(self, key, suffix):
+        return os.path.join(self.root, key[:2], key + suffix)
+
+    def _temp_path(self):
+        return os.path.join(self.root, f".tmp-{uuid.uuid4().hex}")
+
+    def _record(self, stage, hit):
+        with self._lock:
+            counts = self._stats.setdefault(stage, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def _lookup(self, stage, key, suffix):
+        path = self._path(key, suffix)
+        try:
+            # Refresh the LRU position
+            os.utime(path, None)
+        except OSError:
+            self._record(stage, False)
+            return None
+        self._record(stage, True)
+        return path
+
+    def _commit(self, temp_path, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        size = os.path.getsize(temp_path)
+        previous = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(temp_path, path)
+        with self._lock:
+            self._total_bytes += size - previous
+            over_budget = self._total_bytes > self.max_bytes
+        if over_budget:
+            self.evict(keep=path)
+        return path
+
+    def _entries(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if name.startswith('.tmp-'):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def evict(self, keep: str = None) -> int:
+        """
+        Removes least recently used entries until the cache fits in the low-water mark.
+
+        Parameters:
+            keep (str): Path that must not be evicted (the entry just written).
+
+        Returns:
+            int: Number of bytes freed.
+        """
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            target = int(self.max_bytes * LOW_WATER_FRACTION)
+            freed = 0
+            for _, size, path in entries:
+                if total - freed <= target:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    freed += size
+                except OSError:
+                    continue
+            self._total_bytes = total - freed
+            return freed
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(root: str) -> ResultCache:
+    """Returns the process-wide ResultCache for a directory."""
+    root = os.path.abspath(root)
+    with _caches_lock:
+        if root not in _caches:
+            _caches[root] = ResultCache(root)
+        return _caches[root]
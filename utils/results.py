@@ -0,0 +1,95 @@
+from dataclasses import dataclass, field, asdict
+
+
+@dataclass
+class NotesResult:
+    """
+    Structured output of the video-to-notes pipeline.
+
+    The web layer returns to_dict() directly as JSON; render_text() produces
+    the plain-text "Summary:/Key Points:/Keywords:" notes for file export.
+    """
+    video_id: str
+    summary: str
+    key_points: list = field(default_factory=list)
+    keywords: list = field(default_factory=list)
+    # [keyword, score] pairs, best first (see utils.keywords)
+    keyword_scores: list = field(default_factory=list)
+    transcript: str = ""
+    segments: list = field(default_factory=list)
+    # language code -> {'summary', 'key_points', 'keywords'}, see utils.translation
+    translations: dict = field(default_factory=dict)
+    # Detected slides with their timestamps, thumbnails and transcript, see utils.slides
+    slides: list = field(default_factory=list)
+
+    @classmethod
+    def from_summary(cls, video_id: str, summary_result: dict, transcript: str = "", segments: list = None):
+        """Builds a result from the dict returned by nlp_summarization.summarize_text()."""
+        return cls(
+            video_id=video_id,
+            summary=summary_result['summary'],
+            key_points=list(summary_result['important_points']),
+            keywords=list(summary_result['keywords']),
+            keyword_scores=list(summary_result.get('keyword_scores', [])),
+            transcript=transcript,
+            segments=list(segments or [])
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Inverse of to_dict()."""
+        return cls(**data)
+
+    def to_dict(self, include_transcript: bool = True) -> dict:
+        """
+        Returns a JSON-serializable dict.
+
+        Parameters:
+            include_transcript (bool): Whether to include the transcript and segments,
+                which can be large.
+
+        Returns:
+            dict: The result fields.
+        """
+        data = asdict(self)
+        if not include_transcript:
+            data.pop('transcript')
+            data.pop('segments')
+        return data
+
+    def render_text(self) -> str:
+        """Formats the notes as plain text, followed by any translations."""
+        key_points = '\n'.join(f"• {point}" for point in self.key_points)
+        text = f"""Summary:
+{self.summary}
+
+Key Points:
+{key_points}
+
+Keywords:
+{', '.join(self.keywords)}"""
+        if self.slides:
+            text += "\n\nSlides:"
+            for slide in self.slides:
+                minutes, seconds = divmod(int(slide['start']), 60)
+                text += f"\n[{minutes:02d}:{seconds:02d}] {slide.get('text', '')}".rstrip()
+        for language, translated in self.translations.items():
+            translated_points = '\n'.join(f"• {point}" for point in translated['key_points'])
+            text += f"""
+
+[{language}]
+Summary:
+{translated['summary']}
+
+Key Points:
+{translated_points}
+
+Keywords:
+{', '.join(translated['keywords'])}"""
+        return text
+
+    def export(self, path: str) -> str:
+        """Writes render_text() to path and returns the path."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.render_text())
+        return path
@@ -0,0 +1,216 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS videos (
+    video_id TEXT PRIMARY KEY,
+    title TEXT,
+    duration REAL,
+    segment_count INTEGER,
+    indexed_at REAL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    text,
+    video_id UNINDEXED,
+    start UNINDEXED,
+    end UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+-- Rowids of each video's segments, which are inserted in one transaction and so
+-- are contiguous: replacing a video deletes by rowid instead of scanning video_id
+CREATE TABLE IF NOT EXISTS segment_ranges (
+    video_id TEXT PRIMARY KEY,
+    first_rowid INTEGER,
+    last_rowid INTEGER
+);
+"""
+
+
+def _match_query(query: str) -> str:
+    """Turns free text into an FTS5 query matching all words, so user input can never be a syntax error."""
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in query.split())
+
+
+class TranscriptIndex:
+    """
+    Full-text index of transcript segments across all processed videos.
+
+    Segments are stored in an SQLite FTS5 table (Porter-stemmed, ranked by
+    BM25) together with their video and timestamps, so a query returns the
+    lectures and the moments in them where a topic is discussed. Each
+    operation uses its own connection, so the index can be shared by worker
+    threads and processes; WAL mode lets searches run while a video is
+    being indexed.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _delete_segments(connection, video_id: str):
+        """Deletes a video's segments by their rowid range."""
+        row = connection.execute('SELECT first_rowid, last_rowid FROM segment_ranges WHERE video_id = ?',
+                                 (video_id,)).fetchone()
+        if row:
+            connection.execute('DELETE FROM segments WHERE rowid BETWEEN ? AND ?', row)
+            connection.execute('DELETE FROM segment_ranges WHERE video_id = ?', (video_id,))
+        elif connection.execute('SELECT 1 FROM videos WHERE video_id = ?', (video_id,)).fetchone():
+            # Indexed before segment ranges were recorded
+            connection.execute('DELETE FROM segments WHERE video_id = ?', (video_id,))
+
+    def index_video(self, video_id: str, segments, title: str = None) -> int:
+        """
+        Adds or replaces the transcript of one video.
+
+        Parameters:
+            video_id (str): Content hash of the video.
+            segments (iterable): {'start', 'end', 'text'} dicts; may be a generator.
+            title (str): Display name of the video.
+
+        Returns:
+            int: Number of segments indexed.
+        """
+        duration = 0.0
+        count = 0
+
+        def rows():
+            nonlocal duration, count
+            for segment in segments:
+                duration = max(duration, segment['end'])
+                if segment['text']:
+                    count += 1
+                    yield segment['text'], video_id, segment['start'], segment['end']
+
+        with closing(self._connect()) as connection, connection:
+            # Taking the write lock up front keeps other writers out until commit, so the rowids are contiguous
+            connection.execute('BEGIN IMMEDIATE')
+            self._delete_segments(connection, video_id)
+            last_rowid = connection.execute('SELECT COALESCE(MAX(rowid), 0) FROM segments').fetchone()[0]
+            connection.executemany('INSERT INTO segments (text, video_id, start, end) VALUES (?, ?, ?, ?)', rows())
+            if count:
+                connection.execute('INSERT INTO segment_ranges VALUES (?, ?, ?)',
+                                   (video_id, last_rowid + 1, last_rowid + count))
+            connection.execute('INSERT OR REPLACE INTO videos VALUES (?, ?, ?, ?, ?)',
+                               (video_id, title, duration, count, time.time()))
+        return count
+
+    def remove_video(self, video_id: str):
+        """Drops a video from the index."""
+        with closing(self._connect()) as connection, connection:
+            connection.execute('BEGIN IMMEDIATE')
+            self._delete_segments(connection, video_id)
+            connection.execute('DELETE FROM videos WHERE video_id = ?', (video_id,))
+
+    def search(self, query: str, limit: int = 20, video_id: str = None) -> list:
+        """
+        Finds the segments that best match a query.
+
+        Parameters:
+            query (str): Words to look for; all must occur in a segment.
+            limit (int): Maximum number of hits.
+            video_id (str): Restrict the search to one video.
+
+        Returns:
+            list: Hits, best first, with 'video_id', 'title', 'start', 'end',
+                'snippet' (matches wrapped in [ ]) and 'score' (higher is better).
+        """
+        match = _match_query(query)
+        if not match:
+            return []
+
+        sql = """
+            SELECT s.video_id, v.title, s.start, s.end,
+                   snippet(segments, 0, '[', ']', '...', 16), bm25(segments)
+            FROM segments AS s LEFT JOIN videos AS v ON v.video_id = s.video_id
+            WHERE segments MATCH ?
+        """
+        params = [match]
+        if video_id:
+            sql += ' AND s.video_id = ?'
+            params.append(video_id)
+        sql += ' ORDER BY bm25(segments) LIMIT ?'
+        params.append(limit)
+
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [{
+            'video_id': row[0],
+            'title': row[1],
+            'start': row[2],
+            'end': row[3],
+            'snippet': row[4],
+            # bm25() is lower for better matches
+            'score': round(-row[5], 4)
+        } for row in rows]
+
+    def search_videos(self, query: str, limit: int = 10, video_id: str = None) -> list:
+        """
+        Ranks whole videos by how well and how often they match a query.
+
+        Parameters:
+            query (str): Words to look for; all must occur in a segment.
+            limit (int): Maximum number of videos.
+            video_id (str): Restrict the search to one video.
+
+        Returns:
+            list: 'video_id', 'title', 'duration', 'hits' (matching segments)
+                and 'score' (of the best segment), best first.
+        """
+        match = _match_query(query)
+        if not match:
+            return []
+
+        params = [match]
+        video_filter = ''
+        if video_id:
+            video_filter = ' AND video_id = ?'
+            params.append(video_id)
+        sql = f"""
+            SELECT m.video_id, v.title, v.duration, COUNT(*), MIN(m.rank)
+            FROM (SELECT video_id, rank FROM segments WHERE segments MATCH ?{video_filter}) AS m
+            LEFT JOIN videos AS v ON v.video_id = m.video_id
+            GROUP BY m.video_id
+            ORDER BY MIN(m.rank), COUNT(*) DESC
+            LIMIT ?
+        """
+        params.append(limit)
+        with closing(self._connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+        return [{
+            'video_id': row[0],
+            'title': row[1],
+            'duration': row[2],
+            'hits': row[3],
+            'score': round(-row[4], 4)
+        } for row in rows]
+
+    def stats(self) -> dict:
+        """Returns the number of indexed videos and segments and the hours of audio covered."""
+        with closing(self._connect()) as connection:
+            videos, segments, duration = connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(segment_count), 0), COALESCE(SUM(duration), 0) FROM videos'
+            ).fetchone()
+        return {'videos': videos, 'segments': segments, 'hours': round(duration / 3600, 2)}
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(path: str) -> TranscriptIndex:
+    """Returns the process-wide TranscriptIndex for a database file."""
+    path = os.path.abspath(path)
+    with _indexes_lock:
+        if path not in _indexes:
+            _indexes[path] = TranscriptIndex(path)
+        return _indexes[path]
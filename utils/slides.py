@@ -0,0 +1,254 @@
+import os
+import re
+import subprocess
+import threading
+import numpy as np
+from utils.audio_extraction import get_ffmpeg_binary
+
+# Everything that changes detect_slides() output; part of its checkpoint key
+SLIDE_PARAMS = {
+    'version': 1,
+    # dHash of a (hash_size + 1) x hash_size grayscale frame: hash_size ** 2 bits
+    'hash_size': 8,
+    # Minimum spacing of sampled keyframes, in seconds
+    'min_interval': 2.0,
+    # Differing hash bits (out of hash_size ** 2) that count as a slide change
+    'threshold': 10,
+    # Changes closer together than this are one transition (fades, builds, video clips)
+    'min_slide_seconds': 4.0
+}
+THUMBNAIL_WIDTH = 320
+
+_PTS_TIME = re.compile(r'pts_time:\s*(-?[0-9.]+(?:e[-+]?[0-9]+)?)')
+
+
+def sample_keyframes(video_path: str, hash_size: int = 8, min_interval: float = 2.0):
+    """
+    Decodes only the keyframes of a video, downscaled to hash input size.
+
+    The decoder skips every frame that is not a keyframe, a select filter
+    thins them to at most one per min_interval seconds, and ffmpeg scales
+    them to (hash_size + 1) x hash_size grayscale, so only a few bytes per
+    sample are piped to us. Timestamps come from the showinfo filter log.
+
+    Parameters:
+        video_path (str): Path to the input video file.
+        hash_size (int): Height of the sampled frames (width is one more).
+        min_interval (float): Minimum time between samples, in seconds.
+
+    Returns:
+        tuple: (times, frames), a float array of n timestamps in seconds and
+            a uint8 array of shape (n, hash_size, hash_size + 1). Both are
+            empty for files without a video stream.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error.
+    """
+    width, height = hash_size + 1, hash_size
+    frame_bytes = width * height
+    command = [
+        get_ffmpeg_binary(), '-nostdin', '-hide_banner', '-nostats', '-loglevel', 'info',
+        '-skip_frame', 'nokey',
+        '-i', video_path,
+        '-map', '0:v:0?', '-an', '-sn', '-dn',
+        '-vf', (f"select='isnan(prev_selected_t)+gte(t-prev_selected_t\\,{min_interval})',"
+                f"scale={width}:{height}:flags=area,format=gray,showinfo"),
+        '-vsync', 'passthrough',
+        '-f', 'rawvideo', 'pipe:1'
+    ]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    times = []
+    log = []
+
+    def read_log():
+        # stderr is drained on its own thread so neither pipe can fill up and stall ffmpeg
+        for line in process.stderr:
+            line = line.decode('utf-8', errors='replace')
+            match = _PTS_TIME.search(line) if 'showinfo' in line else None
+            if match:
+                times.append(float(match.group(1)))
+            else:
+                log.append(line.strip())
+
+    reader = threading.Thread(target=read_log, daemon=True)
+    reader.start()
+    try:
+        data = process.stdout.read()
+        returncode = process.wait()
+        reader.join()
+        if returncode != 0:
+            if any('does not contain any stream' in line for line in log):
+                # No video track (e.g. an audio-only upload)
+                return np.zeros(0), np.zeros((0, height, width), dtype=np.uint8)
+            raise RuntimeError(f"ffmpeg failed to sample keyframes: {' '.join(log[-5:])}")
+    finally:
+        if process.poll() is None:
+            process.kill()
+            process.wait()
+        process.stdout.close()
+        process.stderr.close()
+
+    count = min(len(data) // frame_bytes, len(times))
+    frames = np.frombuffer(data, dtype=np.uint8, count=count * frame_bytes).reshape(count, height, width)
+    return np.asarray(times[:count], dtype=np.float64), frames
+
+
+def dhash(frames: np.ndarray) -> np.ndarray:
+    """
+    Computes the difference hash of each frame.
+
+    A bit is set where a pixel is brighter than its right neighbour, so the
+    hash captures the layout of a slide and ignores overall brightness and
+    compression noise.
+
+    Parameters:
+        frames (ndarray): uint8 array of shape (n, h, w + 1).
+
+    Returns:
+        ndarray: uint8 array of shape (n, ceil(h * w / 8)), the packed bits.
+    """
+    bits = frames[:, :, 1:] > frames[:, :, :-1]
+    return np.packbits(bits.reshape(len(frames), bits.shape[1] * bits.shape[2]), axis=1)
+
+
+def hamming_distances(hashes: np.ndarray) -> np.ndarray:
+    """Returns the number of differing bits between each hash and the one before it (n - 1 values)."""
+    if len(hashes) < 2:
+        return np.zeros(0, dtype=np.int64)
+    return np.unpackbits(hashes[1:] ^ hashes[:-1], axis=1).sum(axis=1, dtype=np.int64)
+
+
+def find_transitions(times: np.ndarray, hashes: np.ndarray, threshold: int, min_slide_seconds: float) -> list:
+    """
+    Finds where slides change.
+
+    Returns:
+        list: (start, frame) index pairs, one per slide, starting with the
+            first sample: 'start' is the first sample showing a change and
+            'frame' the last sample of a burst of changes closer together than
+            min_slide_seconds, i.e. where the new slide has settled.
+    """
+    if len(times) == 0:
+        return []
+    changes = np.flatnonzero(hamming_distances(hashes) >= threshold) + 1
+
+    slides = [[0, 0]]
+    for index in changes:
+        if times[index] - times[slides[-1][1]] < min_slide_seconds:
+            slides[-1][1] = int(index)
+        else:
+            slides.append([int(index), int(index)])
+    return [tuple(slide) for slide in slides]
+
+
+def save_thumbnail(video_path: str, time: float, path: str, width: int = THUMBNAIL_WIDTH) -> bool:
+    """
+    Writes one frame of the video as a JPEG.
+
+    Seeking happens on the input, so ffmpeg jumps to the keyframe at time
+    instead of decoding everything before it.
+
+    Returns:
+        bool: True if the thumbnail was written, False if there was an error.
+    """
+    command = [
+        get_ffmpeg_binary(), '-nostdin', '-v', 'error', '-y',
+        '-ss', f"{time:.3f}", '-i', video_path,
+        '-frames:v', '1', '-vf', f"scale={width}:-2", '-q:v', '4', path
+    ]
+    try:
+        completed = subprocess.run(command, capture_output=True)
+        if completed.returncode != 0:
+            print(f"Error saving thumbnail at {time:.1f}s: "
+                  f"{completed.stderr.decode('utf-8', errors='replace').strip()}")
+            return False
+        return os.path.exists(path)
+    except OSError as e:
+        print(f"Error saving thumbnail at {time:.1f}s: {e}")
+        return False
+
+
+def detect_slides(video_path: str, thumbnail_dir: str, params: dict = None, progress=None) -> list:
+    """
+    Detects slide changes in a lecture video without decoding every frame.
+
+    Parameters:
+        video_path (str): Path to the input video file.
+        thumbnail_dir (str): Directory the slide thumbnails are written to.
+        params (dict): Detection parameters, see SLIDE_PARAMS.
+        progress (callable): Optional progress(percent, **detail) callback.
+
+    Returns:
+        list: One dict per slide with 'index', 'start' and 'end' (seconds;
+            the last slide's end is the last sampled keyframe), 'frame_time'
+            (when the thumbnail was taken) and 'thumbnail' (path, or None if
+            it could not be written). Empty for videos without a video stream.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to decode the video.
+    """
+    params = {**SLIDE_PARAMS, **(params or {})}
+    if progress:
+        progress(0.0, step='sample')
+    times, frames = sample_keyframes(video_path, params['hash_size'], params['min_interval'])
+    transitions = find_transitions(times, dhash(frames), params['threshold'], params['min_slide_seconds'])
+    if progress:
+        progress(50.0, step='thumbnails', samples=len(times), slides=len(transitions))
+
+    os.makedirs(thumbnail_dir, exist_ok=True)
+    slides = []
+    for index, (start, frame) in enumerate(transitions):
+        thumbnail = os.path.join(thumbnail_dir, f"slide_{index:04d}.jpg")
+        slides.append({
+            'index': index,
+            'start': 0.0 if index == 0 else float(times[start]),
+            'end': float(times[transitions[index + 1][0]]) if index + 1 < len(transitions) else float(times[-1]),
+            'frame_time': float(times[frame]),
+            'thumbnail': thumbnail if save_thumbnail(video_path, float(times[frame]), thumbnail) else None
+        })
+        if progress:
+            progress(50.0 + 50.0 * (index + 1) / len(transitions), slides_done=index + 1)
+    return slides
+
+
+def assign_segments(slides: list, segments, include_text: bool = True) -> list:
+    """
+    Splits the transcript at slide changes.
+
+    Each segment goes to the slide shown at its midpoint; segments past the
+    last sampled keyframe belong to the last slide.
+
+    Parameters:
+        slides (list): Slides from detect_slides(), in time order.
+        segments (iterable): Transcript segments in time order; read once, so
+            utils.spill.read_segments() works.
+        include_text (bool): Whether to add each slide's transcript text.
+
+    Returns:
+        list: Copies of the slides with 'first_segment' and 'segment_count'
+            (and 'text' if include_text), the last slide's 'end' extended to
+            cover the transcript.
+    """
+    slides = [dict(slide, first_segment=None, segment_count=0) for slide in slides]
+    if not slides:
+        return slides
+    texts = [[] for _ in slides]
+
+    current = 0
+    for position, segment in enumerate(segments):
+        middle = (segment['start'] + segment['end']) / 2
+        while current + 1 < len(slides) and middle >= slides[current + 1]['start']:
+            current += 1
+        slide = slides[current]
+        if slide['first_segment'] is None:
+            slide['first_segment'] = position
+        slide['segment_count'] += 1
+        slides[-1]['end'] = max(slides[-1]['end'], segment['end'])
+        if include_text and segment['text']:
+            texts[current].append(segment['text'])
+
+    if include_text:
+        for slide, text in zip(slides, texts):
+            slide['text'] = ' '.join(text)
+    return slides
@@ -0,0 +1,87 @@
+import hashlib
+import json
+
+
+class SegmentSpill:
+    """
+    Writes transcript segments to disk as they are produced.
+
+    Each segment becomes one line of a JSONL file, and its text is appended
+    to the plain transcript file, so the transcript is never held in memory.
+    The SHA-256 of the transcript text is computed on the way; it equals
+    result_cache.hash_text() of the ' '-joined segment texts, so the summary
+    cache keys match those of the in-memory pipeline.
+    """
+
+    def __init__(self, segments_path: str, transcription_path: str):
+        self.segments_path = segments_path
+        self.transcription_path = transcription_path
+        self.count = 0
+        self.audio_seconds = 0.0
+        self.text_chars = 0
+        self._hasher = hashlib.sha256()
+        self._segments_file = open(segments_path, 'w', encoding='utf-8')
+        self._text_file = open(transcription_path, 'w', encoding='utf-8')
+
+    def write(self, segment: dict):
+        """Appends one {'start', 'end', 'text'} segment."""
+        self._segments_file.write(json.dumps(segment, ensure_ascii=False) + '\n')
+        self.count += 1
+        self.audio_seconds = max(self.audio_seconds, segment['end'])
+
+        text = segment['text']
+        if text:
+            if self.text_chars:
+                text = ' ' + text
+            self._text_file.write(text)
+            self._hasher.update(text.encode('utf-8'))
+            self.text_chars += len(text)
+
+    def text_hash(self) -> str:
+        """Returns the SHA-256 hex digest of the transcript written so far."""
+        return self._hasher.hexdigest()
+
+    def close(self):
+        self._segments_file.close()
+        self._text_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_segments(segments_path: str):
+    """Yields the segments of a JSONL spill file one at a time."""
+    with open(segments_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_line_windows(lines, window_chars: int):
+    """Joins an iterable of text lines into windows of about window_chars characters."""
+    window = []
+    size = 0
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if window and size + len(line) > window_chars:
+            yield ' '.join(window)
+            window, size = [], 0
+        window.append(line)
+        size += len(line) + 1
+    if window:
+        yield ' '.join(window)
+
+
+def iter_text_windows(segments_path: str, window_chars: int):
+    """
+    Yields the transcript in windows of about window_chars characters.
+
+    Windows end on segment boundaries, which are silence-delimited, so
+    sentences are rarely cut in half.
+    """
+    return iter_line_windows((segment['text'] for segment in read_segments(segments_path)), window_chars)
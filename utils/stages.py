@@ -0,0 +1,121 @@
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass
+
+
+@dataclass
+class RetryPolicy:
+    """How often a pipeline stage is attempted and how long to wait between attempts."""
+    attempts: int = 1
+    # Seconds before the second attempt, doubled for every further one
+    backoff: float = 0.0
+
+    def delay(self, attempt: int) -> float:
+        """Returns the wait after the given failed attempt (1-based)."""
+        return self.backoff * (2 ** (attempt - 1))
+
+
+# Transcription talks to a network service by default, so it gets the most patience
+STAGE_RETRY_POLICIES = {
+    'extract': RetryPolicy(attempts=2, backoff=1.0),
+    'transcribe': RetryPolicy(attempts=3, backoff=2.0),
+    'summarize': RetryPolicy(attempts=2, backoff=1.0)
+}
+
+
+class StageCheckpoints:
+    """
+    Persisted results of completed pipeline stages for one workspace.
+
+    Each stage's output is stored as <root>/checkpoints/<stage>.json together
+    with the key of its inputs and parameters (the result cache key of that
+    stage). A checkpoint is only reused while its key matches and every file
+    it refers to still exists, so a rerun resumes after the last stage that
+    completed with the same inputs.
+    """
+
+    def __init__(self, workspace_root: str):
+        self.directory = os.path.join(workspace_root, 'checkpoints')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(self, stage: str, key: str):
+        """Returns the saved output of stage for key, or None."""
+        try:
+            with open(self._path(stage), 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if checkpoint.get('key') != key or not all(os.path.exists(path) for path in checkpoint.get('files', [])):
+            return None
+        return checkpoint['data']
+
+    def save(self, stage: str, key: str, data, files: list = None):
+        """
+        Records the output of a completed stage.
+
+        Parameters:
+            stage (str): Stage name.
+            key (str): Key of the stage inputs and parameters.
+            data: JSON-serializable stage output.
+            files (list): Files the output refers to; the checkpoint is void if one disappears.
+        """
+        checkpoint = {'key': key, 'data': data, 'files': list(files or []), 'completed_at': time.time()}
+        temp_path = os.path.join(self.directory, f".tmp-{uuid.uuid4().hex}")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(stage))
+
+    def clear(self):
+        """Removes all checkpoints, so the next run starts from scratch."""
+        for name in os.listdir(self.directory):
+            os.remove(os.path.join(self.directory, name))
+
+    def _path(self, stage):
+        return os.path.join(self.directory, f"{stage}.json")
+
+
+def run_stage(stage: str, key: str, func, checkpoints: StageCheckpoints = None, policy: RetryPolicy = None,
+              files=None, resumed: list = None):
+    """
+    Runs one pipeline stage, or restores its output from a checkpoint.
+
+    Parameters:
+        stage (str): Stage name, e.g. 'extract', 'transcribe' or 'summarize'.
+        key (str): Key of the stage inputs and parameters.
+        func (callable): Zero-argument function computing the stage output; raises on failure.
+        checkpoints (StageCheckpoints): Where outputs are persisted; None disables checkpointing.
+        policy (RetryPolicy): Retry policy; defaults to STAGE_RETRY_POLICIES for the stage.
+        files (callable): Optional function mapping the output to the files it refers to.
+        resumed (list): If given, the stage name is appended when restored from a checkpoint.
+
+    Returns:
+        The stage output.
+
+    Raises:
+        Exception: The error of the last attempt once all attempts failed.
+    """
+    if checkpoints is not None:
+        data = checkpoints.get(stage, key)
+        if data is not None:
+            print(f"Resuming from '{stage}' checkpoint...")
+            if resumed is not None:
+                resumed.append(stage)
+            return data
+
+    policy = policy or STAGE_RETRY_POLICIES.get(stage, RetryPolicy())
+    for attempt in range(1, policy.attempts + 1):
+        try:
+            data = func()
+            break
+        except Exception as e:
+            if attempt == policy.attempts:
+                raise
+            delay = policy.delay(attempt)
+            print(f"Stage '{stage}' failed (attempt {attempt} of {policy.attempts}): {e}; retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    if checkpoints is not None:
+        checkpoints.save(stage, key, data, files(data) if files else None)
+    return data
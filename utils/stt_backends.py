@@ -0,0 +1,170 @@
+import os
+import threading
+import numpy as np
+from utils.model_registry import register_model
+
+DEFAULT_BACKEND = os.environ.get('STT_BACKEND', 'google')
+
+class STTServiceError(RuntimeError):
+    """Raised by backends when their speech-to-text service cannot be reached."""
+
+class STTBackend:
+    """
+    Base class for speech-to-text engines.
+
+    A backend turns one segment of mono 16-bit PCM audio into text.
+    Implementations must be safe to call from several threads at once.
+    """
+    name = None
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        """
+        Transcribes one audio segment.
+
+        Parameters:
+            pcm (bytes): Mono signed 16-bit little-endian samples.
+            sample_rate (int): Sample rate of the audio in Hz.
+
+        Returns:
+            str: The recognized text, or an empty string if nothing was understood.
+        """
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Loads anything expensive up front so the first request is not slow."""
+
+    def cache_params(self) -> dict:
+        """Settings that change the transcript; used in result cache keys."""
+        return {'backend': self.name}
+
+class GoogleBackend(STTBackend):
+    """Google Web Speech API through SpeechRecognition (needs network access)."""
+    name = 'google'
+
+    def __init__(self, language: str = 'en-US'):
+        self.language = language
+
+    def cache_params(self) -> dict:
+        return {'backend': self.name, 'language': self.language}
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        import speech_recognition as sr
+
+        recognizer = sr.Recognizer()
+        audio_data = sr.AudioData(pcm, sample_rate, 2)
+        try:
+            return recognizer.recognize_google(audio_data, language=self.language)
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise STTServiceError(f"Could not request results from Google Speech Recognition service; {e}") from e
+
+class WhisperBackend(STTBackend):
+    """
+    Local, CPU-only Whisper model via faster-whisper.
+
+    The model is loaded once on first use and shared by all threads.
+    """
+    name = 'whisper'
+
+    def __init__(self, model_size: str = None, compute_type: str = 'int8', language: str = 'en',
+                 cpu_threads: int = 0, num_workers: int = 4):
+        self.model_size = model_size or os.environ.get('WHISPER_MODEL', 'base.en')
+        self.compute_type = compute_type
+        self.language = language
+        self.cpu_threads = cpu_threads
+        self.num_workers = num_workers
+        self._model = None
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        self._get_model()
+
+    def cache_params(self) -> dict:
+        return {'backend': self.name, 'model': self.model_size,
+                'compute_type': self.compute_type, 'language': self.language}
+
+    def _get_model(self):
+        with self._lock:
+            if self._model is None:
+                from faster_whisper import WhisperModel
+                self._model = WhisperModel(
+                    self.model_size,
+                    device='cpu',
+                    compute_type=self.compute_type,
+                    cpu_threads=self.cpu_threads,
+                    num_workers=self.num_workers
+                )
+            return self._model
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        if sample_rate != 16000:
+            raise ValueError(f"Whisper expects 16 kHz audio, got {sample_rate} Hz")
+
+        audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        segments, _ = self._get_model().transcribe(audio, language=self.language, beam_size=1)
+        return ' '.join(segment.text.strip() for segment in segments)
+
+class FakeBackend(STTBackend):
+    """
+    Deterministic offline backend for tests and benchmarks.
+
+    Returns the template filled in with the segment duration, so the same
+    audio always gives the same transcript and no model or network is needed.
+    """
+    name = 'fake'
+
+    def __init__(self, template: str = "this is a fake transcript of {seconds:.2f} seconds of audio."):
+        self.template = template
+
+    def cache_params(self) -> dict:
+        return {'backend': self.name, 'template': self.template}
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        seconds = len(pcm) / 2 / sample_rate
+        return self.template.format(seconds=seconds)
+
+BACKENDS = {
+    GoogleBackend.name: GoogleBackend,
+    WhisperBackend.name: WhisperBackend,
+    FakeBackend.name: FakeBackend
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_backend(backend=None, **options) -> STTBackend:
+    """
+    Returns a speech-to-text backend.
+
+    Backends created by name are cached per process, so a local model is
+    loaded only once no matter how many jobs use it.
+
+    Parameters:
+        backend (str or STTBackend): Backend name ('google', 'whisper', 'fake'),
+            an existing backend instance, or None for the STT_BACKEND default.
+        **options: Constructor options for a backend created by name.
+
+    Returns:
+        STTBackend: The backend instance.
+    """
+    if isinstance(backend, STTBackend):
+        return backend
+
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown STT backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
+
+    key = (name, tuple(sorted(options.items())))
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = BACKENDS[name](**options)
+        return _instances[key]
+
+def _load_default_backend():
+    backend = get_backend()
+    backend.warm_up()
+    return backend
+
+# Lets workers warm the configured STT engine through utils.model_registry.preload()
+register_model('stt_backend', _load_default_backend)
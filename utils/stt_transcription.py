@@ -1,30 +1,203 @@
-import speech_recognition as sr
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from utils.stt_backends import get_backend, STTServiceError
 
-def transcribe_audio(audio_path: str) -> str:
+SAMPLE_WIDTH = 2  # bytes per sample; segments are always 16-bit PCM
+FRAME_SECONDS = 0.03  # energy is measured over 30 ms frames
+
+def read_wav_chunks(audio_path: str, chunk_seconds: float = 30.0):
     """
-    Transcribe the given audio file to text using the SpeechRecognition library.
-    
+    Reads a 16-bit WAV file as mono PCM chunks without loading it all into memory.
+
     Parameters:
-        audio_path (str): Path to the audio file (e.g., .wav, .mp3) to transcribe.
-        
+        audio_path (str): Path to the .wav file.
+        chunk_seconds (float): Duration of audio in each chunk.
+
     Returns:
-        str: The transcribed text.
+        tuple: (sample_rate, generator of mono 16-bit PCM bytes).
+    """
+    wav = wave.open(audio_path, 'rb')
+    if wav.getsampwidth() != SAMPLE_WIDTH:
+        wav.close()
+        raise ValueError(f"Unsupported sample width {wav.getsampwidth()} in {audio_path}")
+
+    sample_rate = wav.getframerate()
+    channels = wav.getnchannels()
+    frames_per_chunk = max(1, int(chunk_seconds * sample_rate))
+
+    def chunks():
+        try:
+            while True:
+                data = wav.readframes(frames_per_chunk)
+                if not data:
+                    break
+                if channels > 1:
+                    samples = np.frombuffer(data, dtype='<i2').reshape(-1, channels)
+                    data = samples.mean(axis=1).astype('<i2').tobytes()
+                yield data
+        finally:
+            wav.close()
+
+    return sample_rate, chunks()
+
+def _quietest_cut(samples: np.ndarray, sample_rate: int, start: int, end: int, min_silence: float) -> int:
+    """Returns the sample index in [start, end) at the centre of the quietest min_silence window."""
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    region = samples[start:end].astype(np.float32)
+    frame_count = len(region) // frame
+    if frame_count == 0:
+        return end
+
+    energy = np.sqrt(np.mean(region[:frame_count * frame].reshape(frame_count, frame) ** 2, axis=1))
+    window = max(1, min(frame_count, int(min_silence / FRAME_SECONDS)))
+    smoothed = np.convolve(energy, np.ones(window) / window, mode='same')
+    return start + int(np.argmin(smoothed)) * frame + frame // 2
+
+def split_on_silence(pcm_chunks, sample_rate: int, min_segment_seconds: float = 10.0,
+                     max_segment_seconds: float = 30.0, min_silence: float = 0.3,
+                     silence_threshold: float = 200.0):
+    """
+    Splits a stream of PCM chunks into bounded segments, cutting at pauses in speech.
+
+    Each segment is between min_segment_seconds and max_segment_seconds long
+    (except the last). The cut is placed in the quietest stretch of audio
+    inside that range, so words are not split in half. Only about one segment
+    of audio is buffered at a time.
+
+    Parameters:
+        pcm_chunks (iterable): Mono 16-bit PCM byte chunks.
+        sample_rate (int): Sample rate of the audio in Hz.
+        min_segment_seconds (float): Shortest segment that may be cut off.
+        max_segment_seconds (float): Longest segment allowed.
+        min_silence (float): Length in seconds of the pause to look for.
+        silence_threshold (float): RMS level below which a whole segment counts as silence.
+
+    Yields:
+        dict: 'start' and 'end' in seconds, 'pcm' bytes and 'silent' flag.
+    """
+    min_samples = int(min_segment_seconds * sample_rate)
+    max_samples = int(max_segment_seconds * sample_rate)
+    buffer = np.zeros(0, dtype='<i2')
+    offset = 0
+
+    def make_segment(samples, start_sample):
+        rms = float(np.sqrt(np.mean(samples.astype(np.float32) ** 2))) if len(samples) else 0.0
+        return {
+            'start': start_sample / sample_rate,
+            'end': (start_sample + len(samples)) / sample_rate,
+            'pcm': samples.tobytes(),
+            'silent': rms < silence_threshold
+        }
+
+    for chunk in pcm_chunks:
+        buffer = np.concatenate([buffer, np.frombuffer(chunk, dtype='<i2')])
+        while len(buffer) >= max_samples:
+            cut = _quietest_cut(buffer, sample_rate, min_samples, max_samples, min_silence)
+            yield make_segment(buffer[:cut], offset)
+            offset += cut
+            buffer = buffer[cut:]
+
+    if len(buffer):
+        yield make_segment(buffer, offset)
+
+def recognize_segment(pcm: bytes, sample_rate: int, backend=None) -> str:
+    """
+    Recognizes one segment of mono 16-bit PCM audio.
+
+    Parameters:
+        pcm (bytes): Audio samples.
+        sample_rate (int): Sample rate of the audio in Hz.
+        backend (str or STTBackend): Speech-to-text backend, see get_backend().
+
+    Returns:
+        str: The recognized text, or an empty string if nothing was understood.
+    """
+    return get_backend(backend).transcribe(pcm, sample_rate)
+
+def iter_transcribed_segments(pcm_chunks, sample_rate: int, max_workers: int = 4, backend=None, **split_options):
+    """
+    Transcribes a PCM stream segment by segment on a thread pool.
+
+    At most 2 * max_workers segments are in flight at once, so memory stays
+    flat however long the audio is. Results are yielded in audio order.
+
+    Parameters:
+        pcm_chunks (iterable): Mono 16-bit PCM byte chunks.
+        sample_rate (int): Sample rate of the audio in Hz.
+        max_workers (int): Number of segments recognized concurrently.
+        backend (str or STTBackend): Speech-to-text backend, see get_backend().
+        **split_options: Passed on to split_on_silence().
+
+    Yields:
+        dict: 'start', 'end' (seconds) and 'text' of each segment.
+    """
+    backend = get_backend(backend)
+
+    def run(segment):
+        text = "" if segment['silent'] else backend.transcribe(segment['pcm'], sample_rate)
+        return {'start': segment['start'], 'end': segment['end'], 'text': text.strip()}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='stt') as executor:
+        in_flight = deque()
+        for segment in split_on_silence(pcm_chunks, sample_rate, **split_options):
+            in_flight.append(executor.submit(run, segment))
+            if len(in_flight) >= 2 * max_workers:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+def transcribe_audio_segments(audio_path: str, max_workers: int = 4, backend=None, progress=None) -> list:
+    """
+    Transcribe an audio file in silence-delimited segments, concurrently.
+
+    Parameters:
+        audio_path (str): Path to a 16-bit .wav file.
+        max_workers (int): Number of segments recognized concurrently.
+        backend (str or STTBackend): Speech-to-text backend, see get_backend().
+        progress (callable): Optional progress(percent, segments=..., audio_seconds=...) callback.
+
+    Returns:
+        list: Segment dicts with 'start', 'end' and 'text', in order, or None on error.
     """
-    recognizer = sr.Recognizer()
-    
     try:
-        with sr.AudioFile(audio_path) as source:
-            audio_data = recognizer.record(source)
-        
-        text = recognizer.recognize_google(audio_data)
-        
-        return text
-    except sr.UnknownValueError:
-        print("Speech Recognition could not understand the audio.")
-        return None
-    except sr.RequestError as e:
-        print(f"Could not request results from Google Speech Recognition service; {e}")
+        with wave.open(audio_path, 'rb') as wav:
+            duration = wav.getnframes() / wav.getframerate()
+
+        sample_rate, chunks = read_wav_chunks(audio_path)
+        segments = []
+        for segment in iter_transcribed_segments(chunks, sample_rate, max_workers=max_workers, backend=backend):
+            segments.append(segment)
+            if progress:
+                percent = 100.0 * segment['end'] / duration if duration else 100.0
+                progress(percent, segments=len(segments), audio_seconds=round(segment['end'], 1))
+        return segments
+    except STTServiceError as e:
+        print(e)
         return None
     except Exception as e:
         print(f"Error during transcription: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def transcribe_audio(audio_path: str, backend=None) -> str:
+    """
+    Transcribe the given audio file to text.
+
+    Parameters:
+        audio_path (str): Path to the .wav audio file to transcribe.
+        backend (str or STTBackend): Speech-to-text backend ('google', 'whisper',
+            'fake'); defaults to the STT_BACKEND environment variable or 'google'.
+
+    Returns:
+        str: The transcribed text.
+    """
+    segments = transcribe_audio_segments(audio_path, backend=backend)
+    if segments is None:
+        return None
+
+    text = ' '.join(segment['text'] for segment in segments if segment['text'])
+    if not text:
+        print("Speech Recognition could not understand the audio.")
+        return None
+    return text
@@ -0,0 +1,49 @@
+import random
+from utils.dedup import NearDuplicateIndex, remove_near_duplicates
+from utils.nlp_summarization import similar_text
+
+WORDS = [f"w{i}" for i in range(30)]
+
+
+def _random_texts(count: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    # Small vocabulary and short texts, so many pairs are near the threshold; some texts are empty
+    return [' '.join(rng.choices(WORDS, k=rng.randint(0, 8))) for _ in range(count)]
+
+
+def _keep_unless_similar(texts: list, window: int = None) -> list:
+    """Quadratic reference: keeps a text unless similar_text() matches a kept one (or one of the last window)."""
+    kept = []
+    for text in texts:
+        # Empty texts are never indexed, so they do not take a place in the window
+        recent = [k for k in kept if k.split()]
+        if window is not None:
+            recent = recent[-window:]
+        if not any(similar_text(text, k) for k in recent):
+            kept.append(text)
+    return kept
+
+
+def test_remove_near_duplicates_matches_similar_text():
+    for seed in range(5):
+        texts = _random_texts(500, seed)
+        assert remove_near_duplicates(texts) == _keep_unless_similar(texts)
+
+
+def test_index_with_changing_frequencies_matches_similar_text():
+    texts = _random_texts(500, seed=7)
+    index = NearDuplicateIndex()
+    assert [text for text in texts if index.add(text)] == _keep_unless_similar(texts)
+
+
+def test_bounded_index_compares_recent_texts_only():
+    texts = _random_texts(1000, seed=3)
+    for window in (1, 10, 100):
+        index = NearDuplicateIndex(max_texts=window)
+        assert [text for text in texts if index.add(text)] == _keep_unless_similar(texts, window)
+        assert len(index) <= window
+
+
+def test_case_and_repeated_words():
+    assert remove_near_duplicates(["The Gradient descent", "the gradient the descent", "neural networks"]) == [
+        "The Gradient descent", "neural networks"]
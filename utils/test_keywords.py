@@ -0,0 +1,27 @@
+from concurrent.futures import ProcessPoolExecutor
+from utils.keywords import IdfModel
+
+
+def _add_documents(path: str, worker: int, count: int) -> int:
+    model = IdfModel(path)
+    for document in range(count):
+        model.add_document(["shared", f"worker{worker}", f"doc{worker}-{document}"])
+    return count
+
+
+def test_concurrent_saves_keep_every_document(tmp_path):
+    path = str(tmp_path / 'idf.json')
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        added = sum(pool.map(_add_documents, [path] * 8, range(8), [20] * 8))
+
+    model = IdfModel(path)
+    assert added == model.document_count == 160
+    assert model.idf(['shared', 'worker3', 'unseen']).argsort().tolist() == [0, 1, 2]
+
+
+def test_same_document_is_counted_once(tmp_path):
+    path = str(tmp_path / 'idf.json')
+    model = IdfModel(path)
+    assert model.add_document(['gradient', 'descent'])
+    assert not model.add_document(['descent', 'gradient', 'gradient'])
+    assert IdfModel(path).document_count == 1
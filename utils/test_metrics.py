@@ -0,0 +1,38 @@
+from utils.metrics import REGISTRY, service_metric_families, timed_iter
+from utils.result_cache import ResultCache
+from utils.batching import MicroBatcher
+
+SERVICE_FAMILIES = ('video_notes_jobs_pending', 'video_notes_cache_requests_total', 'video_notes_cache_hit_ratio',
+                    'video_notes_cache_bytes', 'video_notes_summary_batches_total',
+                    'video_notes_summary_batch_items_total')
+
+
+def test_service_metrics_render_after_cache_lookups(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    batcher = MicroBatcher(lambda texts: [text.upper() for text in texts], max_wait=0.0, name='test-batcher')
+    assert cache.get_json('summary', 'key') is None
+    cache.put_json('summary', 'key', {'summary': 'text'})
+    assert cache.get_json('summary', 'key') == {'summary': 'text'}
+    assert batcher.submit(['a', 'b']) == ['A', 'B']
+
+    def collector():
+        return service_metric_families(3, cache.stats(), batcher.stats())
+
+    REGISTRY.register_collector(collector)
+    try:
+        lines = REGISTRY.render().splitlines()
+    finally:
+        REGISTRY._collectors.remove(collector)
+
+    for name in SERVICE_FAMILIES:
+        assert f"# TYPE {name} {'counter' if name.endswith('_total') else 'gauge'}" in lines
+    assert 'video_notes_jobs_pending 3.0' in lines
+    assert 'video_notes_cache_requests_total{stage="summary",result="hit"} 1.0' in lines
+    assert 'video_notes_cache_requests_total{stage="summary",result="miss"} 1.0' in lines
+    assert 'video_notes_cache_hit_ratio 0.5' in lines
+    assert 'video_notes_summary_batch_items_total 2.0' in lines
+
+
+def test_timed_iter_records_one_observation_per_stream():
+    assert list(timed_iter(iter(range(3)), 'test_stream')) == [0, 1, 2]
+    assert 'video_notes_stage_duration_seconds_count{stage="test_stream"} 1' in REGISTRY.render().splitlines()
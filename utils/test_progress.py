@@ -0,0 +1,73 @@
+import time
+from utils.progress import ProgressTracker, stage_progress
+
+
+def _stages(events) -> list:
+    return [event['stage'] for event in events]
+
+
+def test_chatty_stage_is_coalesced():
+    tracker = ProgressTracker(min_interval=60)
+    for segments in range(1000):
+        tracker('transcribe', None, segments=segments)
+    for percent in (10.0, 10.5, 10.9):
+        tracker('extract', percent)
+    events = tracker.events_since(0)
+    assert [(event['stage'], event.get('segments'), event['percent']) for event in events] == [
+        ('transcribe', 0, None), ('extract', None, 10.0)]
+
+    # A full percentage step, a new step name and completion always get through
+    tracker('extract', 11.0)
+    tracker('extract', 11.1, step='thumbnails')
+    tracker('extract', 100.0, step='thumbnails')
+    assert [event['percent'] for event in tracker.events_since(2)] == [11.0, 11.1, 100.0]
+
+
+def test_updates_are_throttled_by_time():
+    tracker = ProgressTracker(min_interval=0.05)
+    tracker('transcribe', None, segments=1)
+    tracker('transcribe', None, segments=2)
+    time.sleep(0.06)
+    tracker('transcribe', None, segments=3)
+    assert [event['segments'] for event in tracker.events_since(0)] == [1, 3]
+
+
+def test_stages_are_coalesced_separately():
+    tracker = ProgressTracker(min_interval=60)
+    # Interleaved partial results must not reset the transcribe throttle, and are never dropped
+    for segment in range(5):
+        tracker('transcribe', None, segments=segment)
+        tracker('partial', None, type='segment', segment_index=segment)
+    events = tracker.events_since(0)
+    assert _stages(events) == ['transcribe'] + ['partial'] * 5
+    assert [event['segment_index'] for event in events[1:]] == list(range(5))
+
+
+def test_finish_trims_and_keeps_indexes():
+    tracker = ProgressTracker(min_interval=0, keep_finished=3)
+    report = stage_progress(tracker, 'summarize')
+    for percent in range(0, 100, 10):
+        report(percent)
+        tracker('partial', None, type='key_points')
+    assert tracker.events_since(0)[-1]['index'] == 19
+
+    tracker.finish('completed')
+    events = tracker.events_since(0)
+    assert _stages(events) == ['summarize'] * 3 + ['done']
+    assert [event['index'] for event in events] == [14, 16, 18, 20]
+    assert events[-1]['status'] == 'completed' and tracker.latest()['stage'] == 'done'
+
+    # A client resuming with ?since= gets only what it has not seen, even from trimmed events
+    assert [event['index'] for event in tracker.events_since(17)] == [18, 20]
+    assert [event['index'] for event in tracker.events_since(21, timeout=0)] == []
+
+
+def test_events_since_waits_for_new_events():
+    tracker = ProgressTracker()
+    assert tracker.events_since(0, timeout=0.01) == []
+    tracker('extract', 0.0)
+    assert _stages(tracker.events_since(0, timeout=0.01)) == ['extract']
+
+
+def test_stage_progress_without_tracker():
+    stage_progress(None, 'extract')(50.0, chunks_done=1)
@@ -0,0 +1,35 @@
+import os
+from utils.result_cache import ResultCache, make_key, LOW_WATER_FRACTION
+
+
+def test_eviction_frees_down_to_the_low_water_mark(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), max_bytes=10000)
+    scans = []
+    entries = ResultCache._entries
+    monkeypatch.setattr(ResultCache, '_entries', lambda self: scans.append(1) or entries(self))
+
+    keys = [make_key('translation', str(i)) for i in range(300)]
+    for i, key in enumerate(keys):
+        cache.put_json('translation', key, 'x' * 98)
+        # Oldest first by modification time, whatever the file system's timestamp resolution
+        os.utime(cache._path(key, '.json'), (i, i))
+
+    assert cache.stats()['bytes'] <= cache.max_bytes
+    # Each scan frees about 10% of the budget (10 entries of 100 bytes), instead of one entry per write
+    assert len(scans) <= (300 - 100) // 10 + 1
+    assert cache.get_json('translation', keys[-1]) == 'x' * 98
+    assert cache.get_json('translation', keys[0]) is None
+
+
+def test_evict_keeps_the_new_entry_and_the_newest(tmp_path):
+    cache = ResultCache(str(tmp_path), max_bytes=1000)
+    for i in range(9):
+        cache.put_json('summary', make_key('summary', str(i)), 'x' * 98)
+        os.utime(cache._path(make_key('summary', str(i)), '.json'), (i, i))
+    big = make_key('summary', 'big')
+    cache.put_json('summary', big, 'y' * 498)
+
+    assert cache.get_json('summary', big) == 'y' * 498
+    assert cache.stats()['bytes'] <= cache.max_bytes * LOW_WATER_FRACTION
+    kept = [i for i in range(9) if cache.get_file('summary', make_key('summary', str(i)), '.json')]
+    assert kept == list(range(5, 9))
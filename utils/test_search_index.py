@@ -0,0 +1,62 @@
+import sqlite3
+from utils.search_index import TranscriptIndex
+
+
+def _segments(*texts) -> list:
+    return [{'start': 10.0 * i, 'end': 10.0 * (i + 1), 'text': text} for i, text in enumerate(texts)]
+
+
+def _hits(index, query, video_id=None) -> list:
+    return sorted((hit['video_id'], hit['start']) for hit in index.search(query, video_id=video_id))
+
+
+def _videos(index, query, video_id=None) -> dict:
+    return {video['video_id']: video['hits'] for video in index.search_videos(query, video_id=video_id)}
+
+
+def test_reindex_and_remove(tmp_path):
+    index = TranscriptIndex(str(tmp_path / 'transcripts.db'))
+    assert index.index_video('a', _segments('gradient descent', 'neural networks', ''), 'A') == 2
+    index.index_video('b', _segments('gradient boosting', 'gradient trees'), 'B')
+    index.index_video('c', _segments('stochastic gradients'), 'C')
+
+    # Re-indexing replaces the old segments, which sit between other videos' rowids
+    index.index_video('a', _segments('backpropagation', 'gradient clipping'), 'A')
+    index.remove_video('b')
+
+    assert _hits(index, 'gradient') == [('a', 10.0), ('c', 0.0)]
+    assert _hits(index, 'gradient', video_id='a') == [('a', 10.0)]
+    assert _hits(index, 'gradient', video_id='b') == []
+    assert _hits(index, 'neural') == [] and _hits(index, 'boosting') == []
+    assert _videos(index, 'gradient') == {'a': 1, 'c': 1}
+    assert _videos(index, 'gradient', video_id='c') == {'c': 1}
+    assert index.stats() == {'videos': 2, 'segments': 3, 'hours': 0.01}
+
+    with sqlite3.connect(index.path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM segments').fetchone()[0] == 3
+        ranges = dict((row[0], row[1:]) for row in connection.execute('SELECT * FROM segment_ranges'))
+    assert set(ranges) == {'a', 'c'} and ranges['a'][1] - ranges['a'][0] == 1
+
+
+def test_video_indexed_without_a_range(tmp_path):
+    path = str(tmp_path / 'transcripts.db')
+    index = TranscriptIndex(path)
+    with sqlite3.connect(path) as connection:
+        # As written before segment ranges were recorded
+        connection.execute("INSERT INTO segments VALUES ('old gradient notes', 'old', 0, 5)")
+        connection.execute("INSERT INTO videos VALUES ('old', 'Old', 5, 1, 0)")
+    index.index_video('new', _segments('gradient'), 'New')
+
+    index.index_video('old', _segments('updated gradient notes'), 'Old')
+    assert [hit['snippet'] for hit in index.search('notes')] == ['updated gradient [notes]']
+    assert _videos(index, 'gradient') == {'old': 1, 'new': 1}
+
+    index.remove_video('old')
+    assert _hits(index, 'gradient') == [('new', 0.0)]
+
+
+def test_queries_are_never_syntax_errors(tmp_path):
+    index = TranscriptIndex(str(tmp_path / 'transcripts.db'))
+    index.index_video('a', _segments('what is "AND" OR NOT*'), 'A')
+    assert _hits(index, '"AND" NOT*') == [('a', 0.0)]
+    assert index.search('   ') == [] and index.search_videos('') == []
@@ -0,0 +1,74 @@
+import pytest
+from utils.stages import StageCheckpoints, RetryPolicy, run_stage
+
+
+class _Counter:
+    """Stage function that records how often it ran and fails its first `failures` calls."""
+
+    def __init__(self, result, failures: int = 0):
+        self.result = result
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise RuntimeError(f"failure {self.calls}")
+        return self.result
+
+
+def test_rerun_resumes_from_checkpoint(tmp_path):
+    checkpoints = StageCheckpoints(str(tmp_path))
+    func = _Counter({'text': 'hello'})
+    assert run_stage('transcribe', 'key-1', func, checkpoints) == {'text': 'hello'}
+
+    # A new run (e.g. after a crash) with the same inputs does not call the stage again
+    resumed = []
+    rerun = _Counter({'text': 'different'})
+    assert run_stage('transcribe', 'key-1', rerun, StageCheckpoints(str(tmp_path)), resumed=resumed) == {
+        'text': 'hello'}
+    assert (func.calls, rerun.calls, resumed) == (1, 0, ['transcribe'])
+
+
+def test_changed_key_reruns_the_stage(tmp_path):
+    checkpoints = StageCheckpoints(str(tmp_path))
+    run_stage('summarize', 'key-1', _Counter('old'), checkpoints)
+    func = _Counter('new')
+    resumed = []
+    assert run_stage('summarize', 'key-2', func, checkpoints, resumed=resumed) == 'new'
+    assert func.calls == 1 and resumed == []
+    assert checkpoints.get('summarize', 'key-2') == 'new'
+
+
+def test_missing_file_voids_checkpoint(tmp_path):
+    checkpoints = StageCheckpoints(str(tmp_path))
+    audio = tmp_path / 'audio.wav'
+    audio.write_bytes(b'RIFF')
+    files = lambda data: [data['path']]
+    run_stage('extract', 'key', _Counter({'path': str(audio)}), checkpoints, files=files)
+    assert checkpoints.get('extract', 'key') == {'path': str(audio)}
+
+    audio.unlink()
+    func = _Counter({'path': str(audio)})
+    run_stage('extract', 'key', func, checkpoints, files=files)
+    assert func.calls == 1
+
+
+def test_retries_then_checkpoints(tmp_path):
+    checkpoints = StageCheckpoints(str(tmp_path))
+    func = _Counter('done', failures=2)
+    assert run_stage('transcribe', 'key', func, checkpoints, policy=RetryPolicy(attempts=3)) == 'done'
+    assert func.calls == 3
+    assert checkpoints.get('transcribe', 'key') == 'done'
+
+
+def test_failure_saves_no_checkpoint(tmp_path):
+    checkpoints = StageCheckpoints(str(tmp_path))
+    func = _Counter('never', failures=5)
+    with pytest.raises(RuntimeError, match='failure 2'):
+        run_stage('transcribe', 'key', func, checkpoints, policy=RetryPolicy(attempts=2))
+    assert func.calls == 2
+    assert checkpoints.get('transcribe', 'key') is None
+
+    checkpoints.clear()
+    assert checkpoints.get('transcribe', 'key') is None
@@ -0,0 +1,40 @@
+import wave
+import numpy as np
+from utils.stt_backends import STTBackend, STTServiceError
+from utils.stt_transcription import transcribe_audio_segments
+
+SAMPLE_RATE = 16000
+
+
+def _write_speech_like_wav(path: str, bursts: int = 3) -> str:
+    """Tone bursts separated by silence, so the segmenter finds cut points."""
+    t = np.arange(int(1.5 * SAMPLE_RATE)) / SAMPLE_RATE
+    tone = (np.sin(2 * np.pi * 180 * t) * 10000).astype('<i2')
+    silence = np.zeros(SAMPLE_RATE, dtype='<i2')
+    with wave.open(path, 'wb') as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(np.concatenate([tone, silence] * bursts).tobytes())
+    return path
+
+
+class _UnreachableBackend(STTBackend):
+    name = 'unreachable'
+
+    def transcribe(self, pcm: bytes, sample_rate: int) -> str:
+        raise STTServiceError("service unavailable")
+
+
+def test_fake_backend_works_offline(tmp_path):
+    path = _write_speech_like_wav(str(tmp_path / 'audio.wav'))
+    segments = transcribe_audio_segments(path, backend='fake')
+    assert segments and all(segment['text'].startswith('this is a fake transcript') for segment in segments)
+    assert [segment['start'] for segment in segments] == sorted(segment['start'] for segment in segments)
+    assert segments[-1]['end'] <= 7.5
+
+
+def test_service_errors_are_reported(tmp_path, capsys):
+    path = _write_speech_like_wav(str(tmp_path / 'audio.wav'))
+    assert transcribe_audio_segments(path, backend=_UnreachableBackend()) is None
+    assert 'service unavailable' in capsys.readouterr().out
@@ -0,0 +1,54 @@
+import numpy as np
+from utils.textrank import sentence_vectors, textrank_scores, top_sentences, DAMPING
+
+SENTENCES = [
+    "Gradient descent updates the weights of the network.",
+    "The network weights are updated with gradient descent.",
+    "Backpropagation computes the gradient of the loss.",
+    "The loss measures the error of the network.",
+    "Lunch is served in the cafeteria at noon.",
+    "Learning rates control the size of each gradient step.",
+    "",
+]
+STOP_WORDS = {'the', 'are', 'with', 'each', 'at', 'in', 'is', 'of'}
+
+
+def _dense_pagerank(vectors, damping: float = DAMPING, iterations: int = 1000) -> np.ndarray:
+    """Reference TextRank on the explicit similarity matrix."""
+    x = vectors.toarray()
+    n = len(x)
+    similarity = x @ x.T
+    np.fill_diagonal(similarity, 0.0)
+    degrees = similarity.sum(axis=0)
+    dangling = degrees <= 1e-12
+    transition = np.divide(similarity, degrees, out=np.zeros_like(similarity), where=~dangling)
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        scores = (1.0 - damping) / n + damping * scores[dangling].sum() / n + damping * transition @ scores
+        scores /= scores.sum()
+    return scores
+
+
+def test_scores_match_dense_pagerank():
+    vectors = sentence_vectors(SENTENCES, STOP_WORDS)
+    scores = textrank_scores(vectors, tol=1e-12, max_iter=1000)
+    np.testing.assert_allclose(scores, _dense_pagerank(vectors), atol=1e-9)
+    assert abs(scores.sum() - 1.0) < 1e-9
+
+
+def test_isolated_sentences_get_the_lowest_score():
+    scores = textrank_scores(sentence_vectors(SENTENCES, STOP_WORDS))
+    # The cafeteria sentence and the empty one share no terms with the others
+    assert scores[4] == scores[6] == scores.min()
+
+
+def test_top_sentences_are_in_original_order():
+    vectors = sentence_vectors(SENTENCES, STOP_WORDS)
+    top = top_sentences(vectors, 3)
+    assert top == sorted(top)
+    assert set(top) == set(np.argsort(-_dense_pagerank(vectors), kind='stable')[:3].tolist())
+    assert 4 not in top
+
+
+def test_empty_input():
+    assert textrank_scores(sentence_vectors([], STOP_WORDS)).shape == (0,)
@@ -0,0 +1,99 @@
+import hashlib
+import io
+import os
+import pytest
+from utils.uploads import UploadManager, UploadError
+
+DATA = bytes(range(256)) * 40
+
+
+def test_resume_after_restart(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    upload_id = uploads.init('Lecture.MP4', total_size=len(DATA))['upload_id']
+    assert uploads.append(upload_id, 0, io.BytesIO(DATA[:4000]))['offset'] == 4000
+
+    # A new manager has no digest state and rebuilds it from the partial file
+    restarted = UploadManager(str(tmp_path))
+    assert restarted.status(upload_id)['offset'] == 4000
+    restarted.append(upload_id, 4000, io.BytesIO(DATA[4000:]))
+    result = restarted.complete(upload_id, expected_sha256=hashlib.sha256(DATA).hexdigest())
+
+    assert result['video_id'] == hashlib.sha256(DATA).hexdigest()
+    assert result['size'] == len(DATA) and not result['duplicate']
+    assert os.path.basename(result['path']) == result['video_id'] + '.mp4'
+    with open(result['path'], 'rb') as f:
+        assert f.read() == DATA
+
+
+def test_wrong_offset_is_409_with_current_offset(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    upload_id = uploads.init('a.mp4')['upload_id']
+    uploads.append(upload_id, 0, io.BytesIO(DATA[:100]))
+
+    for offset in (0, 50, 200):
+        with pytest.raises(UploadError) as error:
+            uploads.append(upload_id, offset, io.BytesIO(DATA[offset:offset + 100]))
+        assert error.value.status == 409 and error.value.offset == 100
+    assert uploads.status(upload_id)['offset'] == 100
+
+
+def test_oversized_chunk_writes_nothing(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    upload_id = uploads.init('a.mp4', total_size=len(DATA))['upload_id']
+    uploads.append(upload_id, 0, io.BytesIO(DATA[:1000]))
+
+    with pytest.raises(UploadError) as error:
+        uploads.append(upload_id, 1000, io.BytesIO(DATA[1000:] + b'extra'))
+    assert error.value.status == 413 and error.value.offset == 1000
+    assert uploads.status(upload_id)['offset'] == 1000
+
+    # The client can resume from the reported offset with the right bytes
+    uploads.append(upload_id, 1000, io.BytesIO(DATA[1000:]))
+    assert uploads.complete(upload_id)['video_id'] == hashlib.sha256(DATA).hexdigest()
+
+
+def test_incomplete_and_mismatched_uploads(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    upload_id = uploads.init('a.mp4', total_size=len(DATA))['upload_id']
+    uploads.append(upload_id, 0, io.BytesIO(DATA[:10]))
+    with pytest.raises(UploadError) as error:
+        uploads.complete(upload_id)
+    assert error.value.status == 409 and error.value.offset == 10
+
+    uploads.append(upload_id, 10, io.BytesIO(DATA[10:]))
+    with pytest.raises(UploadError) as error:
+        uploads.complete(upload_id, expected_sha256='0' * 64)
+    assert error.value.status == 422
+
+
+def test_duplicate_content(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    first = uploads.save_stream(io.BytesIO(DATA), 'a.mp4')
+    second = uploads.save_stream(io.BytesIO(DATA), 'b.mp4')
+    assert second['video_id'] == first['video_id'] and second['duplicate']
+    assert sorted(os.listdir(tmp_path)) == [first['video_id'] + '.mp4']
+
+
+def test_unknown_upload(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    for upload_id in ('../etc/passwd', '0' * 32):
+        with pytest.raises(UploadError) as error:
+            uploads.status(upload_id)
+        assert error.value.status == 404
+
+
+def test_invalid_size_and_offset_are_400(tmp_path):
+    uploads = UploadManager(str(tmp_path))
+    for size in (-1, '-1', 'ten', 1.5, True, [10]):
+        with pytest.raises(UploadError) as error:
+            uploads.init('a.mp4', total_size=size)
+        assert error.value.status == 400
+
+    # Sizes and offsets from headers or query strings arrive as strings
+    upload_id = uploads.init('a.mp4', total_size=str(len(DATA)))['upload_id']
+    assert uploads.status(upload_id)['total_size'] == len(DATA)
+    for offset in ('abc', '-5', '', -5, None):
+        with pytest.raises(UploadError) as error:
+            uploads.append(upload_id, offset, io.BytesIO(DATA))
+        assert error.value.status == 400
+    assert uploads.append(upload_id, '0', io.BytesIO(DATA))['offset'] == len(DATA)
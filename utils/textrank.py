@@ -0,0 +1,114 @@
+import re
+import numpy as np
+
+# Words of three or more letters/digits that are not plain numbers (the utils.keywords filter, done by the regex)
+WORD_PATTERN = re.compile(r'\b(?!\d+\b)[^\W_]{3,}')
+DAMPING = 0.85
+
+
+def _terms(text: str, stop_words: set) -> list:
+    """Lowercase content words of a sentence (same filter as utils.keywords)."""
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in stop_words]
+
+
+def sentence_vectors(sentences, stop_words: set, idf_model=None):
+    """
+    Builds L2-normalized TF-IDF vectors for a list of sentences.
+
+    Term weights are sublinear, (1 + ln tf) * idf, as in keyword scoring.
+    The IDF comes from the corpus model when given, otherwise from the
+    sentences themselves (every sentence counting as a document).
+
+    Parameters:
+        sentences (iterable): Sentences; read once, so a file or generator works.
+        stop_words (set): Words that are ignored.
+        idf_model (IdfModel): Optional corpus statistics, see utils.keywords.
+
+    Returns:
+        csr_matrix: One row per sentence; rows without content words are all zero.
+    """
+    from scipy.sparse import csr_matrix
+
+    vocabulary = {}
+    columns = []
+    lengths = []
+    for sentence in sentences:
+        terms = _terms(sentence, stop_words)
+        columns.extend(vocabulary.setdefault(term, len(vocabulary)) for term in terms)
+        lengths.append(len(terms))
+
+    n = len(lengths)
+    rows = np.repeat(np.arange(n), lengths)
+    # Duplicate (row, column) pairs are summed into term frequencies
+    vectors = csr_matrix((np.ones(len(columns)), (rows, columns)), shape=(n, len(vocabulary)))
+    vectors.sum_duplicates()
+
+    if idf_model is not None:
+        idf = idf_model.idf(list(vocabulary))
+    else:
+        df = np.bincount(vectors.indices, minlength=len(vocabulary))
+        idf = np.log((1.0 + n) / (1.0 + df)) + 1.0
+    vectors.data = (1.0 + np.log(vectors.data)) * idf[vectors.indices]
+
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    vectors.data /= np.repeat(norms, np.diff(vectors.indptr))
+    return vectors
+
+
+def textrank_scores(vectors, damping: float = DAMPING, tol: float = 1e-6, max_iter: int = 100) -> np.ndarray:
+    """
+    Scores sentences by their centrality in the cosine-similarity graph.
+
+    The graph's edge weights are S = X X^T without the diagonal, where X
+    holds the normalized sentence vectors. S is never formed: both the node
+    degrees and each power-iteration step use two sparse products with X,
+    so one iteration costs O(nnz(X)) instead of O(n^2) for n sentences.
+    Sentences that share no terms with any other get only the random-jump
+    score, and their own score is spread evenly.
+
+    Parameters:
+        vectors (csr_matrix): Sentence vectors from sentence_vectors().
+        damping (float): Probability of following an edge rather than jumping.
+        tol (float): Stop when the L1 change of the scores falls below this.
+        max_iter (int): Maximum number of iterations.
+
+    Returns:
+        ndarray: One score per sentence, summing to 1.
+    """
+    n = vectors.shape[0]
+    if n == 0:
+        return np.zeros(0)
+    transposed = vectors.T.tocsr()
+    self_similarity = np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel()
+
+    def similarity_product(v):
+        # (X X^T - diag(|x_i|^2)) v
+        return vectors @ (transposed @ v) - self_similarity * v
+
+    degrees = similarity_product(np.ones(n))
+    # Rounding can leave tiny non-zero degrees for isolated sentences
+    dangling = degrees <= 1e-12
+    inverse_degrees = np.where(dangling, 0.0, 1.0 / np.where(dangling, 1.0, degrees))
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        spread = damping * scores[dangling].sum() / n
+        updated = (1.0 - damping) / n + spread + damping * similarity_product(scores * inverse_degrees)
+        updated /= updated.sum()
+        converged = np.abs(updated - scores).sum() < tol
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def top_sentences(vectors, top_k: int) -> list:
+    """
+    Returns the indices of the top_k sentences by TextRank score, in original order.
+
+    Ties are broken in favour of the earlier sentence.
+    """
+    scores = textrank_scores(vectors)
+    best = np.argsort(-scores, kind='stable')[:top_k]
+    return sorted(int(index) for index in best)
@@ -1,21 +1,216 @@
+import os
+import threading
+from utils.result_cache import make_key, hash_text
 
-from googletrans import Translator
+DEFAULT_BACKEND = os.environ.get('TRANSLATION_BACKEND', 'google')
 
-def translate_to_kannada(text: str) -> str:
+# Google Translate rejects requests over 5000 characters; stay well below
+MAX_BATCH_CHARS = 4500
+# Separator between batched segments; translators keep line breaks intact
+BATCH_SEPARATOR = '\n'
+
+class TranslationBackend:
+    """
+    Base class for translation engines.
+
+    A backend translates a batch of short segments (sentences, key points,
+    keywords) in as few requests as it can. Implementations must be safe to
+    call from several threads at once.
+    """
+    name = None
+
+    def translate_batch(self, texts: list, dest: str, src: str = 'en') -> list:
+        """
+        Translates several segments.
+
+        Parameters:
+            texts (list): Segments to translate.
+            dest (str): Target language code, e.g. 'kn' or 'hi'.
+            src (str): Source language code.
+
+        Returns:
+            list: The translations, in the same order as texts.
+        """
+        raise NotImplementedError
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Google Translate through googletrans, with one client reused for every request."""
+    name = 'google'
+
+    def __init__(self):
+        self._translator = None
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts: list, dest: str, src: str = 'en') -> list:
+        with self._lock:
+            if self._translator is None:
+                from googletrans import Translator
+                self._translator = Translator()
+
+            # One request for the whole batch: segments joined by line breaks
+            joined = BATCH_SEPARATOR.join(' '.join(text.split()) for text in texts)
+            translated = self._translator.translate(joined, src=src, dest=dest).text
+            parts = translated.split(BATCH_SEPARATOR)
+            if len(parts) == len(texts):
+                return [part.strip() for part in parts]
+
+            # The service merged or split lines; fall back to one request per segment
+            return [self._translator.translate(text, src=src, dest=dest).text for text in texts]
+
+class FakeTranslationBackend(TranslationBackend):
+    """Offline stand-in that tags each segment with the target language; for tests and benchmarks."""
+    name = 'fake'
+
+    def __init__(self):
+        self.requests = 0
+
+    def translate_batch(self, texts: list, dest: str, src: str = 'en') -> list:
+        self.requests += 1
+        return [f"[{dest}] {text}" for text in texts]
+
+BACKENDS = {
+    GoogleTranslateBackend.name: GoogleTranslateBackend,
+    FakeTranslationBackend.name: FakeTranslationBackend
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_translation_backend(backend=None) -> TranslationBackend:
+    """
+    Returns a translation backend, created once per process.
+
+    Parameters:
+        backend (str or TranslationBackend): Backend name ('google', 'fake'), an
+            existing backend instance, or None for the TRANSLATION_BACKEND default.
+
+    Returns:
+        TranslationBackend: The backend instance.
+    """
+    if isinstance(backend, TranslationBackend):
+        return backend
+
+    name = backend or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend '{name}'. Available: {', '.join(sorted(BACKENDS))}")
+
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
+
+def split_sentences(text: str) -> list:
+    """Splits text into sentences, keeping each one on a single line."""
+    from utils.nlp_summarization import sent_tokenize
+
+    return [' '.join(sentence.split()) for sentence in sent_tokenize(text) if sentence.strip()]
+
+def _batches(texts: list, max_chars: int):
+    """Groups segments into batches whose joined length stays under max_chars."""
+    batch = []
+    size = 0
+    for text in texts:
+        if batch and size + len(text) + len(BATCH_SEPARATOR) > max_chars:
+            yield batch
+            batch = []
+            size = 0
+        batch.append(text)
+        size += len(text) + len(BATCH_SEPARATOR)
+    if batch:
+        yield batch
+
+def translate_texts(texts: list, dest: str, src: str = 'en', backend=None, cache=None,
+                    max_batch_chars: int = MAX_BATCH_CHARS) -> list:
+    """
+    Translates a list of segments with as few backend requests as possible.
+
+    Identical segments are translated once. With a cache, every translated
+    segment is stored under its text, language pair and backend, so phrases
+    seen in earlier videos are never sent again.
+
+    Parameters:
+        texts (list): Segments to translate (sentences, key points, keywords).
+        dest (str): Target language code.
+        src (str): Source language code.
+        backend (str or TranslationBackend): See get_translation_backend().
+        cache (ResultCache): Optional persistent cache (utils.result_cache).
+        max_batch_chars (int): Maximum characters sent in one request.
+
+    Returns:
+        list: The translations, in the same order as texts.
+    """
+    backend = get_translation_backend(backend)
+    params = {'src': src, 'dest': dest, 'backend': backend.name}
+
+    translations = {}
+    missing = []
+    for text in dict.fromkeys(texts):
+        if not text.strip():
+            translations[text] = text
+            continue
+        cached = cache.get_json('translation', make_key('translation', hash_text(text), params)) if cache else None
+        if cached is not None:
+            translations[text] = cached['text']
+        else:
+            missing.append(text)
+
+    for batch in _batches(missing, max_batch_chars):
+        for text, translated in zip(batch, backend.translate_batch(batch, dest, src)):
+            translations[text] = translated
+            if cache:
+                cache.put_json('translation', make_key('translation', hash_text(text), params), {'text': translated})
+
+    return [translations[text] for text in texts]
+
+def translate_notes(notes, languages: list, src: str = 'en', backend=None, cache=None, progress=None) -> dict:
+    """
+    Translates the summary, key points and keywords of a NotesResult.
+
+    The summary is split into sentences, and all segments for one language go
+    through a single translate_texts() call, so each language costs only a
+    few batched requests. A language that fails is reported and left out.
+
+    Parameters:
+        notes (NotesResult): The notes to translate.
+        languages (list): Target language codes.
+        src (str): Language of the notes.
+        backend (str or TranslationBackend): See get_translation_backend().
+        cache (ResultCache): Optional persistent cache for translated segments.
+        progress (callable): Optional callback taking (percent, language=...).
+
+    Returns:
+        dict: language -> {'summary', 'key_points', 'keywords'}.
+    """
+    sentences = split_sentences(notes.summary)
+    segments = sentences + list(notes.key_points) + list(notes.keywords)
+    points_end = len(sentences) + len(notes.key_points)
+
+    translations = {}
+    for done, language in enumerate(languages):
+        try:
+            translated = translate_texts(segments, language, src, backend, cache)
+            translations[language] = {
+                'summary': ' '.join(translated[:len(sentences)]),
+                'key_points': translated[len(sentences):points_end],
+                'keywords': translated[points_end:]
+            }
+        except Exception as e:
+            print(f"Error translating notes to '{language}': {e}")
+        if progress:
+            progress((done + 1) * 100 / len(languages), language=language)
+    return translations
+
+def translate_to_kannada(text: str, cache=None) -> str:
     """
     Translates the input text to Kannada using Google Translate API.
     :param text: The text to be translated.
+    :param cache: Optional ResultCache for translated sentences.
     :return: Translated text in Kannada.
     """
-    translator = Translator()
-
- 
-    translated_text = translator.translate(text, src='en', dest='kn').text
-
-    return translated_text
+    return ' '.join(translate_texts(split_sentences(text), 'kn', cache=cache))
 
 if __name__ == "__main__":
     sample_text = "This is a sample text that will be translated into Kannada."
     translated = translate_to_kannada(sample_text)
     print(f"Original: {sample_text}")
-    print(f"Translated: {translated}")
\ No newline at end of file
+    print(f"Translated: {translated}")
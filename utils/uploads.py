@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from utils.metrics import BYTES_PROCESSED
+
+BLOCK_SIZE = 1024 * 1024
+
+
+class UploadError(Exception):
+    """Raised for invalid upload requests; status is the HTTP status to report."""
+
+    def __init__(self, message: str, status: int = 400, offset: int = None):
+        super().__init__(message)
+        self.status = status
+        self.offset = offset
+
+
+def parse_byte_count(value, name: str) -> int:
+    """
+    Validates a byte size or offset from a request: a non-negative integer, or a string of digits.
+
+    Raises:
+        UploadError: 400 for anything else (negative, fractional, non-numeric).
+    """
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value)
+    if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+        return value
+    raise UploadError(f"{name} must be a non-negative integer")
+
+
+class UploadManager:
+    """
+    Chunked, resumable uploads written straight to disk.
+
+    An upload is started with init(), receives bytes with append() and is
+    finished with complete(), which renames the file after its SHA-256 digest
+    (the video_id used everywhere else). The digest is computed incrementally
+    as chunks arrive. If the server restarts mid-upload, the digest state is
+    rebuilt from the partial file on the next append.
+
+    Partial files are hidden (dot-prefixed) so the retention policy in
+    utils.workspace only removes them once they are stale.
+    """
+
+    def __init__(self, upload_dir: str):
+        self.upload_dir = upload_dir
+        os.makedirs(upload_dir, exist_ok=True)
+        self._hashers = {}
+        self._locks = {}
+        self._guard = threading.Lock()
+
+    def init(self, filename: str, total_size: int = None) -> dict:
+        """
+        Starts a new upload.
+
+        Parameters:
+            filename (str): Original file name; only its extension is kept.
+            total_size (int): Expected size in bytes, checked on completion if given.
+
+        Returns:
+            dict: The upload status, see status().
+
+        Raises:
+            UploadError: 400 if total_size is not a non-negative integer.
+        """
+        if total_size is not None:
+            total_size = parse_byte_count(total_size, 'size')
+        upload_id = uuid.uuid4().hex
+        meta = {
+            'upload_id': upload_id,
+            'filename': os.path.basename(filename or ''),
+            'extension': os.path.splitext(filename or '')[1].lower(),
+            'total_size': total_size,
+            'created_at': time.time()
+        }
+        with open(self._meta_path(upload_id), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        open(self._part_path(upload_id), 'wb').close()
+        with self._guard:
+            self._hashers[upload_id] = hashlib.sha256()
+        return self.status(upload_id)
+
+    def status(self, upload_id: str) -> dict:
+        """
+        Returns the state of an upload; 'offset' is where the next chunk must start.
+
+        Raises:
+            UploadError: If the upload does not exist.
+        """
+        meta = self._load_meta(upload_id)
+        return {
+            'upload_id': upload_id,
+            'filename': meta['filename'],
+            'total_size': meta['total_size'],
+            'offset': os.path.getsize(self._part_path(upload_id))
+        }
+
+    def append(self, upload_id: str, offset: int, stream) -> dict:
+        """
+        Appends the bytes read from stream at the given offset.
+
+        Parameters:
+            upload_id (str): The upload.
+            offset (int): Byte offset the chunk starts at; must equal the bytes received so far.
+            stream: File-like object to read the chunk from.
+
+        Returns:
+            dict: The upload status after the chunk was written.
+
+        Raises:
+            UploadError: 400 if offset is not a non-negative integer; 409 with the
+                current offset if the offset does not match, so the client can
+                resume from there; 413 if the chunk would go past the declared
+                size (nothing of the offending block is written).
+        """
+        offset = parse_byte_count(offset, 'offset')
+        meta = self._load_meta(upload_id)
+        part_path = self._part_path(upload_id)
+
+        with self._lock_for(upload_id):
+            received = os.path.getsize(part_path)
+            if offset != received:
+                raise UploadError(f"Expected offset {received}, got {offset}", status=409, offset=received)
+
+            hasher = self._hasher_for(upload_id, part_path)
+            with open(part_path, 'ab') as f:
+                for block in iter(lambda: stream.read(BLOCK_SIZE), b''):
+                    # Checked before writing, so the upload stays resumable from `received`
+                    if meta['total_size'] is not None and received + len(block) > meta['total_size']:
+                        raise UploadError("Upload is larger than its declared size", status=413,
+                                          offset=received)
+                    f.write(block)
+                    hasher.update(block)
+                    received += len(block)
+
+        return self.status(upload_id)
+
+    def complete(self, upload_id: str, expected_sha256: str = None) -> dict:
+        """
+        Finishes an upload and moves it to its content-addressed path.
+
+        Parameters:
+            upload_id (str): The upload.
+            expected_sha256 (str): Optional client-side digest to verify against.
+
+        Returns:
+            dict: 'video_id', 'path', 'filename', 'size' and 'duplicate' (True if
+                the same content had already been uploaded).
+        """
+        meta = self._load_meta(upload_id)
+        part_path = self._part_path(upload_id)
+
+        with self._lock_for(upload_id):
+            size = os.path.getsize(part_path)
+            if meta['total_size'] is not None and size != meta['total_size']:
+                raise UploadError(f"Upload incomplete: {size} of {meta['total_size']} bytes",
+                                  status=409, offset=size)
+
+            video_id = self._hasher_for(upload_id, part_path).hexdigest()
+            if expected_sha256 and expected_sha256.lower() != video_id:
+                raise UploadError("Checksum mismatch", status=422)
+
+            path = os.path.join(self.upload_dir, f"{video_id}{meta['extension']}")
+            duplicate = os.path.exists(path)
+            if duplicate:
+                os.remove(part_path)
+                os.utime(path, None)
+            else:
+                os.replace(part_path, path)
+            os.remove(self._meta_path(upload_id))
+
+        with self._guard:
+            self._hashers.pop(upload_id, None)
+            self._locks.pop(upload_id, None)
+        BYTES_PROCESSED.inc(size, kind='upload')
+
+        return {
+            'video_id': video_id,
+            'path': path,
+            'filename': meta['filename'],
+            'size': size,
+            'duplicate': duplicate
+        }
+
+    def save_stream(self, stream, filename: str) -> dict:
+        """Uploads a whole stream in one go (used by the single-request /upload route)."""
+        upload = self.init(filename)
+        self.append(upload['upload_id'], 0, stream)
+        return self.complete(upload['upload_id'])
+
+    def _part_path(self, upload_id):
+        return os.path.join(self.upload_dir, f".upload-{upload_id}.part")
+
+    def _meta_path(self, upload_id):
+        return os.path.join(self.upload_dir, f".upload-{upload_id}.json")
+
+    def _load_meta(self, upload_id):
+        if not re.fullmatch(r'[0-9a-f]{32}', upload_id or ''):
+            raise UploadError("Invalid upload ID", status=404)
+        try:
+            with open(self._meta_path(upload_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise UploadError("Unknown upload", status=404)
+
+    def _lock_for(self, upload_id):
+        with self._guard:
+            return self._locks.setdefault(upload_id, threading.Lock())
+
+    def _hasher_for(self, upload_id, part_path):
+        with self._guard:
+            hasher = self._hashers.get(upload_id)
+        if hasher is None:
+            # Resuming after a restart: rebuild the digest from what is on disk
+            hasher = hashlib.sha256()
+            with open(part_path, 'rb') as f:
+                for block in iter(lambda: f.read(BLOCK_SIZE), b''):
+                    hasher.update(block)
+            with self._guard:
+                self._hashers[upload_id] = hasher
+        return hasher
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+# Per-workspace locks so two jobs for the same content never write the same files at once
+_workspace_locks = {}
+_locks_guard = threading.Lock()
+
+
+def hash_file(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 digest of a file without loading it into memory.
+
+    Parameters:
+        path (str): Path to the file.
+        chunk_size (int): Number of bytes read per iteration.
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(chunk_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_workspace(base_dir: str, video_id: str) -> dict:
+    """
+    Returns the artifact paths of the workspace for one video, creating its directory.
+
+    Parameters:
+        base_dir (str): Root output directory (e.g. 'static').
+        video_id (str): Content hash identifying the video.
+
+    Returns:
+        dict: 'video_id', 'root', 'audio_path', 'transcription_path', 'segments_path',
+            'summary_path' and 'slides_dir'.
+    """
+    root = os.path.join(base_dir, 'workspaces', video_id)
+    os.makedirs(root, exist_ok=True)
+    # Touch the directory so retention treats it as recently used
+    os.utime(root, None)
+
+    return {
+        'video_id': video_id,
+        'root': root,
+        'audio_path': os.path.join(root, 'audio.wav'),
+        'transcription_path': os.path.join(root, 'transcription.txt'),
+        'segments_path': os.path.join(root, 'segments.jsonl'),
+        'summary_path': os.path.join(root, 'summary.txt'),
+        'slides_dir': os.path.join(root, 'slides')
+    }
+
+
+def create_workspace(video_path: str, base_dir: str) -> dict:
+    """
+    Creates (or reuses) the content-addressed workspace for a video file.
+
+    Parameters:
+        video_path (str): Path to the input video.
+        base_dir (str): Root output directory.
+
+    Returns:
+        dict: The workspace paths, see get_workspace().
+    """
+    return get_workspace(base_dir, hash_file(video_path))
+
+
+def workspace_lock(video_id: str) -> threading.Lock:
+    """Returns the lock guarding the workspace of video_id."""
+    with _locks_guard:
+        if video_id not in _workspace_locks:
+            _workspace_locks[video_id] = threading.Lock()
+        return _workspace_locks[video_id]
+
+
+def apply_retention(directory: str, max_age_seconds: float = None, max_entries: int = None, keep=()) -> list:
+    """
+    Deletes old entries (files or directories) from a directory.
+
+    Entries older than max_age_seconds are removed first; if more than
+    max_entries remain, the least recently modified ones are removed too.
+    Hidden entries (in-progress temporary files) are only removed once they
+    expire. Entries whose name is in keep, or whose workspace lock is held,
+    are skipped.
+
+    Parameters:
+        directory (str): Directory to clean up.
+        max_age_seconds (float): Maximum age based on modification time, or None.
+        max_entries (int): Maximum number of entries to keep, or None.
+        keep (iterable): Entry names that must not be removed.
+
+    Returns:
+        list: Paths that were removed.
+    """
+    if not os.path.isdir(directory):
+        return []
+
+    entries = []
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            entries.append((os.path.getmtime(path), name, path))
+        except OSError:
+            continue
+    # Newest first, so anything past max_entries is the oldest
+    entries.sort(reverse=True)
+
+    now = time.time()
+    removed = []
+    visible_count = 0
+    for mtime, name, path in entries:
+        expired = max_age_seconds is not None and now - mtime > max_age_seconds
+        # Hidden entries are in-progress temp files; only expire them by age
+        hidden = name.startswith('.')
+        if not hidden:
+            visible_count += 1
+        overflow = not hidden and max_entries is not None and visible_count > max_entries
+        if not (expired or overflow) or name in keep:
+            continue
+
+        video_id = os.path.splitext(name)[0]
+        lock = workspace_lock(video_id)
+        if not lock.acquire(blocking=False):
+            continue
+        try:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                os.remove(path)
+            removed.append(path)
+        except OSError as e:
+            print(f"Error removing {path}: {e}")
+        finally:
+            lock.release()
+
+    return removed
+
+
+def cleanup_workspaces(base_dir: str, max_age_seconds: float = None, max_entries: int = None, keep=()) -> list:
+    """Applies the retention policy to all workspaces under base_dir."""
+    return apply_retention(os.path.join(base_dir, 'workspaces'), max_age_seconds, max_entries, keep)